@@ -0,0 +1,573 @@
+#Imports
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+#Functions
+
+BASE_URL = 'https://fbref.com'
+
+# Order of the chained merges in Big5Leagues.ipynb: playingtime and stats are inner joined, the rest outer joined
+STATS = ['playingtime', 'stats', 'keepers', 'keepersadv', 'shooting', 'passing', 'passing_types',
+         'gca', 'defense', 'possession', 'misc']
+
+ID_COLUMNS = ['Player', 'Nation', 'Pos', 'Squad', 'Comp', 'Age']
+
+# Positions of the columns that duplicate another stat table, dropped after cleaning
+DROP_COLUMNS = {
+    'stats': [7],
+    'keepers': [9, 10, 21],
+    'keepersadv': [],
+    'shooting': [6, 7, 17, 18, 19, 20],
+    'passing': [6, 22, 29],
+    'passing_types': [6, 7],
+    'gca': [6],
+    'defense': [6],
+    'possession': [6, 22, 28],
+    'playingtime': [6, 7, 10],
+    'misc': [6, 7, 8, 14, 15],
+}
+
+RENAME_COLUMNS = {
+    'Unnamed: 1_level_0_Player': 'Player',
+    'Unnamed: 2_level_0_Nation': 'Nation',
+    'Unnamed: 3_level_0_Pos': 'Pos',
+    'Unnamed: 4_level_0_Squad': 'Squad',
+    'Unnamed: 5_level_0_Comp': 'Comp',
+    'Unnamed: 6_level_0_Age': 'Age',
+    'Unnamed: 8_level_0_90s': '90s',
+}
+
+def stat_url(stat: str, season: Optional[str] = None, base_url: str = BASE_URL) -> str:
+    """
+    Build the URL of a Big 5 player stats page.
+
+    Parameters:
+    - stat (str): One of STATS.
+    - season (str, optional): Season such as '2022-2023'. Defaults to the current season.
+    - base_url (str, optional): Site root, e.g. a local server holding saved pages. Defaults to https://fbref.com.
+
+    Returns:
+    str: The page URL.
+    """
+    if season is None:
+        return f'{base_url}/en/comps/Big5/{stat}/players/Big-5-European-Leagues-Stats'
+    return f'{base_url}/en/comps/Big5/{season}/{stat}/players/{season}-Big-5-European-Leagues-Stats'
+
+class RateLimiter:
+    """
+    Space out requests shared by several threads. FBREF blocks clients that send more than about ten requests per minute.
+
+    Parameters:
+    - min_interval (float): Minimum seconds between two requests.
+    """
+
+    def __init__(self, min_interval: float = 6.0):
+        self.min_interval = min_interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+class PageCache:
+    """
+    On-disk cache of raw FBREF pages, one file per (stat, season).
+
+    A page younger than `max_age` is served without any request. An older page is
+    revalidated with its ETag / Last-Modified headers, and only downloaded again if
+    the server reports a change. The cleaned table of each page is kept as well, so an
+    unchanged page is not parsed again.
+
+    Parameters:
+    - path (str): Directory where the pages are stored.
+    - max_age (float): Seconds a page is used without revalidation. Defaults to 12 hours.
+    """
+
+    def __init__(self, path: str = '.fbref_cache', max_age: float = 12 * 3600):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+
+    def _file(self, stat: str, season: Optional[str]) -> Path:
+        return self.path / f"{stat}__{season or 'current'}.html"
+
+    def get(self, stat: str, season: Optional[str]):
+        """
+        Return the cached page and its metadata (etag, last_modified, fetched_at), or (None, {}) on a miss.
+        """
+        file = self._file(stat, season)
+        try:
+            html = file.read_bytes()
+            meta = json.loads(file.with_suffix('.json').read_text())
+        except (FileNotFoundError, ValueError):
+            return None, {}
+        return html, meta
+
+    def is_fresh(self, meta: Dict) -> bool:
+        return bool(meta) and time.time() - meta['fetched_at'] < self.max_age
+
+    def put(self, stat: str, season: Optional[str], html: Optional[bytes], meta: Dict) -> None:
+        """
+        Store a page (or only refresh its metadata when `html` is None).
+        """
+        file = self._file(stat, season)
+        for target, payload in ((file, html), (file.with_suffix('.json'), json.dumps(meta).encode())):
+            if payload is None:
+                continue
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp, target)
+
+    def get_table(self, stat: str, season: Optional[str], html: bytes) -> Optional[pd.DataFrame]:
+        """
+        Return the cleaned table parsed from `html`, or None if the page changed since it was parsed.
+        """
+        try:
+            entry = pd.read_pickle(self._file(stat, season).with_suffix('.pkl'))
+        except (FileNotFoundError, ValueError, EOFError):
+            return None
+        return entry['table'] if entry['digest'] == hashlib.sha1(html).hexdigest() else None
+
+    def put_table(self, stat: str, season: Optional[str], html: bytes, table: pd.DataFrame) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        os.close(fd)
+        pd.to_pickle({'digest': hashlib.sha1(html).hexdigest(), 'table': table}, tmp)
+        os.replace(tmp, self._file(stat, season).with_suffix('.pkl'))
+
+def fetch_page(url: str, cache: Optional[PageCache] = None, stat: Optional[str] = None, season: Optional[str] = None,
+               limiter: Optional[RateLimiter] = None, retries: int = 3, timeout: float = 30) -> bytes:
+    """
+    Download a page, using the cache and conditional requests when a cache is given.
+
+    Parameters:
+    - url (str): Page URL.
+    - cache (PageCache, optional): Cache of raw pages.
+    - stat (str, optional): Stat name, used as cache key.
+    - season (str, optional): Season, used as cache key.
+    - limiter (RateLimiter, optional): Shared rate limiter.
+    - retries (int, optional): Attempts on HTTP 429 / 5xx and network errors. Defaults to 3.
+    - timeout (float, optional): Socket timeout in seconds. Defaults to 30.
+
+    Returns:
+    bytes: The page HTML.
+    """
+    cached, meta = cache.get(stat, season) if cache is not None else (None, {})
+    if cached is not None and cache.is_fresh(meta):
+        return cached
+
+    headers = {'User-Agent': 'Mozilla/5.0 (Football-Analytics)'}
+    if cached is not None:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    for attempt in range(retries):
+        if limiter is not None:
+            limiter.wait()
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+                html = response.read()
+                new_meta = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified'),
+                            'fetched_at': time.time()}
+            if cache is not None:
+                cache.put(stat, season, html, new_meta)
+            return html
+        except urllib.error.HTTPError as error:
+            if error.code == 304 and cached is not None:
+                cache.put(stat, season, None, {**meta, 'fetched_at': time.time()})
+                return cached
+            if (error.code != 429 and error.code < 500) or attempt == retries - 1:
+                raise
+            retry_after = error.headers.get('Retry-After')
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt * 5
+        except urllib.error.URLError:
+            if attempt == retries - 1:
+                raise
+            delay = 2 ** attempt
+        time.sleep(delay)
+
+def parse_stat_table(html: bytes, stat: str) -> pd.DataFrame:
+    """
+    Parse and clean a Big 5 player stats page the way get_playerstats_big5leagues does.
+
+    Parameters:
+    - html (bytes): Page HTML.
+    - stat (str): One of STATS.
+
+    Returns:
+    pd.DataFrame: The six id columns followed by float stat columns named <stat>_<group>_<column>,
+    without the columns that duplicate another table.
+    """
+    df = pd.read_html(io.BytesIO(html))[0]
+    #Joinning level 0 and 1 indexes
+    df.columns = ['_'.join(col) for col in df.columns]
+    #Dropping the repeated header rows and useless features
+    rank = 'Unnamed: 0_level_0_Rk'
+    df = df[df[rank].notna() & (df[rank] != 'Rk')]
+    df = df.drop(columns=[rank, 'Unnamed: 7_level_0_Born']).iloc[:, :-1]
+    rename = dict(RENAME_COLUMNS)
+    if stat == 'passing_types':
+        rename['Unnamed: 9_level_0_Att'] = 'Att'
+    df = df.rename(columns=rename)
+    #Cleaning data in some features
+    df['Age'] = df['Age'].str.slice(0, 2)
+    df['Nation'] = df['Nation'].str.slice(-4,)
+    df['Comp'] = df['Comp'].str.slice(3,)
+    stats = df.iloc[:, 6:].astype(float)
+    stats.columns = [f'{stat}_{column}' for column in stats.columns]
+    df = df.iloc[:, :6].join(stats).reset_index(drop=True)
+    return df.drop(columns=df.columns[DROP_COLUMNS[stat]])
+
+def get_playerstats_big5leagues(stat: str, season: Optional[str] = None, cache: Optional[PageCache] = None,
+                                base_url: str = BASE_URL) -> pd.DataFrame:
+    """
+    Download (or read from cache) and clean one Big 5 player stats table.
+
+    Parameters:
+    - stat (str): stats, keepers, keepersadv, shooting, passing, passing_types, gca, defense, possession, playingtime or misc.
+    - season (str, optional): Season such as '2022-2023'. Defaults to the current season.
+    - cache (PageCache, optional): Cache of raw pages.
+    - base_url (str, optional): Site root. Defaults to https://fbref.com.
+
+    Returns:
+    pd.DataFrame: The cleaned table.
+    """
+    return parse_stat_table(fetch_page(stat_url(stat, season, base_url), cache, stat, season), stat)
+
+def fetch_stat_tables(stats: Optional[List[str]] = None, season: Optional[str] = None,
+                      cache: Optional[PageCache] = None, workers: int = 4, min_interval: float = 6.0,
+                      base_url: str = BASE_URL) -> Dict[str, pd.DataFrame]:
+    """
+    Download and clean several stat tables concurrently, spacing out the requests.
+
+    Pages are downloaded by a thread pool sharing one rate limiter, so parsing one table
+    overlaps with waiting for the next. Cached pages skip the limiter entirely, and
+    unchanged pages reuse their cached table instead of being parsed again.
+
+    Parameters:
+    - stats (List[str], optional): Stat tables to fetch. Defaults to STATS.
+    - season (str, optional): Season such as '2022-2023'. Defaults to the current season.
+    - cache (PageCache, optional): Cache of raw pages.
+    - workers (int, optional): Number of threads. Defaults to 4.
+    - min_interval (float, optional): Minimum seconds between two requests. Defaults to 6.
+    - base_url (str, optional): Site root. Defaults to https://fbref.com.
+
+    Returns:
+    Dict[str, pd.DataFrame]: Cleaned table per stat, in the order of `stats`.
+    """
+    stats = stats or STATS
+    limiter = RateLimiter(min_interval)
+
+    def fetch(stat):
+        html = fetch_page(stat_url(stat, season, base_url), cache, stat, season, limiter)
+        table = cache.get_table(stat, season, html) if cache is not None else None
+        if table is None:
+            table = parse_stat_table(html, stat)
+            if cache is not None:
+                cache.put_table(stat, season, html, table)
+        return table
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(stats, executor.map(fetch, stats)))
+
+def save_pages(directory: Union[str, Path], stats: Optional[List[str]] = None, season: Optional[str] = None,
+               base_url: str = BASE_URL, min_interval: float = 6.0) -> List[Path]:
+    """
+    Download stat pages into a directory laid out like the site, to be served by SavedPageServer.
+
+    Parameters:
+    - directory (str or Path): Root of the saved site.
+    - stats (List[str], optional): Stat tables to save. Defaults to STATS.
+    - season (str, optional): Season such as '2022-2023'. Defaults to the current season.
+    - base_url (str, optional): Site root. Defaults to https://fbref.com.
+    - min_interval (float, optional): Minimum seconds between two requests. Defaults to 6.
+
+    Returns:
+    List[Path]: The saved files.
+    """
+    limiter = RateLimiter(min_interval)
+    files = []
+    for stat in stats or STATS:
+        file = Path(directory) / stat_url(stat, season, '').lstrip('/')
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(fetch_page(stat_url(stat, season, base_url), limiter=limiter))
+        files.append(file)
+    return files
+
+def synthetic_page(stat: str, players: int = 2800, seed: int = 0) -> bytes:
+    """
+    Generate a Big 5 player stats page with the table layout of FBREF, for offline tests and benchmarks.
+
+    The table has the two header rows, the header row repeated every 25 players, the Rk,
+    Born and Matches columns that parse_stat_table drops and 32 stat columns. keepers only
+    lists goalkeepers and playingtime misses the last 40 players, as on the site.
+
+    Parameters:
+    - stat (str): One of STATS.
+    - players (int, optional): Number of players. Defaults to 2800, a Big 5 season.
+    - seed (int, optional): Random seed; the players are the same for every stat of a seed. Defaults to 0.
+
+    Returns:
+    bytes: The page HTML.
+    """
+    rng = np.random.default_rng(seed)
+    comps = ['eng Premier League', 'es La Liga', 'it Serie A', 'de Bundesliga', 'fr Ligue 1']
+    rows = [(f'Player {k}', 'es ESP', rng.choice(['GK', 'DF', 'MF', 'FW', 'MF,FW']), f'Squad {k % 98}',
+             rng.choice(comps), f'{20 + k % 15}-{k % 365:03d}') for k in range(players)]
+    if stat == 'keepers':
+        rows = [row for row in rows if row[2] == 'GK']
+    elif stat == 'playingtime':
+        rows = rows[:-40]
+    values = np.random.default_rng([seed, STATS.index(stat) if stat in STATS else len(STATS)]).integers(0, 50, (len(rows), 32))
+
+    id_columns = ['Rk', 'Player', 'Nation', 'Pos', 'Squad', 'Comp', 'Age', 'Born', '90s']
+    header = ('<tr>' + '<th></th>' * len(id_columns) + ''.join(f'<th>Group {k // 5}</th>' for k in range(32))
+              + '<th></th></tr>')
+    columns = ''.join(f'<th>{name}</th>' for name in id_columns + [f'Stat {k}' for k in range(32)] + ['Matches'])
+    body = []
+    for number, (row, stat_values) in enumerate(zip(rows, values)):
+        if number and number % 25 == 0:
+            body.append(f'<tr class="thead">{columns}</tr>')
+        cells = (number + 1,) + row + ('1999', f'{(number % 38) + 0.5:.1f}') + tuple(stat_values) + ('Matches',)
+        body.append('<tr>' + ''.join(f'<td>{cell}</td>' for cell in cells) + '</tr>')
+    return (f'<html><body><table><thead>{header}<tr>{columns}</tr></thead>'
+            f'<tbody>{"".join(body)}</tbody></table></body></html>').encode('utf-8')
+
+class SavedPageServer:
+    """
+    Local stand-in for FBREF serving saved pages, to test fetch_page, PageCache and fetch_stat_tables offline.
+
+    Pages carry an ETag and a Last-Modified header and conditional requests for an unchanged
+    page are answered 304 Not Modified. A request arriving less than `min_interval` seconds
+    after the previous one, and each of the first `throttle` requests, is answered
+    429 Too Many Requests with a Retry-After header, as FBREF does when scraped too fast.
+
+    Parameters:
+    - pages (str, Path or Dict[str, bytes]): Directory written by save_pages, or page per URL path.
+    - min_interval (float): Seconds required between two requests. Defaults to 0 (no limit).
+    - throttle (int): Number of first requests answered 429. Defaults to 0.
+    - retry_after (int): Seconds sent in the Retry-After header. Defaults to 0.
+    - host (str): Interface to listen on. Defaults to 127.0.0.1.
+    - port (int): Port to listen on; 0 picks a free one. Defaults to 0.
+    """
+
+    def __init__(self, pages: Union[str, Path, Dict[str, bytes]], min_interval: float = 0.0, throttle: int = 0,
+                 retry_after: int = 0, host: str = '127.0.0.1', port: int = 0):
+        if not isinstance(pages, dict):
+            root = Path(pages)
+            pages = {'/' + file.relative_to(root).as_posix(): file.read_bytes() for file in root.rglob('*') if file.is_file()}
+        self.pages = {}
+        for path, html in pages.items():
+            self.update(path, html)
+        self.min_interval = min_interval
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.requests = []
+        self._last = None
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, headers, body = server.answer(self.path, self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        str: Site root to pass as `base_url`.
+        """
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def update(self, path: str, html: bytes) -> None:
+        """
+        Add or change a page; its ETag and Last-Modified change with it.
+
+        Parameters:
+        - path (str): URL path, e.g. stat_url(stat, season, '').
+        - html (bytes): The page.
+        """
+        self.pages[path] = (html, f'"{hashlib.sha1(html).hexdigest()}"', time.time())
+
+    def answer(self, path: str, headers) -> tuple:
+        """
+        Build the answer to a GET request.
+
+        Parameters:
+        - path (str): Requested URL path.
+        - headers: Request headers.
+
+        Returns:
+        tuple: Status, response headers and body.
+        """
+        path = path.split('?')[0]
+        with self._lock:
+            now = time.monotonic()
+            too_fast = self._last is not None and now - self._last < self.min_interval
+            self._last = now
+            if self.throttle > 0 or too_fast:
+                self.throttle = max(self.throttle - 1, 0)
+                self.requests.append((path, 429))
+                return 429, {'Retry-After': str(self.retry_after)}, b''
+            if path not in self.pages:
+                self.requests.append((path, 404))
+                return 404, {}, b''
+            html, etag, modified = self.pages[path]
+            response_headers = {'ETag': etag, 'Last-Modified': formatdate(modified, usegmt=True)}
+            if headers.get('If-None-Match') is not None:
+                not_modified = headers['If-None-Match'] == etag
+            elif headers.get('If-Modified-Since') is not None:
+                not_modified = parsedate_to_datetime(headers['If-Modified-Since']).timestamp() >= int(modified)
+            else:
+                not_modified = False
+            if not_modified:
+                self.requests.append((path, 304))
+                return 304, response_headers, b''
+            self.requests.append((path, 200))
+            return 200, {**response_headers, 'Content-Type': 'text/html; charset=utf-8'}, html
+
+    def start(self) -> 'SavedPageServer':
+        """
+        Start serving in a background thread.
+
+        Returns:
+        SavedPageServer: The server itself.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def player_keys(tables: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """
+    Give every row of every table an integer player key shared across the tables.
+
+    The key is built from the six id columns, factorized once over all tables, plus the
+    occurrence number of those id columns within each table, so that players with
+    identical id columns line up one to one instead of being multiplied.
+
+    Parameters:
+    - tables (Dict[str, pd.DataFrame]): Result of fetch_stat_tables.
+
+    Returns:
+    Dict[str, np.ndarray]: int64 key of each row, per table.
+    """
+    ids = pd.concat([df[ID_COLUMNS] for df in tables.values()], ignore_index=True)
+    codes = ids.groupby(ID_COLUMNS, sort=False, dropna=False).ngroup().to_numpy()
+    keys, start = {}, 0
+    for stat, df in tables.items():
+        table_codes = codes[start:start + len(df)]
+        start += len(df)
+        occurrence = pd.Series(table_codes).groupby(table_codes).cumcount().to_numpy()
+        keys[stat] = table_codes.astype(np.int64) * len(ids) + occurrence
+    return keys
+
+def build_wide_table(tables: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Join the stat tables into one row per player with a single index-aligned concat.
+
+    Gives the columns of the chained pd.merge calls of Big5Leagues.ipynb, with every player
+    of every table. Unlike the chain, whose first join was inner, a player missing from
+    playingtime or stats keeps the values of the other one. Players with identical id
+    columns are matched by order of appearance instead of being multiplied.
+
+    Parameters:
+    - tables (Dict[str, pd.DataFrame]): Result of fetch_stat_tables.
+
+    Returns:
+    pd.DataFrame: The six id columns followed by the stat columns of every table.
+    """
+    keys = player_keys(tables)
+    order = [stat for stat in STATS if stat in tables] + [stat for stat in tables if stat not in STATS]
+
+    ids = pd.concat([tables[stat][ID_COLUMNS].set_axis(keys[stat]) for stat in order])
+    ids = ids[~ids.index.duplicated()]
+    stats = [tables[stat].drop(columns=ID_COLUMNS).set_axis(keys[stat]) for stat in order]
+    wide = pd.concat([ids] + stats, axis=1, join='outer', sort=False)
+    return wide.reset_index(drop=True)
+
+def merge_tables_legacy(tables: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Reference implementation of build_wide_table with ten chained pd.merge calls.
+    """
+    on = tuple(ID_COLUMNS)
+    wide = pd.merge(tables['playingtime'], tables['stats'], on=on, how='inner')
+    for stat in STATS[2:]:
+        wide = pd.merge(wide, tables[stat], on=on, how='outer')
+    return wide
+
+def benchmark_build(tables: Dict[str, pd.DataFrame], repeat: int = 3) -> Dict[str, float]:
+    """
+    Compare merge_tables_legacy with build_wide_table: time and peak traced memory.
+
+    Parameters:
+    - tables (Dict[str, pd.DataFrame]): Result of fetch_stat_tables.
+    - repeat (int, optional): Number of runs; the best one is kept. Defaults to 3.
+
+    Returns:
+    Dict[str, float]: Seconds and peak MB for each implementation, and the speedup.
+    """
+    import tracemalloc
+
+    def measure(function):
+        times, peaks = [], []
+        for _ in range(repeat):
+            tracemalloc.start()
+            start = time.perf_counter()
+            function(tables)
+            times.append(time.perf_counter() - start)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 2 ** 20)
+            tracemalloc.stop()
+        return min(times), min(peaks)
+
+    legacy_time, legacy_peak = measure(merge_tables_legacy)
+    fast_time, fast_peak = measure(build_wide_table)
+    return {'legacy_s': legacy_time, 'fast_s': fast_time, 'speedup': legacy_time / fast_time,
+            'legacy_peak_mb': legacy_peak, 'fast_peak_mb': fast_peak}
@@ -0,0 +1,110 @@
+#Imports
+import time
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+#Functions
+
+def percentile_ranks(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                     by: Union[str, List[str], pd.Series, None] = None) -> pd.DataFrame:
+    """
+    Compute the percentile rank of every value against its column, for all columns at once.
+
+    Each column is ranked with a single sort, which gives the same result as
+    scipy.stats.percentileofscore(column, value, kind='rank', nan_policy='omit'):
+    ties get the mean of their ranks, NaN values are ignored and stay NaN.
+
+    Parameters:
+    - df (pd.DataFrame): Player or squad stats.
+    - columns (List[str], optional): Columns to rank. Defaults to every numeric column.
+    - by (str, List[str] or pd.Series, optional): Rank within groups instead of the whole table,
+      e.g. 'Comp' for per-league percentiles or df['Pos'].str[:2] for per-position percentiles.
+
+    Returns:
+    pd.DataFrame: Percentiles between 0 and 100, with the same index and columns as the selection.
+    """
+    if columns is None:
+        columns = df.select_dtypes('number').columns.tolist()
+    values = df[columns]
+    if by is None:
+        ranks = values.rank(method='average', na_option='keep', pct=True)
+    else:
+        if isinstance(by, str):
+            keys = df[by]
+        elif isinstance(by, list):
+            keys = [df[column] for column in by]
+        else:
+            keys = by
+        ranks = values.groupby(keys, dropna=False).rank(method='average', na_option='keep', pct=True)
+    return ranks * 100
+
+def get_percentiles(df: pd.DataFrame, by: Union[str, List[str], pd.Series, None] = None,
+                    id_columns: int = 6) -> pd.DataFrame:
+    """
+    Convert a stats table into percentiles, keeping its identifying columns.
+
+    Parameters:
+    - df (pd.DataFrame): Table from get_playerstats_big5leagues (or the merged wide table).
+    - by (str, List[str] or pd.Series, optional): Compute the percentiles within groups, e.g. 'Comp' or 'Pos'.
+    - id_columns (int, optional): Number of leading columns that are not stats. Defaults to 6
+      (Player, Nation, Pos, Squad, Comp, Age).
+
+    Returns:
+    pd.DataFrame: The identifying columns followed by Percentile_<column>, rounded to 2 decimals.
+    """
+    columnas = df.iloc[:, id_columns:]
+    resto = df.iloc[:, :id_columns]
+
+    percentiles_df = percentile_ranks(df, columns=columnas.columns.tolist(), by=by)
+    percentiles_df.columns = [f'Percentile_{column}' for column in columnas.columns]
+
+    return resto.join(percentiles_df.round(2))
+
+def get_percentiles_legacy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reference implementation of get_percentiles that calls percentileofscore once per cell.
+
+    Parameters:
+    - df (pd.DataFrame): Player or squad stats.
+
+    Returns:
+    pd.DataFrame: The identifying columns followed by Percentile_<column>, rounded to 2 decimals.
+    """
+    from scipy.stats import percentileofscore
+
+    columnas = df.iloc[:, 6:]
+    resto = df.iloc[:, :6]
+
+    percentiles_df = columnas.apply(lambda x: x.apply(lambda y: percentileofscore(columnas[x.name], y, nan_policy='omit')), axis=0)
+    percentiles_df.columns = [f'Percentile_{column}' for column in columnas.columns]
+
+    percentiles_df = resto.join(percentiles_df)
+    percentiles_df.iloc[:, 6:] = percentiles_df.iloc[:, 6:].round(2)
+    return percentiles_df
+
+def benchmark_percentiles(df: pd.DataFrame, repeat: int = 1) -> Dict[str, float]:
+    """
+    Compare get_percentiles_legacy with get_percentiles on the same table and check that they agree.
+
+    Parameters:
+    - df (pd.DataFrame): Player or squad stats, e.g. the merged Big 5 table.
+    - repeat (int, optional): Number of runs; the best one is kept. Defaults to 1.
+
+    Returns:
+    Dict[str, float]: Seconds for each implementation, the speedup and the largest absolute difference.
+    """
+    def best_time(function):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function(df)
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    legacy_time, legacy = best_time(get_percentiles_legacy)
+    fast_time, fast = best_time(get_percentiles)
+    difference = np.nanmax(np.abs(legacy.iloc[:, 6:].to_numpy(dtype=float) - fast.iloc[:, 6:].to_numpy(dtype=float)))
+    return {'legacy_s': legacy_time, 'fast_s': fast_time, 'speedup': legacy_time / fast_time,
+            'max_abs_diff': float(difference)}
@@ -0,0 +1,328 @@
+#Imports
+import hashlib
+import json
+import os
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import orjson as _fast_json
+except ImportError:
+    _fast_json = None
+
+#Functions
+
+RAW_URL = 'https://raw.githubusercontent.com/statsbomb/open-data/master'
+
+# column -> (path in the raw event, dtype). Names follow the flattened columns of sb.events,
+# with locations split into _x / _y.
+EVENT_FIELDS = {
+    'id': (('id',), 'string'),
+    'index': (('index',), 'int32'),
+    'period': (('period',), 'int8'),
+    'timestamp': (('timestamp',), 'string'),
+    'minute': (('minute',), 'int16'),
+    'second': (('second',), 'int8'),
+    'type': (('type', 'name'), 'category'),
+    'possession': (('possession',), 'int16'),
+    'possession_team': (('possession_team', 'name'), 'category'),
+    'play_pattern': (('play_pattern', 'name'), 'category'),
+    'team': (('team', 'name'), 'category'),
+    'team_id': (('team', 'id'), 'int32'),
+    'player': (('player', 'name'), 'category'),
+    'player_id': (('player', 'id'), 'Int32'),
+    'position': (('position', 'name'), 'category'),
+    'location_x': (('location', 0), 'float32'),
+    'location_y': (('location', 1), 'float32'),
+    'duration': (('duration',), 'float32'),
+    'under_pressure': (('under_pressure',), 'bool'),
+    'pass_recipient': (('pass', 'recipient', 'name'), 'category'),
+    'pass_recipient_id': (('pass', 'recipient', 'id'), 'Int32'),
+    'pass_length': (('pass', 'length'), 'float32'),
+    'pass_angle': (('pass', 'angle'), 'float32'),
+    'pass_height': (('pass', 'height', 'name'), 'category'),
+    'pass_end_location_x': (('pass', 'end_location', 0), 'float32'),
+    'pass_end_location_y': (('pass', 'end_location', 1), 'float32'),
+    'pass_body_part': (('pass', 'body_part', 'name'), 'category'),
+    'pass_type': (('pass', 'type', 'name'), 'category'),
+    'pass_outcome': (('pass', 'outcome', 'name'), 'category'),
+    'carry_end_location_x': (('carry', 'end_location', 0), 'float32'),
+    'carry_end_location_y': (('carry', 'end_location', 1), 'float32'),
+    'shot_statsbomb_xg': (('shot', 'statsbomb_xg'), 'float32'),
+    'shot_outcome': (('shot', 'outcome', 'name'), 'category'),
+    'shot_body_part': (('shot', 'body_part', 'name'), 'category'),
+    'shot_end_location_x': (('shot', 'end_location', 0), 'float32'),
+    'shot_end_location_y': (('shot', 'end_location', 1), 'float32'),
+    'dribble_outcome': (('dribble', 'outcome', 'name'), 'category'),
+    'duel_type': (('duel', 'type', 'name'), 'category'),
+    'duel_outcome': (('duel', 'outcome', 'name'), 'category'),
+    'substitution_replacement': (('substitution', 'replacement', 'name'), 'category'),
+    'substitution_replacement_id': (('substitution', 'replacement', 'id'), 'Int32'),
+}
+
+MATCH_FIELDS = {
+    'match_id': ('match_id',),
+    'match_date': ('match_date',),
+    'kick_off': ('kick_off',),
+    'competition': ('competition', 'competition_name'),
+    'season': ('season', 'season_name'),
+    'home_team': ('home_team', 'home_team_name'),
+    'home_team_id': ('home_team', 'home_team_id'),
+    'away_team': ('away_team', 'away_team_name'),
+    'away_team_id': ('away_team', 'away_team_id'),
+    'home_score': ('home_score',),
+    'away_score': ('away_score',),
+    'match_week': ('match_week',),
+}
+
+def loads(data: bytes) -> Any:
+    """
+    Decode JSON with orjson when installed, falling back to the json module.
+    """
+    if _fast_json is not None:
+        return _fast_json.loads(data)
+    return json.loads(data)
+
+def _get(item: Any, path: tuple) -> Any:
+    for step in path:
+        if item is None:
+            return None
+        item = item.get(step)
+    return item
+
+class OpenDataSource:
+    """
+    Reader of StatsBomb open-data files, e.g. 'data/events/69212.json'.
+
+    Files are read from a local clone of https://github.com/statsbomb/open-data when
+    `local_root` is given, else from the JSON cache, else downloaded and added to the cache.
+    The cache uses the same layout as the repository, so it can itself be used as `local_root`.
+    The typed frame of each match is cached as well (under frames/), keyed by the hash of its
+    event file, so a warm load neither decodes nor converts the JSON again.
+
+    Parameters:
+    - local_root (str, optional): Root of a local clone of the open-data repository. No network is used.
+    - cache_dir (str, optional): Directory of the download cache. Defaults to '.statsbomb_cache'; None disables it.
+    - base_url (str, optional): Root the files are downloaded from. Defaults to the GitHub raw URL.
+    """
+
+    def __init__(self, local_root: Optional[str] = None, cache_dir: Optional[str] = '.statsbomb_cache',
+                 base_url: str = RAW_URL):
+        self.local_root = Path(local_root) if local_root is not None else None
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.base_url = base_url.rstrip('/')
+
+    def read(self, relative_path: str, retries: int = 3) -> bytes:
+        """
+        Return the raw bytes of an open-data file.
+
+        Parameters:
+        - relative_path (str): Path inside the repository, e.g. 'data/matches/11/41.json'.
+        - retries (int, optional): Download attempts. Defaults to 3.
+
+        Returns:
+        bytes: The file content.
+        """
+        if self.local_root is not None:
+            return (self.local_root / relative_path).read_bytes()
+
+        cached = self.cache_dir / relative_path if self.cache_dir is not None else None
+        if cached is not None and cached.exists():
+            return cached.read_bytes()
+
+        for attempt in range(retries):
+            try:
+                with urllib.request.urlopen(f'{self.base_url}/{relative_path}', timeout=60) as response:
+                    data = response.read()
+                break
+            except OSError:
+                if attempt == retries - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+        if cached is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cached.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, cached)
+        return data
+
+    def get_frame(self, match_id: int, data: bytes) -> Optional[pd.DataFrame]:
+        """
+        Return the cached typed frame of a match, or None if missing or built from different event data.
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            entry = pd.read_pickle(self.cache_dir / 'frames' / f'{match_id}.pkl')
+        except (FileNotFoundError, ValueError, EOFError):
+            return None
+        return entry['frame'] if entry['digest'] == hashlib.sha1(data).hexdigest() else None
+
+    def put_frame(self, match_id: int, data: bytes, frame: pd.DataFrame) -> None:
+        if self.cache_dir is None:
+            return
+        folder = self.cache_dir / 'frames'
+        folder.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        os.close(fd)
+        pd.to_pickle({'digest': hashlib.sha1(data).hexdigest(), 'frame': frame}, tmp)
+        os.replace(tmp, folder / f'{match_id}.pkl')
+
+def load_competitions(source: Optional[OpenDataSource] = None) -> pd.DataFrame:
+    """
+    List the competitions and seasons available in the open data.
+
+    Parameters:
+    - source (OpenDataSource, optional): Where to read from. Defaults to GitHub with the default cache.
+
+    Returns:
+    pd.DataFrame: One row per competition season, as in sb.competitions().
+    """
+    source = source or OpenDataSource()
+    return pd.DataFrame(loads(source.read('data/competitions.json')))
+
+def load_matches(competition_id: int, season_id: int, team: Optional[str] = None,
+                 source: Optional[OpenDataSource] = None) -> pd.DataFrame:
+    """
+    List the matches of a competition season, optionally only those of one team.
+
+    Parameters:
+    - competition_id (int): StatsBomb competition id, e.g. 11 for La Liga.
+    - season_id (int): StatsBomb season id, e.g. 41 for 2008/2009.
+    - team (str, optional): Keep the matches where this team played home or away, e.g. 'Barcelona'.
+    - source (OpenDataSource, optional): Where to read from. Defaults to GitHub with the default cache.
+
+    Returns:
+    pd.DataFrame: One row per match, sorted by date.
+    """
+    source = source or OpenDataSource()
+    raw = loads(source.read(f'data/matches/{competition_id}/{season_id}.json'))
+    matches = pd.DataFrame({column: [_get(match, path) for match in raw] for column, path in MATCH_FIELDS.items()})
+    if team is not None:
+        matches = matches[(matches['home_team'] == team) | (matches['away_team'] == team)]
+    return matches.sort_values(['match_date', 'kick_off']).reset_index(drop=True)
+
+def _resolve(cache: Dict[tuple, tuple], path: tuple) -> tuple:
+    # Positions and values of the events that have `path`; each prefix is walked once and only over
+    # the events that have it, so nested pass / shot fields only visit the few events carrying them
+    if path not in cache:
+        positions, parents = _resolve(cache, path[:-1])
+        step = path[-1]
+        if isinstance(step, int):
+            values = [parent[step] if len(parent) > step else None for parent in parents]
+        else:
+            values = [parent.get(step) for parent in parents]
+        keep = [i for i, value in enumerate(values) if value is not None]
+        cache[path] = (positions[keep], [values[i] for i in keep])
+    return cache[path]
+
+def events_frame(raw_events: List[Dict[str, Any]], match_id: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Convert the raw events of one match into a typed frame holding only the requested columns.
+
+    Parameters:
+    - raw_events (List[dict]): Content of data/events/<match_id>.json.
+    - match_id (int): The match id, added as a column.
+    - columns (List[str], optional): Keys of EVENT_FIELDS to keep. Defaults to all of them.
+
+    Returns:
+    pd.DataFrame: One row per event.
+    """
+    columns = columns or list(EVENT_FIELDS)
+    n = len(raw_events)
+    cache = {(): (np.arange(n), raw_events)}
+    data = {'match_id': np.full(n, match_id, dtype=np.int32)}
+    for column in columns:
+        path, dtype = EVENT_FIELDS[column]
+        positions, values = _resolve(cache, path)
+        if dtype == 'category':
+            codes = np.full(n, -1, dtype=np.int32)
+            found, categories = pd.factorize(np.array(values, dtype=object))
+            codes[positions] = found
+            data[column] = pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=str))
+        elif dtype in ('string', 'Int32'):
+            full = np.full(n, None, dtype=object)
+            full[positions] = values
+            data[column] = pd.array(full, dtype=dtype)
+        else:
+            full = np.zeros(n, dtype=dtype) if dtype == 'bool' or dtype.startswith('int') else np.full(n, np.nan, dtype=dtype)
+            full[positions] = values
+            data[column] = full
+    return pd.DataFrame(data)
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    # Concatenate per-match frames while keeping categoricals (plain concat turns differing categories into object)
+    if not frames:
+        return pd.DataFrame()
+    data = {}
+    for column in frames[0].columns:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            data[column] = union_categoricals([frame[column] for frame in frames])
+        else:
+            data[column] = pd.concat([frame[column] for frame in frames], ignore_index=True)
+    return pd.DataFrame(data)
+
+def load_match_events(match_id: int, columns: Optional[List[str]] = None,
+                      source: Optional[OpenDataSource] = None) -> pd.DataFrame:
+    """
+    Load the events of one match as a typed frame.
+
+    Parameters:
+    - match_id (int): StatsBomb match id, e.g. 69212.
+    - columns (List[str], optional): Keys of EVENT_FIELDS to keep. Defaults to all of them.
+    - source (OpenDataSource, optional): Where to read from. Defaults to GitHub with the default cache.
+
+    Returns:
+    pd.DataFrame: One row per event.
+    """
+    source = source or OpenDataSource()
+    data = source.read(f'data/events/{match_id}.json')
+    frame = source.get_frame(match_id, data)
+    if frame is None:
+        frame = events_frame(loads(data), match_id)
+        source.put_frame(match_id, data, frame)
+    return frame[['match_id'] + columns] if columns is not None else frame
+
+def load_season_events(competition_id: int, season_id: int, team: Optional[str] = None,
+                       columns: Optional[List[str]] = None, source: Optional[OpenDataSource] = None,
+                       workers: int = 8) -> pd.DataFrame:
+    """
+    Load the events of every match of a competition season, optionally only one team's matches.
+
+    Event files are read concurrently. Each one is converted into a small typed frame as soon
+    as it arrives, so raw JSON is never held for more than the matches in flight. Frames of
+    unchanged event files come straight from the source's cache.
+
+    Parameters:
+    - competition_id (int): StatsBomb competition id, e.g. 11 for La Liga.
+    - season_id (int): StatsBomb season id, e.g. 41 for 2008/2009.
+    - team (str, optional): Only the matches of this team, e.g. 'Barcelona'.
+    - columns (List[str], optional): Keys of EVENT_FIELDS to keep. Defaults to all of them.
+    - source (OpenDataSource, optional): Where to read from. Defaults to GitHub with the default cache.
+    - workers (int, optional): Number of files read at the same time. Defaults to 8.
+
+    Returns:
+    pd.DataFrame: Events of all matches, ordered by match date then event index.
+    """
+    source = source or OpenDataSource()
+    match_ids = load_matches(competition_id, season_id, team, source)['match_id'].tolist()
+
+    def load(match_id):
+        return load_match_events(match_id, columns, source)
+
+    frames = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(load, match_id): match_id for match_id in match_ids}
+        for future in as_completed(futures):
+            frames[futures[future]] = future.result()
+    return _concat([frames[match_id] for match_id in match_ids])
@@ -0,0 +1,13 @@
+# Moved to football_analytics.viz.render; this alias keeps `import WS_render` working from this folder.
+
+#Imports
+import sys
+from pathlib import Path
+
+_ROOT = str(Path(__file__).resolve().parents[3])
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+import football_analytics.viz.render as _module
+
+sys.modules[__name__] = _module
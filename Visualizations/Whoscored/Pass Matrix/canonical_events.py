@@ -0,0 +1,13 @@
+# Moved to football_analytics.analytics.canonical_events; this alias keeps `import canonical_events` working from this folder.
+
+#Imports
+import sys
+from pathlib import Path
+
+_ROOT = str(Path(__file__).resolve().parents[3])
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+import football_analytics.analytics.canonical_events as _module
+
+sys.modules[__name__] = _module
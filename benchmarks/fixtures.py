@@ -0,0 +1,391 @@
+#Imports
+import gzip
+import json
+import random
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+#Functions
+
+CORPUS_DIR = Path(__file__).resolve().parent / 'corpus'
+
+POSITIONS = ['GK', 'DR', 'DC', 'DC', 'DL', 'DMC', 'MC', 'MC', 'FWR', 'FW', 'FWL']
+BENCH_POSITIONS = ['Sub'] * 7
+FIRST_NAMES = ['Martin', "N'Golo", 'José', 'Kai', 'Bruno', 'Søren', 'Luka', 'İlkay']
+
+# Qualifiers drawn for each kind of event: (type value, displayName)
+PASS_QUALIFIERS = [(1, 'Longball'), (2, 'Cross'), (3, 'HeadPass'), (4, 'Throughball'), (155, 'Chipped'),
+                   (196, 'SwitchOfPlay'), (11113, 'KeyPass'), (107, 'ThrowIn'), (5, 'FreekickTaken')]
+SHOT_QUALIFIERS = [(15, 'Head'), (72, 'LeftFoot'), (20, 'RightFoot'), (22, 'RegularPlay'), (23, 'FastBreak')]
+ON_BALL_TYPES = ['Pass'] * 14 + ['TakeOn', 'BallTouch', 'Clearance', 'KeeperPickup']
+DEFENSIVE_TYPES = ['Tackle', 'Interception', 'BallRecovery', 'Aerial', 'Challenge', 'Foul']
+SHOT_TYPES = ['SavedShot', 'MissedShots', 'Goal', 'ShotOnPost']
+
+def _display(value: int, name: str) -> Dict[str, Any]:
+    return {'value': value, 'displayName': name}
+
+def _players(team_id: int, rng: random.Random) -> List[Dict[str, Any]]:
+    players = []
+    for number, position in enumerate(POSITIONS + BENCH_POSITIONS):
+        players.append({
+            'playerId': team_id * 1000 + number,
+            'shirtNo': number + 1,
+            'name': f'{rng.choice(FIRST_NAMES)} Player{team_id}-{number}',
+            'position': position,
+            'height': rng.randint(165, 200),
+            'weight': rng.randint(60, 95),
+            'age': rng.randint(18, 36),
+            'isFirstEleven': number < 11,
+            'isManOfTheMatch': False,
+            'field': 'home',
+            'stats': {},
+        })
+    return players
+
+def _qualifiers(choices: List[Tuple[int, str]], rng: random.Random, length: Optional[float] = None) -> List[Dict[str, Any]]:
+    qualifiers = [{'type': _display(value, name)} for value, name in rng.sample(choices, rng.randint(0, 2))]
+    if length is not None:
+        qualifiers.append({'type': _display(212, 'Length'), 'value': f'{length:.1f}'})
+        qualifiers.append({'type': _display(213, 'Angle'), 'value': f'{rng.uniform(0, 6.28):.2f}'})
+        qualifiers.append({'type': _display(56, 'Zone'), 'value': rng.choice(['Back', 'Center', 'Left', 'Right'])})
+    return qualifiers
+
+def whoscored_match(seed: int = 0, events: int = 1700, home_id: int = 26, away_id: int = 167,
+                    kick_off: str = '2023-11-25 12:30:00', home_name: str = 'Home FC',
+                    away_name: str = 'Away FC') -> Dict[str, Any]:
+    """
+    Generate a finished match in the matchCentreData format.
+
+    Events come in possessions: a run of passes, carries and take-ons of one team between
+    its players on the pitch, ended by a lost ball, a defensive action of the other team
+    or a shot. Both halves start and end with teamless Start/End events, three substitutions
+    per team happen in the second half and passes and shots carry the usual qualifiers, so
+    the normalization, possession chains, pass networks and pass classification all have
+    realistic work to do.
+
+    Parameters:
+    - seed (int, optional): Random seed. Defaults to 0.
+    - events (int, optional): Approximate number of events. Defaults to 1700, a typical Premier League match.
+    - home_id (int, optional): Home teamId. Defaults to 26.
+    - away_id (int, optional): Away teamId. Defaults to 167.
+    - kick_off (str, optional): Kick-off timestamp, 'YYYY-MM-DD HH:MM:SS'.
+    - home_name (str, optional): Home team name.
+    - away_name (str, optional): Away team name.
+
+    Returns:
+    Dict[str, Any]: The matchCentreData dictionary.
+    """
+    rng = random.Random(seed)
+    squads = {home_id: _players(home_id, rng), away_id: _players(away_id, rng)}
+    on_pitch = {team_id: [player['playerId'] for player in squad[:11]] for team_id, squad in squads.items()}
+    bench = {team_id: [player['playerId'] for player in squad[11:]] for team_id, squad in squads.items()}
+    other = {home_id: away_id, away_id: home_id}
+    raw_events = []
+    score = {home_id: 0, away_id: 0}
+
+    team_events = {home_id: 0, away_id: 0}
+
+    def add(team_id, player_id, type_name, minute, successful=True, x=None, y=None, **extra):
+        # id is unique in the match, while eventId counts the events of each team, as on WhoScored
+        team_events[team_id] += 1
+        event = {
+            'id': 2_000_000_000 + seed * 10_000 + len(raw_events) + 1,
+            'eventId': team_events[team_id],
+            'minute': minute,
+            'second': float(rng.randint(0, 59)),
+            'teamId': team_id,
+            'x': round(rng.uniform(0, 100) if x is None else x, 1),
+            'y': round(rng.uniform(0, 100) if y is None else y, 1),
+            'expandedMinute': minute,
+            'period': period,
+            'type': _display(ON_BALL_TYPES.index(type_name) + 1 if type_name in ON_BALL_TYPES else 1, type_name),
+            'outcomeType': _display(1 if successful else 0, 'Successful' if successful else 'Unsuccessful'),
+            'qualifiers': [],
+            'satisfiedEventsTypes': [],
+            'isTouch': player_id is not None,
+        }
+        if player_id is not None:
+            event['playerId'] = player_id
+        event.update(extra)
+        raw_events.append(event)
+        return event
+
+    per_half = events // 2
+    for half, (start_minute, end_minute) in enumerate([(0, 45), (45, 90)]):
+        period = _display(half + 1, 'FirstHalf' if half == 0 else 'SecondHalf')
+        for team_id in (home_id, away_id):
+            add(team_id, None, 'Start', start_minute, x=0, y=0)
+        first = len(raw_events)
+        substitution_at = {first + per_half * fraction // 10: fraction for fraction in (4, 6, 8)} if half else {}
+        team_id = home_id if half == 0 else away_id
+        while len(raw_events) - first < per_half:
+            minute = start_minute + (len(raw_events) - first) * (end_minute - start_minute) // per_half
+            for position in list(substitution_at):
+                if len(raw_events) >= position:
+                    del substitution_at[position]
+                    for side in (home_id, away_id):
+                        player_out = on_pitch[side].pop(rng.randrange(1, len(on_pitch[side])))
+                        player_in = bench[side].pop(0)
+                        on_pitch[side].append(player_in)
+                        add(side, player_out, 'SubstitutionOff', minute, x=0, y=0)
+                        add(side, player_in, 'SubstitutionOn', minute, x=0, y=0)
+
+            # One possession of team_id
+            x = rng.uniform(10, 60)
+            player_id = rng.choice(on_pitch[team_id][1:])
+            for _ in range(max(1, int(rng.expovariate(1 / 5)))):
+                type_name = rng.choice(ON_BALL_TYPES)
+                receiver = rng.choice([p for p in on_pitch[team_id] if p != player_id])
+                if type_name == 'Pass':
+                    end_x = min(100.0, max(0.0, x + rng.uniform(-10, 25)))
+                    length = abs(end_x - x) + rng.uniform(0, 10)
+                    successful = rng.random() < 0.82
+                    event = add(team_id, player_id, 'Pass', minute, successful, x=x, endX=round(end_x, 1),
+                                endY=round(rng.uniform(0, 100), 1))
+                    event['qualifiers'] = _qualifiers(PASS_QUALIFIERS, rng, length)
+                    x = end_x
+                    if not successful:
+                        break
+                    player_id = receiver
+                else:
+                    successful = rng.random() < 0.7
+                    add(team_id, player_id, type_name, minute, successful, x=x)
+                    if not successful:
+                        break
+            else:
+                if x > 70 and rng.random() < 0.35:
+                    type_name = rng.choices(SHOT_TYPES, weights=[4, 5, 1, 0.3])[0]
+                    event = add(team_id, player_id, type_name, minute, x=rng.uniform(75, 95), y=rng.uniform(35, 65),
+                                isShot=True, goalMouthY=round(rng.uniform(40, 60), 1), goalMouthZ=round(rng.uniform(0, 40), 1))
+                    event['qualifiers'] = _qualifiers(SHOT_QUALIFIERS, rng)
+                    if type_name == 'Goal':
+                        event['isGoal'] = True
+                        score[team_id] += 1
+                    elif type_name == 'MissedShots' and rng.random() < 0.3:
+                        event.update(blockedX=round(rng.uniform(85, 98), 1), blockedY=round(rng.uniform(40, 60), 1))
+            # The other team wins the ball, often through a defensive action
+            if rng.random() < 0.5:
+                type_name = rng.choice(DEFENSIVE_TYPES)
+                event = add(other[team_id], rng.choice(on_pitch[other[team_id]]), type_name, minute, rng.random() < 0.7,
+                            x=100 - x)
+                if type_name == 'Foul' and rng.random() < 0.15:
+                    event['cardType'] = _display(31, 'Yellow')
+            team_id = other[team_id]
+        for team_id in (home_id, away_id):
+            add(team_id, None, 'End', end_minute, x=0, y=0)
+
+    timestamp = kick_off
+    home = {'teamId': home_id, 'name': home_name, 'countryName': 'England', 'players': squads[home_id], 'field': 'home',
+            'formations': [], 'stats': {}, 'incidentEvents': [], 'shotZones': {}, 'managerName': 'Manager',
+            'scores': {'fulltime': score[home_id]}, 'averageAge': 26.0}
+    away = {**home, 'teamId': away_id, 'name': away_name, 'players': [{**player, 'field': 'away'} for player in squads[away_id]],
+            'field': 'away', 'scores': {'fulltime': score[away_id]}}
+    return {
+        'playerIdNameDictionary': {str(player['playerId']): player['name'] for squad in squads.values() for player in squad},
+        'periodMinuteLimits': {'1': 45, '2': 90}, 'timeStamp': timestamp, 'attendance': 40000, 'venueName': 'Stadium',
+        'referee': {}, 'weatherCode': '', 'elapsed': 'FT', 'startTime': timestamp.replace(' ', 'T'), 'startDate': timestamp,
+        'score': f'{score[home_id]} : {score[away_id]}', 'htScore': '', 'ftScore': f'{score[home_id]} : {score[away_id]}',
+        'etScore': '', 'pkScore': '', 'statusCode': 6, 'periodCode': 7, 'home': home, 'away': away,
+        'maxMinute': 90, 'minuteExpanded': 90, 'maxPeriod': 2, 'expandedMinutes': {}, 'expandedMaxMinute': 90,
+        'periodEndMinutes': {'1': 45, '2': 90}, 'commonEvents': [], 'events': raw_events, 'timeoutInSeconds': 0,
+    }
+
+def whoscored_season(teams: int = 20, events: int = 1700, seed: int = 0,
+                     start: str = '2023-08-12 15:00:00') -> List[Dict[str, Any]]:
+    """
+    Generate a double round-robin season: 380 matches and about 650,000 events with the defaults.
+
+    Parameters:
+    - teams (int, optional): Number of teams. Defaults to 20.
+    - events (int, optional): Approximate events per match. Defaults to 1700.
+    - seed (int, optional): Random seed. Defaults to 0.
+    - start (str, optional): Kick-off of the first round.
+
+    Returns:
+    List[Dict[str, Any]]: matchCentreData of every match, round by round.
+    """
+    team_ids = [100 + team for team in range(teams)]
+    rotation = team_ids[1:]
+    rounds = []
+    for _ in range(teams - 1):
+        pairs = [(team_ids[0], rotation[0])] + [(rotation[k], rotation[-k]) for k in range(1, teams // 2)]
+        rounds.append(pairs)
+        rotation = rotation[-1:] + rotation[:-1]
+    rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+
+    first = datetime.strptime(start, '%Y-%m-%d %H:%M:%S')
+    matches = []
+    for number, pairs in enumerate(rounds):
+        for slot, (home, away) in enumerate(pairs):
+            kick_off = (first + timedelta(days=7 * number, hours=slot % 4 * 2)).strftime('%Y-%m-%d %H:%M:%S')
+            matches.append(whoscored_match(seed * 100_000 + len(matches), events, home, away, kick_off,
+                                           f'Team {home}', f'Team {away}'))
+    return matches
+
+def match_page(match_data: Dict[str, Any], match_id: int = 1729398, filler: int = 2000) -> str:
+    """
+    Wrap matchCentreData in a Whoscored-like match page.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - match_id (int, optional): Whoscored match id written in the page.
+    - filler (int, optional): Lines of markup around the data. Defaults to 2000.
+
+    Returns:
+    str: The HTML page.
+    """
+    markup = "<div class='match-centre'>filler</div>\n" * filler
+    data = json.dumps(match_data, separators=(',', ':'))
+    return ("<html><head><script>var config = {};</script></head><body>" + markup +
+            '<script type="text/javascript">\n require.config.params["args"] = {\n'
+            f' matchId: {match_id},\n matchCentreData: {data},\n matchCentreEventTypeJson: {{}},\n'
+            ' formationIdNameMappings: {}\n };\n</script></body></html>')
+
+def statsbomb_events(seed: int = 0, events: int = 3500, home: Tuple[int, str] = (217, 'Barcelona'),
+                     away: Tuple[int, str] = (206, 'Deportivo Alavés')) -> List[Dict[str, Any]]:
+    """
+    Generate the raw events of a StatsBomb match, as in data/events/<match_id>.json.
+
+    Parameters:
+    - seed (int, optional): Random seed. Defaults to 0.
+    - events (int, optional): Number of events. Defaults to 3500.
+    - home (Tuple[int, str], optional): Home team id and name.
+    - away (Tuple[int, str], optional): Away team id and name.
+
+    Returns:
+    List[Dict[str, Any]]: The events.
+    """
+    rng = random.Random(seed)
+    teams = [home, away]
+    players = {team_id: [(team_id * 100 + k, f'{name} Player {k}') for k in range(11)] for team_id, name in teams}
+    cycle = ['Pass', 'Ball Receipt*', 'Carry', 'Pass', 'Ball Receipt*', 'Carry', 'Pressure', 'Duel', 'Clearance',
+             'Ball Recovery', 'Shot']
+    raw_events = []
+    possession, team = 1, 0
+    for index in range(events):
+        if rng.random() < 0.12:
+            possession += 1
+            team = 1 - team
+        team_id, team_name = teams[team]
+        player_id, player_name = rng.choice(players[team_id])
+        type_name = rng.choice(cycle)
+        event = {
+            'id': f'{seed:08x}-{index:04x}-4000-8000-{index:012x}', 'index': index + 1, 'period': 1 + index * 2 // events,
+            'timestamp': f'00:{index * 45 // events:02d}:{rng.randint(0, 59):02d}.000', 'minute': index * 90 // events,
+            'second': rng.randint(0, 59), 'type': {'id': 30, 'name': type_name}, 'possession': possession,
+            'possession_team': {'id': team_id, 'name': team_name}, 'play_pattern': {'id': 1, 'name': 'Regular Play'},
+            'team': {'id': team_id, 'name': team_name}, 'player': {'id': player_id, 'name': player_name},
+            'position': {'id': 1, 'name': 'Center Forward'}, 'duration': round(rng.uniform(0, 2), 3),
+            'location': [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)],
+        }
+        if rng.random() < 0.1:
+            event['under_pressure'] = True
+        if type_name == 'Pass':
+            recipient_id, recipient_name = rng.choice(players[team_id])
+            event['pass'] = {'recipient': {'id': recipient_id, 'name': recipient_name}, 'length': round(rng.uniform(2, 60), 2),
+                             'angle': round(rng.uniform(-3.14, 3.14), 3), 'height': {'id': 1, 'name': 'Ground Pass'},
+                             'end_location': [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)],
+                             'body_part': {'id': 40, 'name': 'Right Foot'}}
+            if rng.random() < 0.2:
+                event['pass']['outcome'] = {'id': 9, 'name': 'Incomplete'}
+        elif type_name == 'Carry':
+            event['carry'] = {'end_location': [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)]}
+        elif type_name == 'Shot':
+            event['shot'] = {'statsbomb_xg': round(rng.uniform(0.01, 0.6), 3), 'outcome': {'id': 100, 'name': 'Saved'},
+                             'end_location': [120.0, round(rng.uniform(36, 44), 1), round(rng.uniform(0, 2.5), 1)],
+                             'body_part': {'id': 40, 'name': 'Right Foot'},
+                             'freeze_frame': [{'location': [rng.uniform(90, 120), rng.uniform(20, 60)],
+                                               'player': {'id': k, 'name': 'x'}, 'teammate': k % 2 == 0} for k in range(10)]}
+        elif type_name == 'Duel':
+            event['duel'] = {'type': {'id': 11, 'name': 'Tackle'}, 'outcome': {'id': 4, 'name': 'Won'}}
+        raw_events.append(event)
+    return raw_events
+
+def fbref_table(players: int = 2800, stats: int = 120, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a Big 5 player table shaped like FB_fetch.build_wide_table output.
+
+    Parameters:
+    - players (int, optional): Number of rows. Defaults to 2800, a Big 5 season.
+    - stats (int, optional): Number of stat columns besides minutes. Defaults to 120.
+    - seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+    pd.DataFrame: The six id columns, 'stats_Playing Time_90s' and float stat columns with some NaN.
+    """
+    rng = np.random.default_rng(seed)
+    comps = ['Premier League', 'La Liga', 'Serie A', 'Bundesliga', 'Ligue 1']
+    df = pd.DataFrame({
+        'Player': [f'Player {k}' for k in range(players)],
+        'Nation': rng.choice(['ESP', 'ENG', 'FRA', 'GER', 'ITA', 'BRA'], players),
+        'Pos': rng.choice(['GK', 'DF', 'MF', 'FW', 'MF,FW', 'DF,MF'], players),
+        'Squad': [f'Squad {k % 98}' for k in range(players)],
+        'Comp': rng.choice(comps, players),
+        'Age': rng.integers(17, 38, players).astype(str),
+        'stats_Playing Time_90s': np.round(rng.uniform(0.1, 38, players), 1),
+    })
+    values = rng.gamma(2.0, 10.0, (players, stats))
+    values[rng.random((players, stats)) < 0.05] = np.nan
+    return pd.concat([df, pd.DataFrame(values, columns=[f'stat_{k}' for k in range(stats)])], axis=1)
+
+def _read_json(path: Path) -> Any:
+    data = path.read_bytes()
+    if path.suffix == '.gz':
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+def load_corpus(directory: Union[str, Path] = CORPUS_DIR) -> Dict[str, list]:
+    """
+    Load the recorded fixtures: whoscored/*.json[.gz] (matchCentreData) and statsbomb/*.json[.gz] (raw events).
+
+    Parameters:
+    - directory (str or Path, optional): Corpus directory. Defaults to benchmarks/corpus.
+
+    Returns:
+    Dict[str, list]: 'whoscored' -> list of matchCentreData, 'statsbomb' -> list of (match_id, raw events).
+    """
+    directory = Path(directory)
+    corpus = {'whoscored': [], 'statsbomb': []}
+    for path in sorted((directory / 'whoscored').glob('*.json*')):
+        corpus['whoscored'].append(_read_json(path))
+    for path in sorted((directory / 'statsbomb').glob('*.json*')):
+        corpus['statsbomb'].append((int(re.match(r'\d+', path.name).group()), _read_json(path)))
+    return corpus
+
+def record(path: Union[str, Path], directory: Union[str, Path] = CORPUS_DIR) -> Path:
+    """
+    Copy a match into the corpus, gzip-compressed.
+
+    Accepted inputs: a saved Whoscored match page (.html), a matchCentreData JSON file, a
+    MatchCache entry (<match_id>.json.gz) or a StatsBomb data/events/<match_id>.json file.
+
+    Parameters:
+    - path (str or Path): The file to record.
+    - directory (str or Path, optional): Corpus directory. Defaults to benchmarks/corpus.
+
+    Returns:
+    Path: The corpus file written.
+    """
+    path, directory = Path(path), Path(directory)
+    if path.suffix in ('.html', '.htm'):
+        from football_analytics.scrape.extract import extract_match_centre_data
+        data = extract_match_centre_data(path.read_bytes())
+    else:
+        data = _read_json(path)
+        if isinstance(data, dict) and 'data' in data and 'fetched_at' in data:
+            data = data['data']
+
+    if isinstance(data, list):
+        match_id = re.match(r'\d+', path.name).group()
+        target = directory / 'statsbomb' / f'{match_id}.json.gz'
+    else:
+        stamp = re.sub(r'\D', '', data['timeStamp'])[:12]
+        target = directory / 'whoscored' / f"{stamp}-{data['home']['teamId']}-{data['away']['teamId']}.json.gz"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(gzip.compress(json.dumps(data, separators=(',', ':')).encode('utf-8')))
+    return target
@@ -0,0 +1,415 @@
+#Imports
+import argparse
+import fnmatch
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCHMARKS_DIR / 'results'
+THRESHOLDS_FILE = BENCHMARKS_DIR / 'thresholds.json'
+
+# The Whoscored code is the football_analytics package at the root; FBREF and StatsBomb are loose scripts
+sys.path.insert(0, str(ROOT))
+for folder in ('FBREF', 'StatsBomb'):
+    sys.path.append(str(ROOT / folder))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+import numpy as np
+import pandas as pd
+
+import fixtures
+
+#Functions
+
+CASES = {}
+
+def case(name: str, scale: str = 'match', repeat: Optional[int] = None, needs: tuple = ()) -> Callable:
+    """
+    Register a benchmark case.
+
+    The function receives the Fixtures and returns the number of rows it processed.
+
+    Parameters:
+    - name (str): Case name, '<source>.<stage>'.
+    - scale (str, optional): 'match' for the per-match corpus, 'season' for the synthetic season. Defaults to 'match'.
+    - repeat (int, optional): Number of runs, overriding the command line for slow cases.
+    - needs (tuple, optional): Fixtures attributes built before the timing starts, e.g. ('season_events',).
+
+    Returns:
+    Callable: The decorator.
+    """
+    def decorator(function):
+        CASES[name] = {'function': function, 'scale': scale, 'repeat': repeat, 'needs': needs}
+        return function
+    return decorator
+
+class Fixtures:
+    """
+    Inputs of the benchmark cases, built on first use so a run only pays for what its cases need.
+
+    Recorded matches from benchmarks/corpus are used when there are any; otherwise the
+    synthetic generators of fixtures.py fill in, and the results say so.
+
+    Parameters:
+    - corpus (Dict[str, list]): Result of fixtures.load_corpus.
+    - matches (int, optional): Synthetic Whoscored matches when the corpus has none. Defaults to 4.
+    """
+
+    def __init__(self, corpus: Dict[str, list], matches: int = 4):
+        self.recorded = bool(corpus['whoscored']) or bool(corpus['statsbomb'])
+        self._whoscored = corpus['whoscored'] or [fixtures.whoscored_match(seed, kick_off=f'2023-11-2{seed} 12:30:00')
+                                                  for seed in range(matches)]
+        self._statsbomb = corpus['statsbomb'] or [(3_800_000 + seed, fixtures.statsbomb_events(seed)) for seed in range(2)]
+        self._cache = {}
+
+    def _get(self, key: str, build: Callable) -> Any:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def matches(self) -> List[Dict[str, Any]]:
+        return self._whoscored
+
+    @property
+    def pages(self) -> List[str]:
+        return self._get('pages', lambda: [fixtures.match_page(match_data) for match_data in self.matches])
+
+    @property
+    def events(self) -> List[pd.DataFrame]:
+        from football_analytics.analytics.normalize import normalize_events
+        return self._get('events', lambda: [normalize_events(match_data) for match_data in self.matches])
+
+    @property
+    def statsbomb(self) -> list:
+        return self._statsbomb
+
+    @property
+    def fbref(self) -> pd.DataFrame:
+        return self._get('fbref', fixtures.fbref_table)
+
+    @property
+    def season(self) -> List[Dict[str, Any]]:
+        return self._get('season', fixtures.whoscored_season)
+
+    @property
+    def season_events(self) -> pd.DataFrame:
+        from football_analytics.analytics.normalize import normalize_events
+        return self._get('season_events', lambda: pd.concat(
+            [normalize_events(match_data, keep_qualifiers=False) for match_data in self.season], ignore_index=True))
+
+# Whoscored, per match
+
+@case('ws.extract')
+def _extract(data: Fixtures) -> int:
+    from football_analytics.scrape.extract import extract_match_centre_data
+    return sum(len(extract_match_centre_data(page)['events']) for page in data.pages)
+
+@case('ws.normalize')
+def _normalize(data: Fixtures) -> int:
+    from football_analytics.analytics.normalize import normalize_events
+    return sum(len(normalize_events(match_data)) for match_data in data.matches)
+
+@case('ws.passes')
+def _passes(data: Fixtures) -> int:
+    from football_analytics.analytics.passes import get_passes_df
+    return sum(len(get_passes_df(df, side, match_data))
+               for df, match_data in zip(data.events, data.matches) for side in ('home', 'away'))
+
+@case('ws.pass_network')
+def _pass_network(data: Fixtures) -> int:
+    from football_analytics.analytics.passes import get_passes_between_df, get_passes_df
+    passes = data._get('passes', lambda: [get_passes_df(df, side, match_data)
+                                          for df, match_data in zip(data.events, data.matches) for side in ('home', 'away')])
+    return sum(len(get_passes_between_df(df_passes)[1]) for df_passes in passes)
+
+@case('ws.pass_arrows')
+def _pass_arrows(data: Fixtures) -> int:
+    from football_analytics.analytics.passes import get_pass_arrows_df
+    return sum(len(get_pass_arrows_df(df)) for df in data.events)
+
+@case('ws.render.pass_network', repeat=3)
+def _render_pass_network(data: Fixtures) -> int:
+    from football_analytics.viz.pass_matrix import plot_pitch
+    plot_pitch(data.events[0], data.matches[0], output=io.BytesIO(), format='png')
+    return len(data.events[0])
+
+@case('ws.render.pass_arrows', repeat=3)
+def _render_pass_arrows(data: Fixtures) -> int:
+    from football_analytics.viz.pass_arrows import plot_arrows
+    plot_arrows(data.events[0], data.matches[0], output=io.BytesIO(), format='png')
+    return len(data.events[0])
+
+# FBREF and StatsBomb
+
+@case('fb.per90')
+def _per90(data: Fixtures) -> int:
+    # The per-90 transform of Big5Leagues.ipynb
+    df = data.fbref
+    columnas = df.iloc[:, 7:]
+    n90s_df = columnas.div(df['stats_Playing Time_90s'], axis=0)
+    n90s_df.columns = [f'Per90s_{column}' for column in columnas.columns]
+    n90s_df = df.iloc[:, :6].join(n90s_df.round(2))
+    return len(n90s_df)
+
+@case('fb.percentiles')
+def _percentiles(data: Fixtures) -> int:
+    from FB_percentiles import get_percentiles
+    return len(get_percentiles(data.fbref))
+
+@case('sb.events_frame')
+def _events_frame(data: Fixtures) -> int:
+    from SB_loader import events_frame
+    return sum(len(events_frame(raw_events, match_id)) for match_id, raw_events in data.statsbomb)
+
+# Synthetic season, ~650k events
+
+@case('season.normalize', scale='season', repeat=1, needs=('season',))
+def _season_normalize(data: Fixtures) -> int:
+    from football_analytics.analytics.normalize import normalize_events
+    return sum(len(normalize_events(match_data, keep_qualifiers=False)) for match_data in data.season)
+
+@case('season.possession_chains', scale='season', needs=('season_events',))
+def _season_chains(data: Fixtures) -> int:
+    from football_analytics.analytics.possession import possession_chains
+    return len(possession_chains(data.season_events))
+
+@case('season.pass_networks', scale='season', needs=('season_events',))
+def _season_networks(data: Fixtures) -> int:
+    from football_analytics.analytics.pass_network import batch_pass_networks
+    return len(batch_pass_networks(data.season_events)[1])
+
+@case('season.classify_passes', scale='season', needs=('season_events',))
+def _season_classify(data: Fixtures) -> int:
+    from football_analytics.analytics.pass_classification import classify_passes
+    return len(classify_passes(data.season_events))
+
+def time_case(function: Callable, data: Fixtures, repeat: int, warmup: bool = True) -> Dict[str, float]:
+    """
+    Time one case.
+
+    Parameters:
+    - function (Callable): The case.
+    - data (Fixtures): Its inputs.
+    - repeat (int): Number of timed runs.
+    - warmup (bool, optional): Run once untimed first, so imports and caches are not measured. Defaults to True.
+
+    Returns:
+    Dict[str, float]: Best and median seconds, number of runs, rows and rows per second of the best run.
+    """
+    if warmup:
+        function(data)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = function(data)
+        times.append(time.perf_counter() - start)
+    return {'min_s': min(times), 'median_s': statistics.median(times), 'repeat': repeat, 'rows': rows,
+            'rows_per_s': rows / min(times) if min(times) else float('inf')}
+
+def git_commit() -> str:
+    """
+    Return the current commit hash, with a -dirty suffix when tracked files have uncommitted changes.
+
+    Returns:
+    str: The commit, or 'unknown' outside a git checkout.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD', '--', '.', ':!benchmarks/results'], cwd=ROOT).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if dirty else commit
+
+def run(patterns: Optional[List[str]] = None, scale: str = 'match', repeat: int = 5,
+        corpus_dir: Path = fixtures.CORPUS_DIR) -> Dict[str, Any]:
+    """
+    Run the selected cases.
+
+    Parameters:
+    - patterns (List[str], optional): fnmatch patterns of case names, e.g. ['ws.*']. Defaults to every case.
+    - scale (str, optional): 'match', 'season' or 'all'. Defaults to 'match'.
+    - repeat (int, optional): Timed runs per case. Defaults to 5.
+    - corpus_dir (Path, optional): Corpus directory. Defaults to benchmarks/corpus.
+
+    Returns:
+    Dict[str, Any]: The results document: commit, date, environment, scale, fixtures and one entry per case.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+    data = Fixtures(fixtures.load_corpus(corpus_dir))
+    results = {
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': f'{platform.node()} {platform.machine()}',
+        'scale': scale,
+        'fixtures': 'recorded' if data.recorded else 'synthetic',
+        'cases': {},
+    }
+    for name, spec in CASES.items():
+        if scale != 'all' and spec['scale'] != scale:
+            continue
+        if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        for need in spec['needs']:
+            getattr(data, need)
+        times = time_case(spec['function'], data, spec['repeat'] or repeat, warmup=spec['scale'] == 'match')
+        results['cases'][name] = times
+        print(f"{name:<28} {times['min_s'] * 1000:>10.1f} ms  {times['rows_per_s']:>14,.0f} rows/s", flush=True)
+    return results
+
+def save(results: Dict[str, Any], directory: Path = RESULTS_DIR) -> Path:
+    """
+    Store a results document as results/<commit>.json, merging the cases of earlier runs of the same commit.
+
+    Parameters:
+    - results (Dict[str, Any]): Result of run.
+    - directory (Path, optional): Results directory. Defaults to benchmarks/results.
+
+    Returns:
+    Path: The file written.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{results['commit']}.json"
+    if path.exists():
+        previous = json.loads(path.read_text(encoding='utf-8'))
+        results = {**results, 'scale': 'all' if previous.get('scale') != results['scale'] else results['scale'],
+                   'cases': {**previous.get('cases', {}), **results['cases']}}
+    path.write_text(json.dumps(results, indent=1, sort_keys=True), encoding='utf-8')
+    return path
+
+def find_baseline(commit: Optional[str] = None, directory: Path = RESULTS_DIR) -> Optional[Dict[str, Any]]:
+    """
+    Load the results of a commit, or of the nearest earlier commit with stored results.
+
+    Parameters:
+    - commit (str, optional): Any git revision. Defaults to the parent of HEAD, or HEAD itself when the tree is dirty.
+    - directory (Path, optional): Results directory. Defaults to benchmarks/results.
+
+    Returns:
+    Optional[Dict[str, Any]]: The results document, or None.
+    """
+    if commit is None:
+        commit = 'HEAD' if git_commit().endswith('-dirty') else 'HEAD~1'
+    try:
+        history = subprocess.run(['git', 'rev-list', '--max-count=500', commit], cwd=ROOT, capture_output=True,
+                                 text=True, check=True).stdout.split()
+    except (OSError, subprocess.CalledProcessError):
+        history = [commit]
+    for revision in history:
+        path = directory / f'{revision}.json'
+        if path.exists():
+            return json.loads(path.read_text(encoding='utf-8'))
+    return None
+
+def load_thresholds(path: Path = THRESHOLDS_FILE) -> Dict[str, Any]:
+    """
+    Read the regression thresholds.
+
+    Parameters:
+    - path (Path, optional): Thresholds file. Defaults to benchmarks/thresholds.json.
+
+    Returns:
+    Dict[str, Any]: 'default' (allowed ratio to the baseline), 'min_delta_s' (slowdowns below this are noise)
+    and per-case 'cases' ratios.
+    """
+    return json.loads(path.read_text(encoding='utf-8'))
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], thresholds: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Compare the best times of two result documents.
+
+    A case regresses when it is slower than the baseline by more than its allowed ratio
+    and by more than min_delta_s seconds.
+
+    Parameters:
+    - current (Dict[str, Any]): Results under test.
+    - baseline (Dict[str, Any]): Reference results.
+    - thresholds (Dict[str, Any]): Result of load_thresholds.
+
+    Returns:
+    pd.DataFrame: Per common case: baseline and current milliseconds, the ratio, the allowed ratio and whether it regressed.
+    """
+    rows = []
+    for name, times in current['cases'].items():
+        if name not in baseline['cases']:
+            continue
+        before, after = baseline['cases'][name]['min_s'], times['min_s']
+        allowed = thresholds.get('cases', {}).get(name, thresholds.get('default', 1.25))
+        rows.append({'case': name, 'baseline_ms': before * 1000, 'current_ms': after * 1000, 'ratio': after / before,
+                     'allowed': allowed,
+                     'regressed': after / before > allowed and after - before > thresholds.get('min_delta_s', 0.0)})
+    return pd.DataFrame(rows, columns=['case', 'baseline_ms', 'current_ms', 'ratio', 'allowed', 'regressed'])
+
+def _report(current: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> int:
+    if baseline is None:
+        print('No baseline results to compare with.')
+        return 0
+    if baseline.get('machine') != current.get('machine') or baseline.get('fixtures') != current.get('fixtures'):
+        print(f"Warning: baseline ran on {baseline.get('machine')} with {baseline.get('fixtures')} fixtures.")
+    table = compare(current, baseline, load_thresholds())
+    print(f"\nAgainst {baseline['commit']}:")
+    print(table.to_string(index=False, float_format=lambda value: f'{value:.2f}'))
+    regressed = table.loc[table['regressed'], 'case'].tolist()
+    if regressed:
+        print(f"\nRegressions: {', '.join(regressed)}")
+        return 1
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark suite over recorded and synthetic fixtures.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the cases, store the results and check them against a baseline')
+    run_parser.add_argument('cases', nargs='*', help='fnmatch patterns of case names, e.g. "ws.*"')
+    run_parser.add_argument('--scale', choices=['match', 'season', 'all'], default='match')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--baseline', help='git revision to compare with; defaults to the nearest earlier stored run')
+    run_parser.add_argument('--no-save', action='store_true', help='do not store the results')
+
+    compare_parser = commands.add_parser('compare', help='compare the stored results of two revisions')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current', nargs='?', default='HEAD')
+
+    record_parser = commands.add_parser('record', help='add matches to the fixture corpus')
+    record_parser.add_argument('paths', nargs='+', help='.html match pages, matchCentreData JSON, MatchCache entries '
+                                                      'or StatsBomb events files')
+
+    commands.add_parser('list', help='list the cases')
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for name, spec in CASES.items():
+            print(f"{name:<28} {spec['scale']}")
+        return 0
+    if args.command == 'record':
+        for path in args.paths:
+            print(fixtures.record(path))
+        return 0
+    if args.command == 'compare':
+        current = find_baseline(args.current)
+        if current is None:
+            print(f'No stored results for {args.current}.')
+            return 1
+        return _report(current, find_baseline(args.baseline))
+
+    results = run(args.cases, args.scale, args.repeat)
+    if not args.no_save:
+        print(f'Saved {save(results)}')
+    return _report(results, find_baseline(args.baseline))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,23 @@
+# Football analytics package: Whoscored scraping, event storage, pass analytics and plots.
+#
+#   scrape     match pages over a browser pool or plain HTTP, matchCentreData extraction, cache, live polling
+#   storage    Parquet event store, ingestion job and the Supabase upload
+#   analytics  event normalization, possession chains, pass networks and pass classification
+#   viz        pass network and pass arrows plots, headless rendering and the render cache
+#   trace      stage timing spans
+#
+# Every subpackage imports its modules on first use, so e.g. an analytics worker never loads selenium,
+# pydantic, supabase, aiohttp, matplotlib or mplsoccer.
+
+#Imports
+from football_analytics._lazy import lazy_exports
+
+#Functions
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'analytics': None,
+    'scrape': None,
+    'storage': None,
+    'trace': None,
+    'viz': None,
+})
@@ -0,0 +1,36 @@
+#Imports
+import importlib
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+#Functions
+
+def lazy_exports(package: str, exports: Dict[str, Optional[str]]) -> Tuple[Callable, Callable, List[str]]:
+    """
+    Build the __getattr__, __dir__ and __all__ of a package whose names are imported on first use (PEP 562).
+
+    Importing the package then loads none of its modules; `package.name` imports the module
+    that defines `name` and keeps the value, so later lookups are plain attribute reads.
+
+    Parameters:
+    - package (str): __name__ of the package.
+    - exports (Dict[str, str]): Module of the package defining each name, or None for a name that is itself a module.
+
+    Returns:
+    Tuple[Callable, Callable, List[str]]: The __getattr__, __dir__ and __all__ of the package.
+    """
+    def __getattr__(name: str):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = exports[name]
+        if module is None:
+            value = importlib.import_module(f'{package}.{name}')
+        else:
+            value = getattr(importlib.import_module(f'{package}.{module}'), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
@@ -0,0 +1,27 @@
+# Event tables and the analyses drawn from them; needs only numpy and pandas.
+
+#Imports
+from football_analytics._lazy import lazy_exports
+
+#Functions
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'from_statsbomb': 'canonical_events',
+    'from_whoscored': 'canonical_events',
+    'attach_labels': 'dimensions',
+    'ensure_labels': 'dimensions',
+    'normalize_match': 'dimensions',
+    'normalize_events': 'normalize',
+    'classify_passes': 'pass_classification',
+    'batch_pass_networks': 'pass_network',
+    'build_pass_network': 'pass_network',
+    'get_df_info': 'passes',
+    'get_pass_arrows_df': 'passes',
+    'get_passes_between_df': 'passes',
+    'get_passes_df': 'passes',
+    'PlayerIndex': 'player_search',
+    'chain_summary': 'possession',
+    'possession_chains': 'possession',
+    'has_qualifier': 'qualifiers',
+    'qualifier_table': 'qualifiers',
+})
@@ -0,0 +1,216 @@
+#Imports
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+#Functions
+
+# Event types of the canonical table. The names follow WhoScored, which the pass network and
+# pass arrows engines already understand; StatsBomb types are mapped onto them.
+CANONICAL_TYPES = ['Pass', 'Goal', 'SavedShot', 'MissedShots', 'ShotOnPost', 'TakeOn', 'Tackle', 'Interception',
+                   'Clearance', 'BallRecovery', 'BallTouch', 'Aerial', 'Challenge', 'Foul', 'Dispossessed',
+                   'BlockedPass', 'Save', 'Claim', 'KeeperPickup', 'Punch', 'Smother', 'OffsidePass', 'OffsideProvoked',
+                   'CornerAwarded', 'Card', 'Error', 'ShieldBallOpp', 'SubstitutionOff', 'SubstitutionOn',
+                   'Carry', 'BallReceipt', 'Pressure', 'Other']
+
+PERIODS = {1: 'FirstHalf', 2: 'SecondHalf', 3: 'FirstPeriodOfExtraTime', 4: 'SecondPeriodOfExtraTime',
+           5: 'PenaltyShootout'}
+
+# Every coordinate is on WhoScored/Opta's 0-100 x 0-100 pitch, attacking left to right, y from bottom to top.
+# id identifies an event within its match (WhoScored's id, StatsBomb's index); event_index is its ordinal in the match.
+CANONICAL_DTYPES = {
+    'provider': 'category',
+    'match_id': 'int64',
+    'id': 'int64',
+    'event_index': 'int32',
+    'period': 'int8',
+    'minute': 'int16',
+    'second': 'float32',
+    'team_id': 'int64',
+    'player_id': 'int64',
+    'player_name': 'category',
+    'shirt_no': 'Int64',
+    'position': 'category',
+    'is_first_eleven': 'bool',
+    'type': pd.CategoricalDtype(CANONICAL_TYPES),
+    'successful': 'bool',
+    'is_goal': 'bool',
+    'x': 'float32',
+    'y': 'float32',
+    'end_x': 'float32',
+    'end_y': 'float32',
+}
+
+STATSBOMB_PITCH = (120.0, 80.0)
+
+# StatsBomb type (or shot outcome for shots) -> canonical type
+STATSBOMB_TYPES = {
+    'Pass': 'Pass', 'Carry': 'Carry', 'Ball Receipt*': 'BallReceipt', 'Pressure': 'Pressure', 'Dribble': 'TakeOn',
+    'Interception': 'Interception', 'Clearance': 'Clearance', 'Ball Recovery': 'BallRecovery',
+    'Foul Committed': 'Foul', 'Foul Won': 'Foul', 'Miscontrol': 'BallTouch', 'Dispossessed': 'Dispossessed',
+    'Block': 'BlockedPass', 'Goal Keeper': 'Save', 'Substitution': 'SubstitutionOff', 'Bad Behaviour': 'Card',
+    'Error': 'Error', 'Shield': 'ShieldBallOpp', 'Dribbled Past': 'Challenge', 'Offside': 'OffsidePass',
+    '50/50': 'Aerial', 'Duel': 'Tackle',
+}
+STATSBOMB_SHOTS = {'Goal': 'Goal', 'Saved': 'SavedShot', 'Saved To Post': 'SavedShot', 'Blocked': 'SavedShot',
+                   'Saved Off Target': 'MissedShots', 'Off T': 'MissedShots', 'Wayward': 'MissedShots',
+                   'Post': 'ShotOnPost'}
+STATSBOMB_DUELS = {'Aerial Lost': 'Aerial', 'Tackle': 'Tackle'}
+STATSBOMB_SUCCESS = {'dribble_outcome': ['Complete'],
+                     'duel_outcome': ['Won', 'Success', 'Success In Play', 'Success Out']}
+
+def _map_categories(values: pd.Series, mapping: Dict[str, str]) -> np.ndarray:
+    # Map a column through a dict by translating its categories once, then taking the codes
+    categorical = pd.Categorical(values)
+    categories = np.array([CANONICAL_TYPES.index(mapping.get(name, 'Other')) for name in categorical.categories]
+                          + [-1], dtype=np.int16)
+    return categories[categorical.codes]
+
+def _canonical_frame(data: Dict[str, object]) -> pd.DataFrame:
+    df = pd.DataFrame(data)
+    return df[list(CANONICAL_DTYPES)].astype(CANONICAL_DTYPES)
+
+def from_whoscored(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert WhoScored events (scrape.matches.get_data / normalize_events) into the canonical table.
+
+    WhoScored's eventId counts per team, so event_index is numbered per match instead and the
+    unique WhoScored id is kept as id, the key qualifier tables join on.
+
+    Parameters:
+    - df (pd.DataFrame): WhoScored event data of one or several matches.
+
+    Returns:
+    pd.DataFrame: Canonical events, with the columns and dtypes of CANONICAL_DTYPES.
+    """
+    type_codes = _map_categories(df['type_display_name'], {name: name for name in CANONICAL_TYPES})
+    period_codes = pd.Categorical(df['period_display_name'])
+    period_values = {name: value for value, name in PERIODS.items()}
+    period = np.array([period_values.get(name, 0) for name in period_codes.categories] + [0],
+                      dtype=np.int8)[period_codes.codes]
+
+    return _canonical_frame({
+        'provider': 'whoscored',
+        'match_id': df['match_id'],
+        'id': df['id'],
+        'event_index': df.groupby('match_id', sort=False).cumcount().to_numpy() + 1,
+        'period': period,
+        'minute': df['minute'],
+        'second': df['second'].fillna(0),
+        'team_id': df['team_id'],
+        'player_id': df['player_id'],
+        'player_name': df['player_name'],
+        'shirt_no': df['shirt_no'],
+        'position': df['position'],
+        'is_first_eleven': df['is_first_eleven'],
+        'type': pd.Categorical.from_codes(type_codes, dtype=CANONICAL_DTYPES['type']),
+        'successful': (df['outcome_type_display_name'] == 'Successful').to_numpy(),
+        'is_goal': df['is_goal'],
+        'x': df['x'],
+        'y': df['y'],
+        'end_x': df['end_x'],
+        'end_y': df['end_y'],
+    }).reset_index(drop=True)
+
+def from_statsbomb(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert StatsBomb events (SB_loader.load_season_events / load_match_events) into the canonical table.
+
+    Coordinates are rescaled from StatsBomb's 120 x 80 pitch (y from top to bottom) to 0-100,
+    end locations are taken from the pass, carry or shot, and outcomes are mapped per event type.
+    Events without a player are dropped, as in the WhoScored table, and every substitution gets
+    a SubstitutionOn event for the incoming player.
+
+    Parameters:
+    - df (pd.DataFrame): StatsBomb event data of one or several matches.
+
+    Returns:
+    pd.DataFrame: Canonical events, with the columns and dtypes of CANONICAL_DTYPES.
+    """
+    df = df[df['player_id'].notna()]
+    length, width = STATSBOMB_PITCH
+
+    type_codes = _map_categories(df['type'], STATSBOMB_TYPES)
+    is_shot = (df['type'] == 'Shot').to_numpy()
+    type_codes[is_shot] = _map_categories(df['shot_outcome'], STATSBOMB_SHOTS)[is_shot]
+    is_duel = (df['type'] == 'Duel').to_numpy()
+    type_codes[is_duel] = _map_categories(df['duel_type'], STATSBOMB_DUELS)[is_duel]
+
+    successful = np.ones(len(df), dtype=bool)
+    is_pass = (df['type'] == 'Pass').to_numpy()
+    successful[is_pass] = df['pass_outcome'].isna().to_numpy()[is_pass]
+    for column, values in STATSBOMB_SUCCESS.items():
+        has_outcome = df[column].notna().to_numpy()
+        successful[has_outcome] = df[column].isin(values).to_numpy()[has_outcome]
+    is_goal = (df['shot_outcome'] == 'Goal').to_numpy()
+    successful[is_shot] = is_goal[is_shot]
+
+    end_x, end_y = df['pass_end_location_x'], df['pass_end_location_y']
+    for kind in ('carry', 'shot'):
+        end_x = end_x.fillna(df[f'{kind}_end_location_x'])
+        end_y = end_y.fillna(df[f'{kind}_end_location_y'])
+
+    # Players coming on are the substitution replacements of their match
+    replacements = df.loc[df['substitution_replacement_id'].notna(), ['match_id', 'substitution_replacement_id']]
+    replacement_keys = pd.MultiIndex.from_arrays([replacements['match_id'], replacements['substitution_replacement_id'].astype('int64')])
+    keys = pd.MultiIndex.from_arrays([df['match_id'], df['player_id'].astype('int64')])
+
+    canonical = _canonical_frame({
+        'provider': 'statsbomb',
+        'match_id': df['match_id'],
+        'id': df['index'],
+        'event_index': df['index'],
+        'period': df['period'],
+        'minute': df['minute'],
+        'second': df['second'],
+        'team_id': df['team_id'],
+        'player_id': df['player_id'],
+        'player_name': df['player'],
+        'shirt_no': pd.array([pd.NA] * len(df), dtype='Int64'),
+        'position': df['position'],
+        'is_first_eleven': ~keys.isin(replacement_keys),
+        'type': pd.Categorical.from_codes(type_codes, dtype=CANONICAL_DTYPES['type']),
+        'successful': successful,
+        'is_goal': is_goal,
+        'x': df['location_x'] * (100 / length),
+        'y': (width - df['location_y']) * (100 / width),
+        'end_x': end_x * (100 / length),
+        'end_y': (width - end_y) * (100 / width),
+    }).reset_index(drop=True)
+
+    subs = df['substitution_replacement_id'].notna().to_numpy()
+    if subs.any():
+        incoming = canonical[subs].copy()
+        incoming['player_id'] = df.loc[subs, 'substitution_replacement_id'].astype('int64').to_numpy()
+        incoming['player_name'] = df.loc[subs, 'substitution_replacement'].astype(str).to_numpy()
+        incoming['position'] = None
+        incoming['is_first_eleven'] = False
+        incoming['type'] = 'SubstitutionOn'
+        canonical = pd.concat([canonical, incoming]).astype(CANONICAL_DTYPES)
+        canonical = canonical.sort_values(['match_id', 'event_index'], kind='stable').reset_index(drop=True)
+    return canonical
+
+def engine_frame(canonical: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expose a canonical table under the column names used by the WhoScored analytics engines,
+    so get_passes_df_many, batch_pass_networks, classify_passes etc. run on any provider.
+
+    Parameters:
+    - canonical (pd.DataFrame): Result of from_whoscored or from_statsbomb.
+
+    Returns:
+    pd.DataFrame: The canonical columns plus id, event_id, type_display_name,
+    outcome_type_display_name and period_display_name.
+    """
+    outcome = pd.Categorical.from_codes(np.where(canonical['successful'].to_numpy(), 0, 1).astype(np.int8),
+                                        categories=['Successful', 'Unsuccessful'])
+    period_names = np.array([PERIODS.get(period, 'Unknown') for period in range(max(PERIODS) + 1)], dtype=object)
+    return canonical.assign(
+        id=canonical['id'],
+        event_id=canonical['event_index'],
+        type_display_name=canonical['type'],
+        outcome_type_display_name=outcome,
+        period_display_name=pd.Categorical(period_names[canonical['period'].to_numpy()],
+                                           categories=[PERIODS[period] for period in sorted(PERIODS)]),
+    )
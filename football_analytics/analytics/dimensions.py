@@ -0,0 +1,222 @@
+#Imports
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from football_analytics.analytics.normalize import build_match_id, event_facts, normalize_events
+
+#Functions
+
+LABEL_COLUMNS = ['player_name', 'shirt_no', 'position', 'is_first_eleven']
+LINEUP_COLUMNS = ['match_id', 'team_id', 'player_id', 'shirt_no', 'position', 'is_first_eleven']
+PLAYER_COLUMNS = ['player_id', 'player_name']
+TEAM_COLUMNS = ['team_id', 'team_name', 'country_name']
+
+def lineup_table(match_data: Dict[str, Any], match_id: int) -> pd.DataFrame:
+    """
+    Build the lineup of both teams of a match from the home and away player lists.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - match_id (int): match_id of the events table.
+
+    Returns:
+    pd.DataFrame: One row per player with the columns of LINEUP_COLUMNS.
+    """
+    team_ids, player_ids, shirt_nos, positions, first_eleven = [], [], [], [], []
+    for side in ('home', 'away'):
+        for index, player in enumerate(match_data[side]['players']):
+            team_ids.append(match_data[side]['teamId'])
+            player_ids.append(player['playerId'])
+            shirt_nos.append(player.get('shirtNo'))
+            positions.append(player.get('position'))
+            first_eleven.append(bool(player.get('isFirstEleven', False)) if index < 11 else False)
+
+    df = pd.DataFrame({
+        'match_id': np.full(len(player_ids), match_id, dtype=np.int64),
+        'team_id': np.array(team_ids, dtype=np.int64),
+        'player_id': np.array(player_ids, dtype=np.int64),
+        'shirt_no': pd.array(shirt_nos, dtype='Int16'),
+        'position': pd.Categorical(positions),
+        'is_first_eleven': np.array(first_eleven, dtype=bool),
+    }, columns=LINEUP_COLUMNS)
+    return df.drop_duplicates(['match_id', 'player_id'])
+
+def player_table(match_data: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Build the player dimension of a match from playerIdNameDictionary and the player lists.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+
+    Returns:
+    pd.DataFrame: One row per player with player_id and player_name.
+    """
+    names = {int(player_id): name for player_id, name in match_data.get('playerIdNameDictionary', {}).items()}
+    for side in ('home', 'away'):
+        for player in match_data[side]['players']:
+            names.setdefault(int(player['playerId']), player.get('name'))
+    return pd.DataFrame({'player_id': np.fromiter(names, dtype=np.int64, count=len(names)),
+                         'player_name': list(names.values())}, columns=PLAYER_COLUMNS)
+
+def team_table(match_data: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Build the team dimension of a match.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+
+    Returns:
+    pd.DataFrame: One row per team with team_id, team_name and country_name.
+    """
+    sides = [match_data[side] for side in ('home', 'away')]
+    return pd.DataFrame({'team_id': np.array([side['teamId'] for side in sides], dtype=np.int64),
+                         'team_name': [side['name'] for side in sides],
+                         'country_name': [side.get('countryName') for side in sides]}, columns=TEAM_COLUMNS)
+
+def normalize_match(match_data: Dict[str, Any], key: str = 'events',
+                    keep_qualifiers: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Split a match into an integer-keyed events fact table and its lineup, player and team tables.
+
+    Labels are joined back only when needed, with attach_labels.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - key (str): The key holding the events list. Defaults to 'events'.
+    - keep_qualifiers (bool, optional): Keep the raw list-of-dict qualifiers column. Defaults to True.
+
+    Returns:
+    Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]: events, lineups, players and teams.
+    """
+    events = event_facts(match_data, key, keep_qualifiers)
+    if len(events):
+        match_id = int(events['match_id'].iloc[0])
+    else:
+        match_id = build_match_id(match_data, np.array([match_data['home']['teamId'], match_data['away']['teamId']]))
+    return events, lineup_table(match_data, match_id), player_table(match_data), team_table(match_data)
+
+def merge_dimension(tables: List[pd.DataFrame], key: str) -> pd.DataFrame:
+    """
+    Combine the dimension tables of several matches into one global table, keeping the latest row per key.
+
+    Parameters:
+    - tables (List[pd.DataFrame]): Player or team tables, oldest first.
+    - key (str): 'player_id' or 'team_id'.
+
+    Returns:
+    pd.DataFrame: One row per key.
+    """
+    df = pd.concat(tables, ignore_index=True)
+    return df.drop_duplicates(key, keep='last').sort_values(key).reset_index(drop=True)
+
+def attach_labels(df: pd.DataFrame, lineups: pd.DataFrame, players: pd.DataFrame,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Join player names and lineup information onto events, by position lookup on the integer keys.
+
+    The result has the columns and dtypes of normalize_events, so it can be passed to the plotting
+    and pass network functions.
+
+    Parameters:
+    - df (pd.DataFrame): Events fact table of one or several matches.
+    - lineups (pd.DataFrame): Lineups of the same matches (lineup_table).
+    - players (pd.DataFrame): Player dimension covering the players of the events (player_table / merge_dimension).
+    - columns (List[str], optional): Labels to attach. Defaults to LABEL_COLUMNS.
+
+    Returns:
+    pd.DataFrame: A copy of df with the label columns.
+    """
+    columns = columns or LABEL_COLUMNS
+    player_ids = df['player_id'].to_numpy()
+    labels = {}
+
+    if 'player_name' in columns:
+        positions = pd.Index(players['player_id']).get_indexer(player_ids)
+        names = players['player_name'].to_numpy(dtype=object)
+        labels['player_name'] = np.where(positions == -1, None, names[positions])
+
+    lineup_columns = [column for column in columns if column != 'player_name']
+    if lineup_columns:
+        match_ids = lineups['match_id'].to_numpy()
+        event_match_ids = df['match_id'].to_numpy()
+        if len(match_ids) and (match_ids == match_ids[0]).all() and (event_match_ids == match_ids[0]).all():
+            # A single match (e.g. normalize_events): the player id alone is the key
+            positions = pd.Index(lineups['player_id']).get_indexer(player_ids)
+        else:
+            keys = pd.MultiIndex.from_arrays([lineups['match_id'], lineups['player_id']])
+            positions = keys.get_indexer(pd.MultiIndex.from_arrays([event_match_ids, player_ids]))
+        missing = positions == -1
+        if 'shirt_no' in lineup_columns:
+            shirt_no = pd.array(lineups['shirt_no'].to_numpy(dtype='float64', na_value=np.nan)[positions], dtype='Int64')
+            shirt_no[missing] = pd.NA
+            labels['shirt_no'] = shirt_no
+        if 'position' in lineup_columns:
+            position = lineups['position'].to_numpy(dtype=object)[positions]
+            position[missing] = None
+            labels['position'] = pd.Categorical(position)
+        if 'is_first_eleven' in lineup_columns:
+            is_first_eleven = lineups['is_first_eleven'].to_numpy()[positions]
+            is_first_eleven[missing] = False
+            labels['is_first_eleven'] = is_first_eleven
+
+    return df.assign(**{column: labels[column] for column in columns})
+
+def ensure_labels(df: pd.DataFrame, match_data: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Attach the labels of a single match from its matchCentreData when the events do not carry them yet.
+
+    Parameters:
+    - df (pd.DataFrame): Events of one match, either from normalize_events or from normalize_match.
+    - match_data (dict): The matchCentreData dictionary.
+
+    Returns:
+    pd.DataFrame: df itself when it already has every label column, otherwise a labelled copy.
+    """
+    if all(column in df.columns for column in LABEL_COLUMNS) or not len(df):
+        return df
+    match_id = int(df['match_id'].iloc[0])
+    return attach_labels(df, lineup_table(match_data, match_id), player_table(match_data))
+
+def benchmark_dimensions(matches: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Compare the memory of a season of labelled events with the fact table plus dimension tables.
+
+    Qualifiers are left out of both models, so only the label columns differ.
+
+    Parameters:
+    - matches (List[dict]): matchCentreData of every match of the season.
+
+    Returns:
+    Dict[str, float]: Bytes of the labelled events, of the fact table and of each dimension table,
+    the memory ratio and the seconds taken to attach the labels of the whole season.
+    """
+    wide = pd.concat([normalize_events(match_data, keep_qualifiers=False) for match_data in matches], ignore_index=True)
+    tables = [normalize_match(match_data, keep_qualifiers=False) for match_data in matches]
+    events = pd.concat([table[0] for table in tables], ignore_index=True)
+    lineups = pd.concat([table[1] for table in tables], ignore_index=True)
+    players = merge_dimension([table[2] for table in tables], 'player_id')
+    teams = merge_dimension([table[3] for table in tables], 'team_id')
+
+    def size(frame):
+        return float(frame.memory_usage(index=False, deep=True).sum())
+
+    start = time.perf_counter()
+    attach_labels(events, lineups, players)
+    attach_time = time.perf_counter() - start
+
+    results = {
+        'events': float(len(events)),
+        'wide_bytes': size(wide),
+        'fact_bytes': size(events),
+        'lineup_bytes': size(lineups),
+        'player_bytes': size(players),
+        'team_bytes': size(teams),
+        'attach_s': attach_time,
+    }
+    normalized = results['fact_bytes'] + results['lineup_bytes'] + results['player_bytes'] + results['team_bytes']
+    results['normalized_bytes'] = normalized
+    results['memory_ratio'] = results['wide_bytes'] / normalized
+    return results
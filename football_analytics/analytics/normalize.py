@@ -0,0 +1,219 @@
+#Imports
+import re
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from football_analytics.analytics.qualifiers import qualifier_bits
+
+#Functions
+
+EVENT_COLUMNS = ['id', 'event_id', 'minute', 'second', 'team_id', 'player_id', 'x', 'y', 'end_x', 'end_y',
+                 'qualifiers', 'qualifier_bits', 'is_touch', 'blocked_x', 'blocked_y', 'goal_mouth_z', 'goal_mouth_y', 'is_shot',
+                 'card_type', 'is_goal', 'type_display_name', 'outcome_type_display_name', 'period_display_name']
+
+# snake_case column -> Whoscored key
+INT_COLUMNS = {'id': 'id', 'event_id': 'eventId', 'minute': 'minute', 'team_id': 'teamId', 'player_id': 'playerId'}
+FLOAT_COLUMNS = {'second': 'second', 'x': 'x', 'y': 'y', 'end_x': 'endX', 'end_y': 'endY',
+                 'blocked_x': 'blockedX', 'blocked_y': 'blockedY', 'goal_mouth_z': 'goalMouthZ', 'goal_mouth_y': 'goalMouthY'}
+BOOL_COLUMNS = {'is_touch': 'isTouch', 'is_shot': 'isShot', 'card_type': 'cardType', 'is_goal': 'isGoal'}
+DISPLAY_NAME_COLUMNS = {'type_display_name': 'type', 'outcome_type_display_name': 'outcomeType', 'period_display_name': 'period'}
+
+def build_match_id(match_data: Dict[str, Any], team_ids: np.ndarray) -> int:
+    """
+    Build the match_id used in the events table from the kick-off timestamp and team ids.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - team_ids (np.ndarray): team_id of every event, in event order.
+
+    Returns:
+    int: The match id.
+    """
+    timestamp = re.split('[-: ]', match_data['timeStamp'])
+    teams = [str(i) for i in pd.unique(team_ids)]
+    return int(''.join(timestamp + teams))
+
+def event_facts(match_data: Dict[str, Any], key: str = 'events', keep_qualifiers: bool = True) -> pd.DataFrame:
+    """
+    Build the integer-keyed events fact table, without any player or lineup labels.
+
+    Every column is built with a single comprehension over the raw dicts, so no intermediate
+    object DataFrame is created. Float columns keep NaN for missing values and the display-name
+    columns are categoricals. The common qualifiers are indexed in the int64 qualifier_bits
+    column (see analytics.qualifiers.has_qualifier).
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - key (str): The key holding the events list. Defaults to 'events'.
+    - keep_qualifiers (bool, optional): Keep the raw list-of-dict qualifiers column. Defaults to True, which
+      insert_match_events needs; pass False and use analytics.qualifiers.qualifier_table for the other qualifiers.
+
+    Returns:
+    pd.DataFrame: The events, keyed by match_id, team_id and player_id.
+    """
+    events = [event for event in match_data[key] if event.get('playerId') is not None]
+    nan = float('nan')
+    columns = {}
+
+    for column, source in INT_COLUMNS.items():
+        columns[column] = np.fromiter((event[source] for event in events), dtype=np.int64, count=len(events))
+    for column, source in FLOAT_COLUMNS.items():
+        values = (event.get(source) for event in events)
+        columns[column] = np.fromiter((nan if value is None else value for value in values), dtype=np.float64, count=len(events))
+    for column, source in BOOL_COLUMNS.items():
+        columns[column] = np.fromiter((bool(event.get(source)) for event in events), dtype=bool, count=len(events))
+    for column, source in DISPLAY_NAME_COLUMNS.items():
+        columns[column] = pd.Categorical([event[source]['displayName'] for event in events])
+    if keep_qualifiers:
+        columns['qualifiers'] = [event.get('qualifiers', []) for event in events]
+    columns['qualifier_bits'] = qualifier_bits(events)
+
+    df = pd.DataFrame(columns, columns=[column for column in EVENT_COLUMNS if column in columns])
+    df['match_id'] = build_match_id(match_data, columns['team_id'])
+    return df
+
+def normalize_events(match_data: Dict[str, Any], key: str = 'events', keep_qualifiers: bool = True) -> pd.DataFrame:
+    """
+    Build the typed events DataFrame straight from the raw matchCentreData events list.
+
+    This is event_facts with player_name, shirt_no (nullable Int64), position and is_first_eleven
+    repeated on every row. Use analytics.dimensions.normalize_match to keep them in separate tables.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - key (str): The key holding the events list. Defaults to 'events'.
+    - keep_qualifiers (bool, optional): Keep the raw list-of-dict qualifiers column. Defaults to True.
+
+    Returns:
+    pd.DataFrame: The events with player name and lineup information attached.
+    """
+    # The labels come from the same lineup and player tables as normalize_match
+    from football_analytics.analytics.dimensions import attach_labels, lineup_table, player_table
+
+    df = event_facts(match_data, key, keep_qualifiers)
+    match_id = int(df['match_id'].iloc[0]) if len(df) else 0
+    return attach_labels(df, lineup_table(match_data, match_id), player_table(match_data),
+                         ['player_name', 'shirt_no', 'is_first_eleven', 'position'])
+
+def normalize_events_legacy(match_data: Dict[str, Any], key: str = 'events') -> pd.DataFrame:
+    """
+    Original row-wise normalization from get_data, kept as the benchmark baseline.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - key (str): The key holding the events list. Defaults to 'events'.
+
+    Returns:
+    pd.DataFrame: The events with player name and lineup information attached.
+    """
+    from football_analytics.scrape.matches import convert_to_snake_case
+
+    df = pd.DataFrame(match_data[key])
+    df = df.dropna(subset='playerId')
+    df = df.where(pd.notnull(df), None)
+    
+    # Convert column names to snake_case
+    df.columns = [convert_to_snake_case(col) for col in df.columns]
+    
+    # Extract additional information from nested dictionaries
+    df['period_display_name'] = df['period'].apply(lambda x: x['displayName'])
+    df['type_display_name'] = df['type'].apply(lambda x: x['displayName'])
+    df['outcome_type_display_name'] = df['outcome_type'].apply(lambda x: x['displayName'])
+    df.drop(columns=["period", "type", "outcome_type"], inplace=True)
+    
+    # Reorder columns
+    column_order = ['id', 'event_id', 'minute', 'second', 'team_id', 'player_id', 'x', 'y', 'end_x', 'end_y',
+                    'qualifiers', 'is_touch', 'blocked_x', 'blocked_y', 'goal_mouth_z', 'goal_mouth_y', 'is_shot',
+                    'card_type', 'is_goal', 'type_display_name', 'outcome_type_display_name', 'period_display_name']
+    df = df[column_order]
+    
+    # Convert data types
+    int_columns = ['id', 'event_id', 'minute', 'team_id', 'player_id']
+    float_columns = ['second', 'x', 'y', 'end_x', 'end_y']
+    bool_columns = ['is_shot', 'is_goal', 'card_type']
+    
+    df[int_columns] = df[int_columns].astype(np.int64)
+    df[float_columns] = df[float_columns].astype(float)
+    df[bool_columns] = df[bool_columns].fillna(False).astype(bool)
+    
+    # Replace NaN values in float columns with None
+    for column in df.columns:
+        if df[column].dtype == np.float64 or df[column].dtype == np.float32:
+            df[column] = np.where(
+                np.isnan(df[column]),
+                None,
+                df[column]
+            )
+    #Create match_id column
+    timestamp = re.split('[-: ]', match_data['timeStamp'])
+    teams = [str(i) for i in df.team_id.unique()]
+    match_id = int(''.join(timestamp + teams))
+    df['match_id'] = match_id
+    #Create player_name column
+    df_names = pd.DataFrame(list(match_data['playerIdNameDictionary'].items()), columns=['player_id', 'player_name'])
+    df_names['player_id']=df_names['player_id'].astype(np.int64)
+    df = df.merge(df_names, on='player_id', how ='left')
+
+    #Create is_first_eleven & shirt_no columns
+    def process_team(team_data, is_starter):
+        player_data_list = []
+        for index in range(len(team_data)):
+            data_dict = team_data[index]
+            player_info = {
+                'player_id': data_dict['playerId'],
+                'shirt_no': data_dict['shirtNo'],
+                'name': data_dict['name'],
+                'position': data_dict['position'],
+                'is_first_eleven': data_dict['isFirstEleven'] if is_starter else False
+            }
+            player_data_list.append(player_info)
+        return player_data_list
+    # Home Team
+    home_starters = process_team(list(match_data['home'].items())[7][1][:11], True)
+    home_subs = process_team(list(match_data['home'].items())[7][1][11:], False)
+    
+    # Away Team
+    away_starters = process_team(list(match_data['away'].items())[7][1][:11], True)
+    away_subs = process_team(list(match_data['away'].items())[7][1][11:], False)
+    
+    # Combine all lists and create the df
+    player_data_list = home_starters + home_subs + away_starters + away_subs
+    df_all_players = pd.DataFrame(player_data_list)
+    
+    #Merge with original df
+    df = df.merge(df_all_players[['player_id','shirt_no','is_first_eleven', 'position']], on='player_id', how ='left')
+
+    return df
+
+def benchmark_normalization(match_data: Dict[str, Any], repeat: int = 3) -> Dict[str, float]:
+    """
+    Compare normalize_events with the original get_data normalization on one match.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - repeat (int): Number of runs per method; the best run is kept. Defaults to 3.
+
+    Returns:
+    Dict[str, float]: Milliseconds and result memory (bytes) per 1,000 events for each method, plus ratios.
+    """
+    n_events = sum(event.get('playerId') is not None for event in match_data['events']) / 1000
+    results = {}
+    for name, normalize in (('legacy', normalize_events_legacy), ('vectorized', normalize_events)):
+        times = []
+        for _ in range(repeat):
+            tracemalloc.start()
+            start = time.perf_counter()
+            df = normalize(match_data)
+            times.append(time.perf_counter() - start)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        results[f'{name}_ms_per_1k'] = min(times) * 1000 / n_events
+        results[f'{name}_peak_bytes_per_1k'] = peak / n_events
+        results[f'{name}_bytes_per_1k'] = float(df.drop(columns=['qualifiers', 'qualifier_bits'], errors='ignore').memory_usage(deep=True).sum()) / n_events
+    results['speedup'] = results['legacy_ms_per_1k'] / results['vectorized_ms_per_1k']
+    results['memory_ratio'] = results['legacy_bytes_per_1k'] / results['vectorized_bytes_per_1k']
+    return results
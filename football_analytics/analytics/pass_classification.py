@@ -0,0 +1,163 @@
+#Imports
+import time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from football_analytics.analytics.possession import possession_chains
+
+#Functions
+
+ARROW_COLUMNS = ["team_id", "player_id", "player_name", "period_display_name", "minute", "second", "x", "y", "end_x", "end_y",
+                 "outcome_type_display_name"]
+
+SHOT_EVENTS = ["MissedShots", "SavedShot", "ShotOnPost"]
+
+PASS_COLORS = {
+    "Successful": "#0793BC",
+    "Unsuccessful": "#848585",
+    "ProgressivePass": "#0CD127",
+    "keyPass": "#DBE110",
+    "Assist": "#F52825",
+}
+
+def next_event_type(df: pd.DataFrame) -> pd.Series:
+    """
+    Type of the event that follows each event, without crossing match or period boundaries.
+
+    Parameters:
+    df (DataFrame): Event data of one or several matches, in event order within each match.
+
+    Returns:
+    Series: type_display_name of the next event (NaN for the last event of a period).
+    """
+    codes, names = pd.factorize(df["type_display_name"])
+    following = np.full(len(codes), -1, dtype=np.int64)
+    following[:-1] = codes[1:]
+
+    # Break the sequence wherever the match or the period changes
+    for column in ("match_id", "period_display_name"):
+        if column in df.columns:
+            values = df[column].to_numpy()
+            following[:-1][values[1:] != values[:-1]] = -1
+
+    return pd.Series(pd.Categorical.from_codes(following, categories=np.asarray(names)), index=df.index)
+
+def classify_passes(df: pd.DataFrame, use_chains: bool = True) -> pd.DataFrame:
+    """
+    Extracts pass information DataFrame with array operations and without modifying `df`.
+
+    Key passes and assists look at the next action of the passer's own team within the same
+    possession chain, so opponent events in between (a failed challenge, a block) are skipped
+    and a shot after the opponent won the ball does not count.
+
+    Parameters:
+    df (DataFrame): DataFrame containing event data of one or several matches.
+    use_chains (bool, optional): Use the possession chains of analytics.possession. If False, the next event
+        of the frame is used instead, as in the original implementation. Defaults to True.
+
+    Returns:
+    DataFrame: DataFrame containing pass arrows event data, with categorical pass_type and color.
+    """
+    if use_chains:
+        chains = possession_chains(df)
+        next_event = chains["next_action_type"].where(chains["next_in_chain"])
+    else:
+        next_event = next_event_type(df)
+    is_pass = (df["type_display_name"] == "Pass").to_numpy()
+
+    df_passes = df.loc[is_pass, ARROW_COLUMNS].copy()
+    df_passes["next_event"] = next_event[is_pass]
+
+    x = df_passes["x"].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = df_passes["y"].to_numpy(dtype=np.float64, na_value=np.nan)
+    end_x = df_passes["end_x"].to_numpy(dtype=np.float64, na_value=np.nan)
+    end_y = df_passes["end_y"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # Progressive: the pass ends at least 25% closer to the centre of the opponent's goal
+    beginning = np.sqrt(np.square(100 - x) + np.square(50 - y))
+    end = np.sqrt(np.square(100 - end_x) + np.square(50 - end_y))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        progressive = (end / beginning < 0.75) & ~(x > end_x)
+
+    next_type = df_passes["next_event"]
+    unsuccessful = (df_passes["outcome_type_display_name"] == "Unsuccessful").to_numpy()
+    assist = (next_type == "Goal").to_numpy()
+    key_pass = next_type.isin(SHOT_EVENTS).to_numpy()
+
+    pass_type = np.select(
+        [unsuccessful, assist, key_pass, progressive],
+        ["Unsuccessful", "Assist", "keyPass", "ProgressivePass"],
+        default="Successful",
+    )
+
+    df_passes["progressive"] = progressive
+    df_passes["beginning"] = beginning
+    df_passes["end"] = end
+    df_passes["pass_type"] = pd.Categorical(pass_type, categories=list(PASS_COLORS))
+    df_passes["color"] = pd.Categorical.from_codes(df_passes["pass_type"].cat.codes,
+                                                   categories=list(PASS_COLORS.values()))
+    return df_passes
+
+def get_pass_arrows_df_legacy(df) -> pd.DataFrame:
+    """
+    Original row-wise implementation of get_pass_arrows_df, kept as the benchmark baseline.
+    Note that it adds a next_event column to `df`.
+
+    Parameters:
+    df (DataFrame): DataFrame containing event data.
+
+    Returns:
+    DataFrame: DataFrame containing pass arrows event data.
+    """
+
+    df["next_event"]=df["type_display_name"].shift(-1)
+
+    df_passes = df[df.type_display_name == "Pass"][["team_id","player_name","period_display_name","minute", "second", "x", "y", "end_x", "end_y", "outcome_type_display_name", "next_event"]]
+    df_passes["progressive"] = True
+    df_passes.reset_index(drop=True)
+
+    df_passes["beginning"] = np.sqrt(np.square(100-df_passes["x"]) + np.square(50 - df_passes["y"]))
+    df_passes["end"] = np.sqrt(np.square(100-df_passes["end_x"]) + np.square(50 - df_passes["end_y"]))
+    df_passes["progressive"] = df_passes.apply(lambda row: row["end"] / row["beginning"] < 0.75, axis=1)
+
+    df_passes.loc[df_passes['outcome_type_display_name'] != "Unsuccessful", "pass_type"] = "Successful"
+    df_passes.loc[df_passes["x"]>df_passes["end_x"],"progressive"] = False
+    df_passes.loc[df_passes["progressive"]==True,"pass_type"] = "ProgressivePass"
+    df_passes.loc[(df_passes["next_event"]=="MissedShots")|(df_passes["next_event"]=="SavedShot")|(df_passes["next_event"]=="ShotOnPost"),"pass_type"] = "keyPass"
+    df_passes.loc[df_passes["next_event"]=="Goal","pass_type"] = "Assist"
+    df_passes.loc[df_passes['outcome_type_display_name'] == "Unsuccessful", "pass_type"] = "Unsuccessful"
+
+    df_passes.loc[df_passes['pass_type'] == "Unsuccessful", 'color'] = "#848585"
+    df_passes.loc[df_passes['pass_type'] == "Successful", 'color'] = "#0793BC"
+    df_passes.loc[df_passes['pass_type'] == "ProgressivePass", 'color'] = "#0CD127"
+    df_passes.loc[df_passes['pass_type'] == "keyPass", 'color'] = "#DBE110"
+    df_passes.loc[df_passes['pass_type'] == "Assist", 'color'] = "#F52825"
+
+    return df_passes
+
+def benchmark_pass_arrows(df: pd.DataFrame, repeat: int = 3) -> Dict[str, float]:
+    """
+    Compare classify_passes with the original row-wise implementation.
+
+    Parameters:
+    - df (pd.DataFrame): Event data, e.g. a whole season read from the event store.
+    - repeat (int): Number of runs per implementation; the best run is kept. Defaults to 3.
+
+    Returns:
+    Dict[str, float]: Seconds for each implementation, number of passes and the speedup.
+    """
+    def best_time(classify):
+        times = []
+        for _ in range(repeat):
+            df_copy = df.copy()
+            start = time.perf_counter()
+            df_passes = classify(df_copy)
+            times.append(time.perf_counter() - start)
+        return min(times), len(df_passes)
+
+    legacy_time, n_passes = best_time(get_pass_arrows_df_legacy)
+    vectorized_time, _ = best_time(classify_passes)
+    return {'legacy_s': legacy_time, 'vectorized_s': vectorized_time, 'passes': n_passes,
+            'speedup': legacy_time / vectorized_time}
@@ -0,0 +1,380 @@
+#Imports
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from football_analytics.analytics.possession import possession_chains
+
+#Functions
+
+PLAYER_INFO_COLUMNS = ['player_name', 'shirt_no', 'position', 'is_first_eleven', 'subbed_in', 'subbed_out']
+LINE_INFO_COLUMNS = ['x', 'y', 'player_name', 'shirt_no', 'position']
+
+def pass_network_arrays(passer: np.ndarray, receiver: np.ndarray, x: np.ndarray, y: np.ndarray,
+                        successful: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Accumulate the pass network of one team with array operations.
+
+    Player ids are factorized to dense indices, then per-player counts and location sums and the
+    passer -> receiver count matrix are built with np.bincount in a single pass over the passes.
+
+    Parameters:
+    - passer (np.ndarray): player_id of the passer of every pass.
+    - receiver (np.ndarray): player_id of the receiver of every pass (NaN when unknown).
+    - x (np.ndarray): Start x of every pass.
+    - y (np.ndarray): Start y of every pass.
+    - successful (np.ndarray): Boolean, True for completed passes.
+
+    Returns:
+    Dict[str, np.ndarray]: players (sorted ids), first (index of each player's first pass), attempted,
+    completed, x, y (mean locations) and matrix (pass counts, passer rows and receiver columns).
+    """
+    players, first, passer_idx = np.unique(passer, return_index=True, return_inverse=True)
+    n = players.size
+
+    valid_x = ~np.isnan(x)
+    valid_y = ~np.isnan(y)
+    count_x = np.bincount(passer_idx, weights=valid_x, minlength=n)
+    count_y = np.bincount(passer_idx, weights=valid_y, minlength=n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(passer_idx, weights=np.where(valid_x, x, 0), minlength=n) / count_x
+        mean_y = np.bincount(passer_idx, weights=np.where(valid_y, y, 0), minlength=n) / count_y
+    completed = np.bincount(passer_idx, weights=successful, minlength=n).astype(np.int64)
+
+    # Receivers that never passed cannot be part of the network
+    receiver = np.asarray(receiver, dtype=np.float64)
+    known = ~np.isnan(receiver)
+    receiver_idx = np.searchsorted(players, receiver[known]).clip(max=max(n - 1, 0))
+    in_team = players[receiver_idx] == receiver[known] if n else np.zeros(0, dtype=bool)
+    pairs = passer_idx[known][in_team] * n + receiver_idx[in_team]
+    matrix = np.bincount(pairs, minlength=n * n).reshape(n, n)
+
+    return {
+        'players': players,
+        'first': first,
+        'attempted': count_y.astype(np.int64),
+        'completed': completed,
+        'x': mean_x,
+        'y': mean_y,
+        'matrix': matrix,
+    }
+
+def build_pass_network(df_passes: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calculates passes counts, completion rates, average locations and pass amount between players.
+
+    Produces the same frames as the groupby/merge implementation, but with one row per player
+    in the average locations frame.
+
+    Parameters:
+    df_passes (DataFrame): DataFrame containing passes event data, as returned by get_passes_df.
+
+    Returns:
+    Tuple[DataFrame, DataFrame]: Tuple containing two DataFrames:
+        1. DataFrame containing passes between players with their completion rates.
+        2. DataFrame containing average locations and pass counts per player.
+    """
+    network = pass_network_arrays(
+        df_passes['player_id'].to_numpy(),
+        df_passes['receiver'].to_numpy(dtype=np.float64, na_value=np.nan),
+        df_passes['x'].to_numpy(dtype=np.float64, na_value=np.nan),
+        df_passes['y'].to_numpy(dtype=np.float64, na_value=np.nan),
+        (df_passes['outcome_type_display_name'] == 'Successful').to_numpy(),
+    )
+    info = df_passes[PLAYER_INFO_COLUMNS].iloc[network['first']].reset_index(drop=True)
+    return network_frames(network, info, df_passes['receiver'].dtype)
+
+def network_frames(network: Dict[str, np.ndarray], info: pd.DataFrame,
+                   receiver_dtype=np.float64) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Turn pass network arrays into the passes between players and average locations frames.
+
+    Parameters:
+    network (Dict[str, np.ndarray]): players, attempted, completed, x, y and matrix, as returned by pass_network_arrays.
+    info (DataFrame): PLAYER_INFO_COLUMNS of every player, in the order of network['players'].
+    receiver_dtype (optional): dtype of the receiver column. Defaults to float64.
+
+    Returns:
+    Tuple[DataFrame, DataFrame]: passes_between_df and average_locs_and_count_df, as in build_pass_network.
+    """
+    completed = network['completed']
+
+    # Players need at least one completed pass and more than 10% of the max. completed passes
+    keep = completed > 0
+    if keep.any():
+        keep &= completed > np.round(completed[keep].max() * 0.1, 0)
+
+    average_locs_and_count_df = pd.DataFrame({
+        'x': network['x'],
+        'y': network['y'],
+        'passes_attempted': network['attempted'],
+        'passes_completed': completed,
+        'percentage_completed': np.round(completed / network['attempted'] * 100, 2),
+    })
+    average_locs_and_count_df = pd.concat([average_locs_and_count_df, info], axis=1)
+    average_locs_and_count_df.index = pd.Index(network['players'], name='player_id')
+    average_locs_and_count_df = average_locs_and_count_df[keep]
+
+    # Pass combinations between the players kept, in (player_id, receiver) order
+    matrix = network['matrix'] * np.outer(keep, keep)
+    passer_idx, receiver_idx = np.nonzero(matrix)
+    pass_count = matrix[passer_idx, receiver_idx]
+    start = average_locs_and_count_df.loc[network['players'][passer_idx], LINE_INFO_COLUMNS].reset_index(drop=True)
+    end = average_locs_and_count_df.loc[network['players'][receiver_idx], LINE_INFO_COLUMNS].reset_index(drop=True)
+    passes_between_df = pd.concat([
+        pd.DataFrame({
+            'player_id': network['players'][passer_idx],
+            'receiver': network['players'][receiver_idx].astype(receiver_dtype),
+            'pass_count': pass_count,
+        }),
+        start,
+        end.add_suffix('_end'),
+    ], axis=1)
+    #We only take that passes combinations that are higher than 10% of max. combination
+    if len(passes_between_df):
+        passes_between_df = passes_between_df[passes_between_df.pass_count > np.round(pass_count.max() * 0.1, 0)]
+
+    return passes_between_df, average_locs_and_count_df
+
+BATCH_PASS_COLUMNS = ['id', 'match_id', 'team_id', 'player_id', 'minute', 'second', 'x', 'y', 'end_x', 'end_y',
+                      'player_name', 'shirt_no', 'position', 'is_first_eleven', 'type_display_name',
+                      'outcome_type_display_name']
+
+def get_passes_df_many(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Extracts passes of every team of every match from a concatenated multi-match event frame.
+
+    Receivers and substitution flags are computed the same way as in get_passes_df, but for
+    all (match_id, team_id) groups at once. The receiver of a completed pass is the player of the
+    next action of the same possession chain (analytics.possession.possession_chains); it is NaN for
+    incomplete passes.
+
+    Parameters:
+    df (DataFrame): Event data of one or several matches, in event order within each match.
+
+    Returns:
+    DataFrame: Passes with receiver, subbed_in and subbed_out columns.
+    """
+    receiver = possession_chains(df)['receiver']
+
+    is_pass = (df['type_display_name'] == 'Pass').to_numpy()
+    df_passes = df.loc[is_pass, BATCH_PASS_COLUMNS].copy()
+    df_passes['receiver'] = receiver[is_pass]
+
+    keys = pd.MultiIndex.from_arrays([df_passes['match_id'], df_passes['player_id']])
+    for column, event_type in (('subbed_in', 'SubstitutionOn'), ('subbed_out', 'SubstitutionOff')):
+        subs = df.loc[df['type_display_name'] == event_type, ['match_id', 'player_id']]
+        df_passes[column] = keys.isin(pd.MultiIndex.from_frame(subs))
+    return df_passes
+
+def assign_windows(df_passes: pd.DataFrame, df: pd.DataFrame, split=None) -> np.ndarray:
+    """
+    Label every pass with the minutes window it belongs to.
+
+    Parameters:
+    df_passes (DataFrame): Passes from get_passes_df_many.
+    df (DataFrame): The event data the passes come from.
+    split (optional): None for one 'full' window per match, 'first_sub' to split each team's passes
+        before/after its first substitution, or a list of minute boundaries, e.g. [45, 60].
+
+    Returns:
+    np.ndarray: Window label of every pass.
+    """
+    minutes = (df_passes['minute'] + df_passes['second'].fillna(0) / 60).to_numpy()
+    if split is None:
+        return np.full(len(df_passes), 'full', dtype=object)
+
+    if split == 'first_sub':
+        subs = df[df['type_display_name'] == 'SubstitutionOff']
+        first_sub = (subs['minute'] + subs['second'].fillna(0) / 60).groupby(
+            [subs['match_id'], subs['team_id']]).min()
+        keys = pd.MultiIndex.from_arrays([df_passes['match_id'], df_passes['team_id']])
+        sub_minute = first_sub.reindex(keys).to_numpy(dtype=np.float64, na_value=np.inf)
+        return np.where(minutes < sub_minute, 'before_first_sub', 'after_first_sub').astype(object)
+
+    edges = np.asarray(sorted(split), dtype=np.float64)
+    labels = np.array([f"{lo:g}-{hi:g}" if np.isfinite(hi) else f"{lo:g}+"
+                       for lo, hi in zip(np.r_[0, edges], np.r_[edges, np.inf])], dtype=object)
+    return labels[np.searchsorted(edges, minutes, side='right')]
+
+def _batch_pass_networks(df: pd.DataFrame, split=None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    df_passes = get_passes_df_many(df)
+    df_passes['window'] = assign_windows(df_passes, df, split)
+
+    group_codes, groups = pd.MultiIndex.from_frame(df_passes[['match_id', 'team_id', 'window']]).factorize()
+    group_codes = group_codes.astype(np.int64)
+
+    # One dense index per (group, player): group code in the high bits, player_id in the low bits
+    player_ids = df_passes['player_id'].to_numpy(dtype=np.int64)
+    keys, first, passer_idx = np.unique((group_codes << 32) | player_ids, return_index=True, return_inverse=True)
+    n_players = keys.size
+    player_group = keys >> 32
+
+    x = df_passes['x'].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = df_passes['y'].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid_x, valid_y = ~np.isnan(x), ~np.isnan(y)
+    attempted = np.bincount(passer_idx, weights=valid_y, minlength=n_players).astype(np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = (np.bincount(passer_idx, weights=np.where(valid_x, x, 0), minlength=n_players)
+                  / np.bincount(passer_idx, weights=valid_x, minlength=n_players))
+        mean_y = np.bincount(passer_idx, weights=np.where(valid_y, y, 0), minlength=n_players) / attempted
+    successful = (df_passes['outcome_type_display_name'] == 'Successful').to_numpy()
+    completed = np.bincount(passer_idx, weights=successful, minlength=n_players).astype(np.int64)
+
+    # Same player filter as build_pass_network, applied per group
+    max_completed = np.zeros(len(groups), dtype=np.int64)
+    np.maximum.at(max_completed, player_group, completed)
+    keep = (completed > 0) & (completed > np.round(max_completed[player_group] * 0.1, 0))
+
+    receiver = df_passes['receiver'].to_numpy(dtype=np.float64, na_value=np.nan)
+    known = ~np.isnan(receiver)
+    receiver_keys = (group_codes[known] << 32) | receiver[known].astype(np.int64)
+    receiver_idx = np.searchsorted(keys, receiver_keys).clip(max=max(n_players - 1, 0))
+    found = keys[receiver_idx] == receiver_keys if n_players else np.zeros(0, dtype=bool)
+    pairs, pass_count = np.unique(passer_idx[known][found] * n_players + receiver_idx[found], return_counts=True)
+    pair_passer, pair_receiver = pairs // n_players, pairs % n_players
+    kept_pairs = keep[pair_passer] & keep[pair_receiver]
+    pair_passer, pair_receiver, pass_count = pair_passer[kept_pairs], pair_receiver[kept_pairs], pass_count[kept_pairs]
+
+    pair_group = player_group[pair_passer]
+    max_count = np.zeros(len(groups), dtype=np.int64)
+    np.maximum.at(max_count, pair_group, pass_count)
+    top = pass_count > np.round(max_count[pair_group] * 0.1, 0)
+    pair_passer, pair_receiver, pass_count, pair_group = pair_passer[top], pair_receiver[top], pass_count[top], pair_group[top]
+
+    group_frame = groups.to_frame(index=False, name=['match_id', 'team_id', 'window'])
+    info = df_passes[PLAYER_INFO_COLUMNS].iloc[first].reset_index(drop=True)
+    average_locs_and_count_df = pd.concat([
+        group_frame.iloc[player_group].reset_index(drop=True),
+        pd.DataFrame({
+            'player_id': keys & 0xFFFFFFFF,
+            'x': mean_x,
+            'y': mean_y,
+            'passes_attempted': attempted,
+            'passes_completed': completed,
+            'percentage_completed': np.round(completed / attempted * 100, 2),
+        }),
+        info,
+    ], axis=1)
+
+    start = average_locs_and_count_df.iloc[pair_passer][LINE_INFO_COLUMNS].reset_index(drop=True)
+    end = average_locs_and_count_df.iloc[pair_receiver][LINE_INFO_COLUMNS].reset_index(drop=True)
+    passes_between_df = pd.concat([
+        group_frame.iloc[pair_group].reset_index(drop=True),
+        pd.DataFrame({
+            'player_id': keys[pair_passer] & 0xFFFFFFFF,
+            'receiver': (keys[pair_receiver] & 0xFFFFFFFF).astype(np.float64),
+            'pass_count': pass_count,
+        }),
+        start,
+        end.add_suffix('_end'),
+    ], axis=1)
+
+    return passes_between_df, average_locs_and_count_df[keep].reset_index(drop=True)
+
+def batch_pass_networks(df: pd.DataFrame, split=None, workers: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Builds the pass networks of every (match_id, team_id) of a multi-match event frame in one grouped computation.
+
+    Parameters:
+    df (DataFrame): Event data of one or several matches (e.g. a season read from the event store).
+    split (optional): Minutes-window split, see assign_windows. Defaults to None (whole match).
+    workers (int, optional): Number of processes; matches are divided between them. Defaults to 1.
+
+    Returns:
+    Tuple[DataFrame, DataFrame]: Long versions of the build_pass_network frames, with match_id, team_id
+    and window columns identifying each network. Use select_network to get a single one.
+    """
+    if workers <= 1:
+        return _batch_pass_networks(df, split)
+
+    match_ids = pd.unique(df['match_id'])
+    chunks = [df[df['match_id'].isin(chunk)] for chunk in np.array_split(match_ids, workers) if len(chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_batch_pass_networks, chunks, [split] * len(chunks)))
+    return (pd.concat([result[0] for result in results], ignore_index=True),
+            pd.concat([result[1] for result in results], ignore_index=True))
+
+def select_network(networks: Tuple[pd.DataFrame, pd.DataFrame], match_id: int, team_id: int,
+                   window: str = 'full') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Picks one network out of the batch_pass_networks result, shaped like build_pass_network output.
+
+    Parameters:
+    networks (Tuple[DataFrame, DataFrame]): Result of batch_pass_networks.
+    match_id (int): The match.
+    team_id (int): The team.
+    window (str, optional): The minutes window. Defaults to 'full'.
+
+    Returns:
+    Tuple[DataFrame, DataFrame]: passes_between_df and average_locs_and_count_df for that network.
+    """
+    passes_between_df, average_locs_and_count_df = networks
+    keys = ['match_id', 'team_id', 'window']
+    selected = [(frame['match_id'] == match_id) & (frame['team_id'] == team_id) & (frame['window'] == window)
+                for frame in networks]
+    return (passes_between_df[selected[0]].drop(columns=keys).reset_index(drop=True),
+            average_locs_and_count_df[selected[1]].drop(columns=keys).set_index('player_id'))
+
+def get_passes_between_df_legacy(df_passes) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Original groupby/merge implementation of get_passes_between_df, kept as the benchmark baseline.
+
+    Parameters:
+    df_passes (DataFrame): DataFrame containing passes event data.
+
+    Returns:
+    Tuple[DataFrame, DataFrame]: Tuple containing two DataFrames:
+        1. DataFrame containing passes between players with their completion rates.
+        2. DataFrame containing average locations and pass counts per player.
+    """
+    df_passes_total = df_passes.groupby('player_id').agg({'x': ['mean'], 'y': ['mean', 'count']})
+    df_passes_total.columns = ['x', 'y', 'passes_attempted']
+
+    df_passes_completed = df_passes[df_passes.outcome_type_display_name == 'Successful'].groupby('player_id').id.count().reset_index().rename({'id':'passes_completed'}, axis='columns')
+
+    df_passes_total = df_passes_total.merge(df_passes_completed, on='player_id')
+    df_passes_total["percentage_completed"] = round(df_passes_total.passes_completed/df_passes_total.passes_attempted*100,2)
+
+    # Get the average loc. and the number of passes per player
+    average_locs_and_count_df = df_passes_total.merge(df_passes[['player_id', 'player_name', 'shirt_no', 'position', 'is_first_eleven', "subbed_in", "subbed_out"]],on='player_id', how='left').set_index('player_id')
+    average_locs_and_count_df = average_locs_and_count_df[average_locs_and_count_df.passes_completed > round(average_locs_and_count_df.passes_completed.max()*0.1,0)]
+
+    # calculate the number of passes between each player in both directions (using player_id/receiver so we get passes in both ways)
+    passes_player_ids_df = df_passes.loc[:, ['id', 'player_id', 'receiver', 'team_id']]
+    passes_player_ids_df = passes_player_ids_df.groupby(['player_id','receiver']).id.count().reset_index().rename({'id': 'pass_count'}, axis='columns')
+
+    # add on the location of each player so we have the start and end positions of the lines
+    passes_between_df = passes_player_ids_df.merge(average_locs_and_count_df[['x','y','player_name','shirt_no','position']], left_on='player_id', right_index=True)
+    passes_between_df = passes_between_df.merge(average_locs_and_count_df[['x','y','player_name','shirt_no','position']], left_on='receiver', right_index=True,suffixes=['', '_end']).drop_duplicates()
+    #We only take that passes combinations that are higher than 10% of max. combination
+    passes_between_df=passes_between_df[passes_between_df.pass_count > round(passes_between_df.pass_count.max()*0.1,0)]
+
+    return passes_between_df, average_locs_and_count_df
+
+def benchmark_pass_network(passes: List[pd.DataFrame], repeat: int = 3) -> Dict[str, float]:
+    """
+    Compare build_pass_network with the original groupby/merge implementation.
+
+    Parameters:
+    - passes (List[pd.DataFrame]): Passes frames from get_passes_df, e.g. both teams of every match of a season.
+    - repeat (int): Number of passes over the list; the best pass is kept. Defaults to 3.
+
+    Returns:
+    Dict[str, float]: Total seconds for each implementation and the speedup.
+    """
+    def best_time(build):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for df_passes in passes:
+                build(df_passes)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    legacy_time = best_time(get_passes_between_df_legacy)
+    engine_time = best_time(build_pass_network)
+    return {'legacy_s': legacy_time, 'engine_s': engine_time, 'speedup': legacy_time / engine_time}
@@ -0,0 +1,92 @@
+#Imports
+from typing import Tuple
+
+import pandas as pd
+
+from football_analytics.analytics.pass_classification import classify_passes
+from football_analytics.analytics.pass_network import build_pass_network
+from football_analytics.analytics.possession import possession_chains
+from football_analytics.trace import traced
+
+#Functions
+
+def get_df_info(df) -> pd.DataFrame:
+    """
+    Extracts substitutions information DataFrame.
+
+    Parameters:
+    df (DataFrame): DataFrame containing event data.
+
+    Returns:
+    DataFrame: DataFrame containing substitutions event data.
+    """
+
+    subsIn = df[df.type_display_name == "SubstitutionOn"]["player_id"]
+    subsOut = df[df.type_display_name == "SubstitutionOff"]["player_id"]
+
+    df_info = df[["player_id", "player_name", "team_id", "shirt_no", "position", "is_first_eleven"]].copy().drop_duplicates()
+    df_info["subbed_in"] = df_info["player_id"].isin(subsIn)
+    df_info["subbed_out"] = df_info["player_id"].isin(subsOut)
+
+    return df_info
+
+@traced('analyze.passes', rows=len)
+def get_passes_df(df,team,match_data) -> pd.DataFrame:
+    """
+    Extracts passes information DataFrame.
+
+    Parameters:
+    df (DataFrame): DataFrame containing event data.
+    team (str): Specifies the team for which passes are extracted.
+        Options:
+            - 'local': Extract passes for the local team.
+            - 'away': Extract passes for the away team.
+    match_data (dict): Dictionary containing match data including team information.
+
+    Returns:
+    DataFrame: DataFrame containing passes event data for the specified team. The receiver of a completed pass is
+    the player of the next action of the same possession chain, and NaN for incomplete passes.
+    """
+
+    df_info = get_df_info(df)
+
+    team_id = match_data[team]['teamId']
+    in_team = (df['team_id'] == team_id).to_numpy()
+    df2 = df[in_team].copy()
+    df2["receiver"] = possession_chains(df)['receiver'].to_numpy()[in_team]
+
+    passes_ids = df2.index[(df2.type_display_name == 'Pass')]
+    df_passes = df2.loc[passes_ids, ["id", "x", "y", "end_x","end_y", "team_id", "player_id","shirt_no","position","is_first_eleven","player_name","receiver", "type_display_name", "outcome_type_display_name"]]
+    df_passes = df_passes.merge(df_info[["player_id", "team_id","subbed_in", "subbed_out"]], on=["player_id","team_id"])
+
+    return df_passes
+
+@traced('analyze.pass_network', rows=lambda result: len(result[1]))
+def get_passes_between_df(df_passes) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calculates passes counts, completion rates, average locations and pass amount between players.
+
+    Parameters:
+    df_passes (DataFrame): DataFrame containing passes event data.
+
+    Returns:
+    Tuple[DataFrame, DataFrame]: Tuple containing two DataFrames:
+        1. DataFrame containing passes between players with their completion rates.
+        2. DataFrame containing average locations and pass counts per player.
+    """
+    # Dense-index bincount engine; one row per player in the second frame
+    return build_pass_network(df_passes)
+
+@traced('analyze.pass_arrows', rows=len)
+def get_pass_arrows_df(df) -> pd.DataFrame:
+    """
+    Extracts pass information DataFrame.
+
+    Parameters:
+    df (DataFrame): DataFrame containing event data.
+
+    Returns:
+    DataFrame: DataFrame containing pass arrows event data.
+    """
+
+    return classify_passes(df)
@@ -0,0 +1,290 @@
+#Imports
+import bisect
+import difflib
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from unidecode import unidecode
+
+#Functions
+
+_SEPARATORS = re.compile(r'[^a-z0-9]+')
+
+# Base score of each kind of match; up to 10 points are added for the share of the name covered by the query
+FULL, TOKEN, ALIAS = 0, 1, 2
+PREFIX_SCORES = np.array([80.0, 70.0, 80.0])
+TOKENS_SCORE = 75.0
+SUBSTRING_SCORE = 50.0
+FUZZY_SCORE = 40.0
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a player name for searching: ASCII transliteration, lower case, words separated by single spaces.
+
+    Parameters:
+    - name (str): A player name or query, e.g. "Martin Ødegaard" or "N'Golo Kanté".
+
+    Returns:
+    str: The normalized name, e.g. "martin odegaard" or "n golo kante".
+    """
+    return _SEPARATORS.sub(' ', unidecode(str(name)).lower()).strip()
+
+class PlayerIndex:
+    """
+    Search index from player names, name tokens and aliases to player_id.
+
+    Names are normalized once when the index is built. Queries are answered with binary
+    searches over the sorted keys (full names with the spaces removed, single tokens and
+    aliases), so prefixes such as "salah", "mo sal" or "odegaard" resolve in well under a
+    millisecond over tens of thousands of players. Substring matches are used when no prefix
+    matches, and close spellings (difflib) when nothing else does; these fallbacks scan the
+    names and take about a millisecond per 50,000 players.
+
+    Parameters:
+    - players (pd.DataFrame): One row per player with player_id and player_name, plus an optional
+      `events` column used to rank otherwise equal matches (busiest player first).
+    - aliases (Dict[int, Iterable[str]], optional): Extra names per player_id, e.g. {4444: ['Mo Salah']}.
+    """
+
+    def __init__(self, players: pd.DataFrame, aliases: Optional[Dict[int, Iterable[str]]] = None):
+        players = players.drop_duplicates('player_id').reset_index(drop=True)
+        self.player_ids = players['player_id'].to_numpy(dtype=np.int64)
+        self.player_names = players['player_name'].astype(object).tolist()
+        weights = players['events'] if 'events' in players.columns else pd.Series(0, index=players.index)
+        self.weights = weights.to_numpy(dtype=np.float64)
+        self._positions = {int(player_id): position for position, player_id in enumerate(self.player_ids)}
+
+        entries = []
+        compact_names = []
+        for position, name in enumerate(self.player_names):
+            normalized = normalize_name(name) if name is not None else ''
+            compact = normalized.replace(' ', '')
+            compact_names.append(compact)
+            if compact:
+                entries.append((compact, position, FULL))
+            for token in set(normalized.split()):
+                entries.append((token, position, TOKEN))
+        for player_id, names in (aliases or {}).items():
+            position = self._positions.get(int(player_id))
+            if position is None:
+                continue
+            for alias in names:
+                compact = normalize_name(alias).replace(' ', '')
+                if compact:
+                    entries.append((compact, position, ALIAS))
+
+        entries.sort()
+        self._keys = [key for key, _, _ in entries]
+        self._owners = np.array([position for _, position, _ in entries], dtype=np.int64)
+        self._base = PREFIX_SCORES[np.array([kind for _, _, kind in entries], dtype=np.int8)]
+        self._inverse_lengths = 1 / np.array([len(key) for key in self._keys], dtype=np.float64)
+        tokens = [(key, position) for key, position, kind in entries if kind == TOKEN]
+        self._tokens = [key for key, _ in tokens]
+        self._token_owners = np.array([position for _, position in tokens], dtype=np.int64)
+        self._unique_keys = sorted(set(self._keys))
+
+        # Break ties by number of events without letting it outweigh any difference in score
+        self._tie_break = self.weights / (self.weights.max(initial=0) or 1) * 1e-3
+
+        # Full names joined in one string, so substring matches are found with str.find
+        self._blob = '\n'.join(compact_names)
+        self._offsets = np.cumsum([0] + [len(name) + 1 for name in compact_names[:-1]]).tolist()
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @classmethod
+    def from_events(cls, df: pd.DataFrame, aliases: Optional[Dict[int, Iterable[str]]] = None) -> 'PlayerIndex':
+        """
+        Build the index from event data, ranking players by their number of events.
+
+        Other spellings of a player's name found in the events are added as aliases.
+
+        Parameters:
+        - df (pd.DataFrame): Event data with player_id and player_name, e.g. a season read from the event store.
+        - aliases (Dict[int, Iterable[str]], optional): Extra names per player_id.
+
+        Returns:
+        PlayerIndex: The index.
+        """
+        df = df[['player_id', 'player_name']].dropna()
+        counts = df.groupby(['player_id', 'player_name'], observed=True, sort=False).size()
+        counts = counts.reset_index(name='events').sort_values('events', ascending=False, kind='stable')
+        players = counts.groupby('player_id', sort=False).agg(player_name=('player_name', 'first'),
+                                                              events=('events', 'sum')).reset_index()
+        aliases = {int(player_id): list(names) for player_id, names in (aliases or {}).items()}
+        others = counts[counts.duplicated('player_id')]
+        for player_id, name in zip(others['player_id'].tolist(), others['player_name'].tolist()):
+            aliases.setdefault(int(player_id), []).append(name)
+        return cls(players, aliases)
+
+    @classmethod
+    def from_store(cls, store, competition: Optional[str] = None, season: Optional[str] = None,
+                   aliases: Optional[Dict[int, Iterable[str]]] = None) -> 'PlayerIndex':
+        """
+        Build the index over every player of an event store, loading only the player columns.
+
+        Parameters:
+        - store (EventStore): The event store.
+        - competition (str, optional): Only this competition.
+        - season (str, optional): Only this season.
+        - aliases (Dict[int, Iterable[str]], optional): Extra names per player_id.
+
+        Returns:
+        PlayerIndex: The index.
+        """
+        return cls.from_events(store.read(competition, season, columns=['player_id', 'player_name']), aliases)
+
+    @staticmethod
+    def _range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        lo = bisect.bisect_left(keys, prefix)
+        return lo, bisect.bisect_left(keys, prefix + '\x7f', lo)
+
+    def _candidates(self, normalized: str) -> Tuple[np.ndarray, np.ndarray]:
+        # (player position, score) pairs; a player may appear more than once
+        compact = normalized.replace(' ', '')
+        tokens = normalized.split()
+
+        lo, hi = self._range(self._keys, compact)
+        owners = [self._owners[lo:hi]]
+        scores = [self._base[lo:hi] + 10 * len(compact) * self._inverse_lengths[lo:hi]]
+
+        if len(tokens) > 1:
+            # Every word of the query must start one of the words of the name
+            matched = None
+            for token in tokens:
+                lo, hi = self._range(self._tokens, token)
+                found = np.zeros(len(self.player_ids), dtype=bool)
+                found[self._token_owners[lo:hi]] = True
+                matched = found if matched is None else matched & found
+            matched = np.flatnonzero(matched)
+            owners.append(matched)
+            scores.append(np.full(len(matched), TOKENS_SCORE))
+
+        owners, scores = np.concatenate(owners), np.concatenate(scores)
+        if len(owners):
+            return owners, scores
+
+        positions = []
+        start = self._blob.find(compact)
+        while start != -1:
+            positions.append(bisect.bisect_right(self._offsets, start) - 1)
+            start = self._blob.find(compact, start + 1)
+        if positions:
+            return np.array(positions, dtype=np.int64), np.full(len(positions), SUBSTRING_SCORE)
+
+        # Close spellings among the keys that share the first two letters and have a similar length
+        lo, hi = self._range(self._unique_keys, compact[:2])
+        keys = [key for key in self._unique_keys[lo:hi] if abs(len(key) - len(compact)) <= 2]
+        owners, scores = [np.empty(0, dtype=np.int64)], [np.empty(0)]
+        for key in difflib.get_close_matches(compact, keys, n=10, cutoff=0.75):
+            lo, hi = self._range(self._keys, key)
+            owners.append(self._owners[lo:hi])
+            scores.append(np.full(hi - lo, FUZZY_SCORE + 10 * difflib.SequenceMatcher(None, compact, key).ratio()))
+        return np.concatenate(owners), np.concatenate(scores)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, str, float]]:
+        """
+        Find the players matching a query, best match first.
+
+        Exact names rank first, then name prefixes, prefixes of every word of the query,
+        single-word prefixes, substrings and close spellings. Equal scores go to the player
+        with more events.
+
+        Parameters:
+        - query (str): Full or partial name, in any case and with or without accents.
+        - limit (int, optional): Maximum number of results. Defaults to 10.
+
+        Returns:
+        List[Tuple[int, str, float]]: (player_id, player_name, score) per match.
+        """
+        normalized = normalize_name(query)
+        if not normalized or not len(self.player_ids):
+            return []
+        owners, scores = self._candidates(normalized)
+        ranking = scores + self._tie_break[owners]
+
+        # Only sort the best entries; a player has a few keys at most, so 4 * limit entries are enough
+        # unless the same players fill them, in which case everything is sorted
+        top = min(len(ranking), 4 * limit)
+        for candidates in ((np.argpartition(-ranking, top - 1)[:top] if top < len(ranking) else None), None):
+            if candidates is None:
+                candidates = np.arange(len(ranking))
+            results, seen = [], set()
+            for entry in candidates[np.argsort(-ranking[candidates], kind='stable')].tolist():
+                owner = int(owners[entry])
+                if owner in seen:
+                    continue
+                seen.add(owner)
+                results.append((int(self.player_ids[owner]), self.player_names[owner], float(scores[entry])))
+                if len(results) == limit:
+                    return results
+            if len(candidates) == len(ranking):
+                return results
+        return results
+
+    def resolve(self, query: str) -> int:
+        """
+        Return the player_id of the best match of a query.
+
+        Parameters:
+        - query (str): Full or partial name.
+
+        Returns:
+        int: The player_id.
+        """
+        results = self.search(query, limit=1)
+        if not results:
+            raise ValueError(f"No player matches {query!r}")
+        return results[0][0]
+
+    def name(self, player_id: int) -> str:
+        """
+        Return the display name of a player.
+
+        Parameters:
+        - player_id (int): The player id.
+
+        Returns:
+        str: The player name.
+        """
+        return self.player_names[self._positions[int(player_id)]]
+
+def benchmark_player_search(index: PlayerIndex, df: pd.DataFrame, queries: List[str],
+                            repeat: int = 100) -> Dict[str, float]:
+    """
+    Compare index lookups with the original per-row unidecode and substring scan of plot_arrows.
+
+    Parameters:
+    - index (PlayerIndex): The index.
+    - df (pd.DataFrame): Pass data with a player_name column, as scanned by the original lookup.
+    - queries (List[str]): Player names or partial names.
+    - repeat (int, optional): Number of runs per query for the index; the best run is kept. Defaults to 100.
+
+    Returns:
+    Dict[str, float]: Microseconds per query for each method and the speedup.
+    """
+    def legacy(query):
+        player = unidecode(query).lower().replace(" ", "")
+        normalized = df["player_name"].apply(lambda x: unidecode(x).lower().replace(" ", ""))
+        return df[normalized.str.contains(player)]
+
+    legacy_times, index_times = [], []
+    for query in queries:
+        start = time.perf_counter()
+        legacy(query)
+        legacy_times.append(time.perf_counter() - start)
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            index.search(query)
+            best = min(best, time.perf_counter() - start)
+        index_times.append(best)
+
+    results = {'legacy_us': float(np.mean(legacy_times)) * 1e6, 'index_us': float(np.mean(index_times)) * 1e6,
+               'index_max_us': float(np.max(index_times)) * 1e6, 'players': float(len(index))}
+    results['speedup'] = results['legacy_us'] / results['index_us']
+    return results
@@ -0,0 +1,200 @@
+#Imports
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+#Functions
+
+# Events that do not show which team has the ball: they are kept in the chain around them
+NEUTRAL_TYPES = ['Challenge', 'Aerial', 'Foul', 'Card', 'Error', 'OffsideProvoked', 'OffsideGiven', 'CornerAwarded',
+                 'SubstitutionOff', 'SubstitutionOn', 'FormationChange', 'FormationSet', 'ShieldBallOpp', 'Pressure',
+                 'Start', 'End', 'Other']
+# Duels that only win the ball when successful
+CONTESTED_TYPES = ['Tackle', 'TakeOn', 'Interception', 'BlockedPass']
+SHOT_TYPES = ['Goal', 'SavedShot', 'MissedShots', 'ShotOnPost']
+CHAIN_OUTCOMES = ['Goal', 'Shot', 'Lost', 'PeriodEnd']
+
+POSSESSION_COLUMNS = ['chain_id', 'chain_order', 'on_ball', 'chain_team_id', 'next_action_type',
+                      'next_action_player_id', 'next_in_chain', 'receiver', 'chain_outcome']
+
+def _period_column(df: pd.DataFrame) -> str:
+    return 'period_display_name' if 'period_display_name' in df.columns else 'period'
+
+def possession_chains(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Split events into possession chains and link every action to the next action of its own team.
+
+    An on-ball event is any event except the NEUTRAL_TYPES and unsuccessful CONTESTED_TYPES.
+    A chain is a run of on-ball events of one team within a match and period; it ends when
+    the other team has an on-ball event. Neutral events, such as a failed challenge by the
+    opponent, belong to the chain around them and do not break it. The frame may hold any
+    number of matches, in event order within each match.
+
+    Parameters:
+    - df (pd.DataFrame): Event data with team_id, player_id, type_display_name, outcome_type_display_name,
+      period_display_name (or period) and match_id (a single match if missing), e.g. normalize_events
+      output or canonical_events.engine_frame.
+
+    Returns:
+    pd.DataFrame: Aligned with df:
+        - chain_id (int64): Chain of the event, unique over the frame; -1 before the first on-ball event of a period.
+        - chain_order (int32): Position of the event among the on-ball events of its chain; -1 for neutral events.
+        - on_ball (bool): Whether the event is a possession action.
+        - chain_team_id (int64): Team in possession during the chain; -1 when there is no chain.
+        - next_action_type (category): Type of the next on-ball event of the same team in the same match and period,
+          skipping the other team's events.
+        - next_action_player_id (float64): Player of that action.
+        - next_in_chain (bool): Whether that action belongs to the same chain.
+        - receiver (float64): For successful on-ball events, the player of the next action of the chain; NaN otherwise.
+        - chain_outcome (category): 'Goal', 'Shot', 'Lost' or 'PeriodEnd' for the chain of the event.
+    """
+    n = len(df)
+    types = df['type_display_name']
+    successful = (df['outcome_type_display_name'] == 'Successful').to_numpy()
+    on_ball = ~types.isin(NEUTRAL_TYPES).to_numpy() & ~(types.isin(CONTESTED_TYPES).to_numpy() & ~successful)
+
+    # Segments: one per (match, period), in frame order
+    match_ids = df['match_id'].to_numpy() if 'match_id' in df.columns else np.zeros(n, dtype=np.int64)
+    periods = pd.factorize(df[_period_column(df)])[0]
+    segment_start = np.ones(n, dtype=bool)
+    segment_start[1:] = (match_ids[1:] != match_ids[:-1]) | (periods[1:] != periods[:-1])
+    segment = np.cumsum(segment_start) - 1
+
+    # Chains over the on-ball events only
+    positions = np.flatnonzero(on_ball)
+    team_ids = df['team_id'].to_numpy(dtype=np.int64)
+    teams, segments = team_ids[positions], segment[positions]
+    chain_start = np.ones(len(positions), dtype=bool)
+    chain_start[1:] = (teams[1:] != teams[:-1]) | (segments[1:] != segments[:-1])
+    chain = np.cumsum(chain_start) - 1
+    starts = np.flatnonzero(chain_start)
+    order = np.arange(len(positions)) - starts[chain]
+
+    # Every event takes the chain of the latest on-ball event of its segment; index -1 picks the padding
+    latest = np.maximum.accumulate(np.where(on_ball, np.arange(n), -1))
+    chain_by_row = np.full(n + 1, -1, dtype=np.int64)
+    chain_by_row[positions] = chain
+    chain_id = np.where(np.append(segment, -1)[latest] == segment, chain_by_row[latest], -1)
+    chain_order = np.full(n, -1, dtype=np.int32)
+    chain_order[positions] = order
+    chain_team_id = np.append(teams[starts], -1)[chain_id]
+
+    # Next on-ball event of the same team in the same segment: neighbours after sorting by (segment, team, order)
+    by_team = np.lexsort((positions, teams, segments))
+    following = np.full(len(positions), -1, dtype=np.int64)
+    same = (segments[by_team][1:] == segments[by_team][:-1]) & (teams[by_team][1:] == teams[by_team][:-1])
+    following[by_team[:-1][same]] = by_team[1:][same]
+    has_next = following >= 0
+    next_rows = positions[following[has_next]]
+
+    type_codes, type_names = pd.factorize(types)
+    next_type = np.full(n, -1, dtype=np.int64)
+    next_type[positions[has_next]] = type_codes[next_rows]
+    player_ids = df['player_id'].to_numpy(dtype=np.float64, na_value=np.nan)
+    next_player = np.full(n, np.nan)
+    next_player[positions[has_next]] = player_ids[next_rows]
+    next_in_chain = np.zeros(n, dtype=bool)
+    next_in_chain[positions[has_next]] = chain[following[has_next]] == chain[has_next]
+    receiver = np.where(next_in_chain & successful, next_player, np.nan)
+
+    # Chain outcomes
+    n_chains = len(starts)
+    is_goal = (types == 'Goal').to_numpy()[positions]
+    is_shot = types.isin(SHOT_TYPES).to_numpy()[positions]
+    chain_goal = np.bincount(chain, weights=is_goal, minlength=n_chains) > 0
+    chain_shot = np.bincount(chain, weights=is_shot, minlength=n_chains) > 0
+    chain_segments = segments[starts]
+    last_in_segment = np.ones(n_chains, dtype=bool)
+    last_in_segment[:-1] = chain_segments[1:] != chain_segments[:-1]
+    outcome = np.select([chain_goal, chain_shot, last_in_segment], [0, 1, 3], default=2).astype(np.int8)
+    outcome_codes = np.append(outcome, -1)[chain_id]
+
+    return pd.DataFrame({
+        'chain_id': chain_id,
+        'chain_order': chain_order,
+        'on_ball': on_ball,
+        'chain_team_id': chain_team_id,
+        'next_action_type': pd.Categorical.from_codes(next_type, categories=np.asarray(type_names)),
+        'next_action_player_id': next_player,
+        'next_in_chain': next_in_chain,
+        'receiver': receiver,
+        'chain_outcome': pd.Categorical.from_codes(outcome_codes, categories=CHAIN_OUTCOMES),
+    }, index=df.index, columns=POSSESSION_COLUMNS)
+
+def chain_summary(df: pd.DataFrame, chains: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Summarize every possession chain in one row.
+
+    Parameters:
+    - df (pd.DataFrame): Event data, as passed to possession_chains.
+    - chains (pd.DataFrame, optional): Result of possession_chains for df. Computed if not given.
+
+    Returns:
+    pd.DataFrame: chain_id, match_id, period, team_id, actions, passes, start and end minute,
+    start_x, start_y, end_x, end_y and outcome per chain.
+    """
+    if chains is None:
+        chains = possession_chains(df)
+    on_ball = chains['on_ball'].to_numpy()
+    chain = chains['chain_id'].to_numpy()[on_ball]
+    starts = np.flatnonzero(np.r_[True, chain[1:] != chain[:-1]]) if len(chain) else np.zeros(0, dtype=np.int64)
+    ends = np.r_[starts[1:], len(chain)] - 1
+
+    events = df[on_ball]
+    end_x = events['end_x'].to_numpy(dtype=np.float64, na_value=np.nan)
+    end_y = events['end_y'].to_numpy(dtype=np.float64, na_value=np.nan)
+    x = events['x'].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = events['y'].to_numpy(dtype=np.float64, na_value=np.nan)
+    is_pass = (events['type_display_name'] == 'Pass').to_numpy()
+    return pd.DataFrame({
+        'chain_id': chain[starts],
+        'match_id': events['match_id'].to_numpy()[starts],
+        'period': events[_period_column(df)].to_numpy()[starts],
+        'team_id': events['team_id'].to_numpy()[starts],
+        'actions': ends - starts + 1,
+        'passes': np.add.reduceat(is_pass.astype(np.int64), starts) if len(starts) else np.zeros(0, dtype=np.int64),
+        'start_minute': events['minute'].to_numpy()[starts],
+        'end_minute': events['minute'].to_numpy()[ends],
+        'start_x': x[starts],
+        'start_y': y[starts],
+        'end_x': np.where(np.isnan(end_x[ends]), x[ends], end_x[ends]),
+        'end_y': np.where(np.isnan(end_y[ends]), y[ends], end_y[ends]),
+        'outcome': chains['chain_outcome'].to_numpy()[on_ball][starts],
+    })
+
+def benchmark_possession(df: pd.DataFrame, repeat: int = 3) -> Dict[str, float]:
+    """
+    Time possession_chains and compare its receivers and next actions with the shift(-1) rules.
+
+    Parameters:
+    - df (pd.DataFrame): Event data, e.g. a whole season read from the event store.
+    - repeat (int, optional): Number of runs; the best one is kept. Defaults to 3.
+
+    Returns:
+    Dict[str, float]: Seconds per run, events per second, number of chains and the share of passes whose
+    shift(-1) receiver or next event differs from the chain-aware one.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chains = possession_chains(df)
+        times.append(time.perf_counter() - start)
+
+    is_pass = (df['type_display_name'] == 'Pass').to_numpy()
+    successful = (df['outcome_type_display_name'] == 'Successful').to_numpy()
+    shift_receiver = df.groupby(['match_id', 'team_id'], sort=False, observed=True)['player_id'].shift(-1)
+    shift_next = df['type_display_name'].shift(-1)
+    completed = is_pass & successful
+    receiver = chains['receiver'].to_numpy()
+    differs = ~np.isclose(shift_receiver.to_numpy(dtype=np.float64, na_value=np.nan), receiver, equal_nan=True)
+    chain_next = chains['next_action_type'].astype(object).where(chains['next_in_chain'])
+    next_differs = shift_next.astype(object).fillna('').to_numpy() != chain_next.fillna('').to_numpy()
+    return {
+        'seconds': min(times),
+        'events_per_second': len(df) / min(times),
+        'chains': float(chains['chain_id'].max() + 1),
+        'receiver_changed': float(differs[completed].mean()) if completed.any() else 0.0,
+        'next_event_changed': float(next_differs[is_pass].mean()) if is_pass.any() else 0.0,
+    }
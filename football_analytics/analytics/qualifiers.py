@@ -0,0 +1,230 @@
+#Imports
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+#Functions
+
+# Flags indexed in the qualifier_bits column: flag -> WhoScored qualifier displayName.
+# The position of a flag is its bit, so flags may only be appended; 63 at most to fit an int64.
+QUALIFIER_FLAGS = {
+    'long_ball': 'Longball',
+    'cross': 'Cross',
+    'head_pass': 'HeadPass',
+    'through_ball': 'Throughball',
+    'free_kick_taken': 'FreekickTaken',
+    'corner_taken': 'CornerTaken',
+    'throw_in': 'ThrowIn',
+    'goal_kick': 'GoalKick',
+    'penalty': 'Penalty',
+    'chipped': 'Chipped',
+    'switch_of_play': 'SwitchOfPlay',
+    'key_pass': 'KeyPass',
+    'big_chance': 'BigChanceCreated',
+    'set_piece': 'SetPiece',
+    'from_corner': 'FromCorner',
+    'direct_free_kick': 'DirectFreekick',
+    'regular_play': 'RegularPlay',
+    'fast_break': 'FastBreak',
+    'head': 'Head',
+    'left_foot': 'LeftFoot',
+    'right_foot': 'RightFoot',
+    'own_goal': 'OwnGoal',
+    'assisted': 'Assisted',
+    'intentional_assist': 'IntentionalAssist',
+    'layoff': 'LayOff',
+    'defensive_throw_in': 'DefensiveThrowIn',
+}
+
+FLAG_BITS = {flag: 1 << bit for bit, flag in enumerate(QUALIFIER_FLAGS)}
+_DISPLAY_NAME_BITS = {name: FLAG_BITS[flag] for flag, name in QUALIFIER_FLAGS.items()}
+
+QUALIFIER_COLUMNS = ['match_id', 'id', 'code', 'name', 'value', 'text']
+
+def _event_bits(event: Dict[str, Any]) -> int:
+    bits = 0
+    for qualifier in event.get('qualifiers', ()):
+        bits |= _DISPLAY_NAME_BITS.get(qualifier['type']['displayName'], 0)
+    return bits
+
+def qualifier_bits(events: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Build the qualifier_bits column: one int64 per event with a bit set for every flag of QUALIFIER_FLAGS it carries.
+
+    Parameters:
+    - events (List[dict]): Raw WhoScored events.
+
+    Returns:
+    np.ndarray: int64 bitsets, in event order.
+    """
+    return np.fromiter((_event_bits(event) for event in events), dtype=np.int64, count=len(events))
+
+def qualifier_table(match_data: Dict[str, Any], key: str = 'events', match_id: Optional[int] = None) -> pd.DataFrame:
+    """
+    Flatten the qualifiers of a match into a long table with one row per (event, qualifier).
+
+    Only events with a player are kept, as in normalize_events, so the table joins on the
+    events table through (match_id, id). Numeric qualifier values (Length, Angle, ...) go to
+    `value`; the others (Zone, ...) are kept in `text`.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - key (str): The key holding the events list. Defaults to 'events'.
+    - match_id (int, optional): match_id of the events table. Built from match_data if not given.
+
+    Returns:
+    pd.DataFrame: match_id, id (event id), code (qualifier type), name (category), value (float32) and text (category).
+    """
+    events = [event for event in match_data[key] if event.get('playerId') is not None]
+    if match_id is None:
+        from football_analytics.analytics.normalize import build_match_id
+        match_id = build_match_id(match_data, np.array([event['teamId'] for event in events], dtype=np.int64))
+
+    ids, codes, names, raw = [], [], [], []
+    for event in events:
+        for qualifier in event.get('qualifiers', ()):
+            ids.append(event['id'])
+            codes.append(qualifier['type']['value'])
+            names.append(qualifier['type']['displayName'])
+            raw.append(qualifier.get('value'))
+
+    raw = pd.Series(raw, dtype=object)
+    value = pd.to_numeric(raw, errors='coerce')
+    text = raw.where(value.isna() & raw.notna())
+    return pd.DataFrame({
+        'match_id': np.full(len(ids), match_id, dtype=np.int64),
+        'id': np.array(ids, dtype=np.int64),
+        'code': np.array(codes, dtype=np.int16),
+        'name': pd.Categorical(names),
+        'value': value.to_numpy(dtype=np.float32),
+        'text': pd.Categorical(text),
+    }, columns=QUALIFIER_COLUMNS)
+
+def flag_mask(*flags: str) -> int:
+    """
+    Combine qualifier flags into one bitmask.
+
+    Parameters:
+    - *flags (str): Keys of QUALIFIER_FLAGS, e.g. 'cross', 'corner_taken'.
+
+    Returns:
+    int: The bitmask.
+    """
+    unknown = [flag for flag in flags if flag not in FLAG_BITS]
+    if unknown:
+        raise ValueError(f"Unknown qualifier flags: {unknown}")
+    mask = 0
+    for flag in flags:
+        mask |= FLAG_BITS[flag]
+    return mask
+
+def has_qualifier(df: pd.DataFrame, *flags: str, how: str = 'any') -> pd.Series:
+    """
+    Select the events carrying indexed qualifiers, as a vectorized mask over qualifier_bits.
+
+    Parameters:
+    - df (pd.DataFrame): Event data with a qualifier_bits column, e.g. a whole season read from the event store.
+    - *flags (str): Keys of QUALIFIER_FLAGS.
+    - how (str, optional): 'any' to match events with at least one of the flags, 'all' for events with every flag.
+      Defaults to 'any'.
+
+    Returns:
+    pd.Series: Boolean mask aligned with df.
+    """
+    mask = np.int64(flag_mask(*flags))
+    bits = df['qualifier_bits'].to_numpy(dtype=np.int64) & mask
+    selected = bits == mask if how == 'all' else bits != 0
+    return pd.Series(selected, index=df.index)
+
+def qualifier_flags(df: pd.DataFrame, flags: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Expand qualifier_bits into one boolean column per flag.
+
+    Parameters:
+    - df (pd.DataFrame): Event data with a qualifier_bits column.
+    - flags (List[str], optional): Flags to expand. Defaults to every key of QUALIFIER_FLAGS.
+
+    Returns:
+    pd.DataFrame: One boolean column per flag, aligned with df.
+    """
+    bits = df['qualifier_bits'].to_numpy(dtype=np.int64)
+    return pd.DataFrame({flag: (bits & np.int64(flag_mask(flag))) != 0 for flag in (flags or list(QUALIFIER_FLAGS))},
+                        index=df.index)
+
+def qualifier_values(df: pd.DataFrame, table: pd.DataFrame, qualifier: Union[int, str],
+                     column: str = 'value') -> pd.Series:
+    """
+    Look up one qualifier of every event in the long table, e.g. the Length or Angle of passes.
+
+    Parameters:
+    - df (pd.DataFrame): Event data with match_id and id columns.
+    - table (pd.DataFrame): Result of qualifier_table for the same matches.
+    - qualifier (int or str): Qualifier type code or displayName.
+    - column (str, optional): 'value' or 'text'. Defaults to 'value'.
+
+    Returns:
+    pd.Series: The qualifier value aligned with df, NaN for events without it.
+    """
+    rows = table[table['code'] == qualifier] if isinstance(qualifier, int) else table[table['name'] == qualifier]
+    rows = rows.drop_duplicates(['match_id', 'id'])
+    lookup = pd.Series(rows[column].to_numpy(), index=pd.MultiIndex.from_arrays([rows['match_id'], rows['id']]))
+    values = lookup.reindex(pd.MultiIndex.from_arrays([df['match_id'], df['id']]))
+    return pd.Series(values.to_numpy(), index=df.index, name=str(qualifier))
+
+def benchmark_qualifiers(match_data: Dict[str, Any], flags: Tuple[str, ...] = ('cross', 'long_ball', 'corner_taken'),
+                         repeat: int = 20) -> Dict[str, float]:
+    """
+    Compare the list-of-dict qualifiers column with qualifier_bits and the long table on one match.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+    - flags (Tuple[str, ...], optional): Flags selected by the filter. Defaults to crosses, long balls and corners.
+    - repeat (int, optional): Number of runs per filter; the best run is kept. Defaults to 20.
+
+    Returns:
+    Dict[str, float]: Bytes per 1,000 events of each representation, milliseconds per 1,000 events of each filter,
+    the ratios and the number of events selected by both filters.
+    """
+    events = [event for event in match_data['events'] if event.get('playerId') is not None]
+    n_events = len(events) / 1000
+    lists = pd.Series([event.get('qualifiers', []) for event in events])
+    df = pd.DataFrame({'qualifier_bits': qualifier_bits(events)})
+    table = qualifier_table(match_data)
+
+    def deep_size(value):
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(deep_size(k) + deep_size(v) for k, v in value.items())
+        if isinstance(value, list):
+            return sys.getsizeof(value) + sum(deep_size(item) for item in value)
+        return sys.getsizeof(value)
+
+    names = {QUALIFIER_FLAGS[flag] for flag in flags}
+
+    def scan():
+        return lists.map(lambda qualifiers: any(q['type']['displayName'] in names for q in qualifiers))
+
+    def best_time(function):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    scan_time, scanned = best_time(scan)
+    bits_time, masked = best_time(lambda: has_qualifier(df, *flags))
+    results = {
+        'list_bytes_per_1k': (lists.memory_usage(index=False) + sum(deep_size(q) for q in lists)) / n_events,
+        'bits_bytes_per_1k': float(df.memory_usage(index=False).sum()) / n_events,
+        'table_bytes_per_1k': float(table.memory_usage(index=False, deep=True).sum()) / n_events,
+        'scan_ms_per_1k': scan_time * 1000 / n_events,
+        'bits_ms_per_1k': bits_time * 1000 / n_events,
+        'scan_selected': int(scanned.sum()),
+        'bits_selected': int(masked.sum()),
+    }
+    results['memory_ratio'] = results['list_bytes_per_1k'] / (results['bits_bytes_per_1k'] + results['table_bytes_per_1k'])
+    results['speedup'] = results['scan_ms_per_1k'] / results['bits_ms_per_1k']
+    return results
@@ -0,0 +1,24 @@
+# Loading Whoscored match pages and decoding their matchCentreData.
+# selenium is only imported when a Chrome session is started and aiohttp when HttpFetcher is used.
+
+#Imports
+from football_analytics._lazy import lazy_exports
+
+#Functions
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'BrowserPool': 'browser_pool',
+    'HttpPageDriver': 'browser_pool',
+    'SavedPageDriver': 'browser_pool',
+    'get_default_pool': 'browser_pool',
+    'headless_chrome': 'browser_pool',
+    'MatchCache': 'cache',
+    'extract_match_centre_data': 'extract',
+    'HttpFetcher': 'http',
+    'LiveMatch': 'live',
+    'ReplayServer': 'live',
+    'get_data': 'matches',
+    'get_data_many': 'matches',
+    'get_match_tables': 'matches',
+    'get_matchdata_keys': 'matches',
+})
@@ -0,0 +1,257 @@
+#Imports
+import atexit
+import queue
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+#Functions
+
+def headless_chrome() -> 'webdriver.Chrome':
+    """
+    Create a headless Chrome webdriver suitable for scraping Whoscored pages.
+
+    Returns:
+    webdriver.Chrome: A new headless Chrome session.
+    """
+    # Imported here, so that code which never starts a browser does not load selenium
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    return webdriver.Chrome(options=options)
+
+class SavedPageDriver:
+    """
+    Minimal stand-in for a selenium webdriver that serves saved HTML pages.
+
+    Pages are looked up by URL in `pages`, either as raw HTML strings or as paths to
+    saved .html files. Useful to rerun the scraper offline or to exercise the pool
+    without launching Chrome.
+    """
+
+    def __init__(self, pages: Dict[str, str]):
+        self.pages = pages
+        self.page_source = ''
+        self.pages_loaded = 0
+        self.closed = False
+
+    def get(self, url: str) -> None:
+        page = self.pages[url]
+        if isinstance(page, Path) or not page.lstrip().startswith('<'):
+            page = Path(page).read_text(encoding='utf-8')
+        self.page_source = page
+        self.pages_loaded += 1
+
+    def execute_script(self, script: str):
+        if self.closed:
+            raise RuntimeError('driver is closed')
+        return 1
+
+    def quit(self) -> None:
+        self.closed = True
+
+class HttpPageDriver:
+    """
+    Minimal stand-in for a selenium webdriver that loads pages with plain HTTP requests.
+
+    JavaScript is not run, so it only suits servers that send the match data in the page
+    itself, e.g. a local server replaying a recorded match (scrape.live.ReplayServer).
+
+    Parameters:
+    - timeout (float): Seconds to wait for a response. Defaults to 30.
+    - headers (Dict[str, str], optional): Extra request headers.
+    """
+
+    def __init__(self, timeout: float = 30, headers: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.headers = {'User-Agent': 'Mozilla/5.0', **(headers or {})}
+        self.page_source = ''
+        self.pages_loaded = 0
+        self.closed = False
+
+    def get(self, url: str) -> None:
+        request = urllib.request.Request(url, headers=self.headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            self.page_source = response.read().decode('utf-8')
+        self.pages_loaded += 1
+
+    def execute_script(self, script: str):
+        if self.closed:
+            raise RuntimeError('driver is closed')
+        return 1
+
+    def quit(self) -> None:
+        self.closed = True
+
+class BrowserPool:
+    """
+    Bounded pool of reusable browser sessions.
+
+    Sessions are created lazily up to `size`, health-checked before being handed out
+    and recycled (quit and replaced) after `max_pages` page loads or on any failure.
+
+    Parameters:
+    - size (int): Maximum number of live browser sessions.
+    - max_pages (int): Number of pages a session may load before it is recycled.
+    - driver_factory (Callable): Function returning a new webdriver. Defaults to headless Chrome.
+    - timeout (float, optional): Seconds to wait for a free session before raising queue.Empty.
+      Waiters are woken whenever a session is returned or discarded, so they can take it or create its replacement.
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50,
+                 driver_factory: Callable = headless_chrome, timeout: Optional[float] = None):
+        if size < 1:
+            raise ValueError('size must be at least 1')
+        self.size = size
+        self.max_pages = max_pages
+        self.driver_factory = driver_factory
+        self.timeout = timeout
+        self._idle = []
+        self._pages = {}
+        self._created = 0
+        # Guards _idle and _created; notified whenever a session or a slot becomes free
+        self._available = threading.Condition()
+        self._closed = False
+
+    def _new_driver(self):
+        driver = self.driver_factory()
+        self._pages[id(driver)] = 0
+        return driver
+
+    def _quit(self, driver) -> None:
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _free_slot(self) -> None:
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _discard(self, driver) -> None:
+        self._quit(driver)
+        self._free_slot()
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            return driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def _acquire(self):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError('BrowserPool is closed')
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    driver = None
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._available.wait(remaining)
+
+        if driver is not None:
+            if self._is_healthy(driver):
+                return driver
+            # Replace a dead session, keeping the slot
+            self._quit(driver)
+        try:
+            return self._new_driver()
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _release(self, driver, failed: bool = False) -> None:
+        self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+        if failed or self._closed or self._pages[id(driver)] >= self.max_pages:
+            self._discard(driver)
+        else:
+            with self._available:
+                self._idle.append(driver)
+                self._available.notify()
+
+    @contextmanager
+    def driver(self):
+        """
+        Borrow a browser session from the pool.
+
+        Yields:
+        webdriver: A healthy browser session, returned to the pool on exit.
+        """
+        driver = self._acquire()
+        failed = False
+        try:
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(driver, failed)
+
+    def get_page_source(self, url: str) -> str:
+        """
+        Load a URL in a pooled session and return its page source.
+
+        Parameters:
+        - url (str): The URL to load.
+
+        Returns:
+        str: The page source after loading.
+        """
+        with self.driver() as driver:
+            driver.get(url)
+            return driver.page_source
+
+    def close(self) -> None:
+        """
+        Quit every idle session and stop handing out new ones.
+        """
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Waiters raise instead of waiting for a session that will never come back
+            self._available.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_default_pool() -> BrowserPool:
+    """
+    Return the process-wide browser pool, creating it on first use.
+
+    Returns:
+    BrowserPool: The shared pool, closed automatically at interpreter exit.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool._closed:
+            _default_pool = BrowserPool()
+            atexit.register(_default_pool.close)
+    return _default_pool
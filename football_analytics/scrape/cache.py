@@ -0,0 +1,177 @@
+#Imports
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from football_analytics.scrape.extract import loads
+
+#Functions
+
+FINISHED_ELAPSED = ('FT', 'AET', 'PEN')
+
+def get_match_id(url: str) -> int:
+    """
+    Extract the Whoscored match id from a match URL.
+
+    Parameters:
+    - url (str): The Whoscored URL for the desired match, e.g. .../Matches/1729398/Live/...
+
+    Returns:
+    int: The Whoscored match id.
+    """
+    match = re.search(r'/Matches/(\d+)', url)
+    if match is None:
+        raise ValueError(f"No Whoscored match id found in {url!r}")
+    return int(match.group(1))
+
+def content_hash(match_data: Dict[str, Any]) -> str:
+    """
+    Hash the events of a match so that a rescrape can tell whether anything changed.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+
+    Returns:
+    str: Hex sha256 digest of the events list.
+    """
+    payload = json.dumps(match_data['events'], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def is_finished(match_data: Dict[str, Any]) -> bool:
+    """
+    Check whether a matchCentreData dict belongs to a match that has finished.
+
+    Parameters:
+    - match_data (dict): The matchCentreData dictionary.
+
+    Returns:
+    bool: True when the match is over and its data will not change any more.
+    """
+    return match_data.get('elapsed') in FINISHED_ELAPSED
+
+class MatchCache:
+    """
+    Persistent on-disk cache of parsed matchCentreData dictionaries.
+
+    Entries are gzip-compressed JSON files named after the Whoscored match id. Finished
+    matches are kept until evicted; live matches expire after `live_ttl` seconds. When
+    the directory grows over `max_bytes`, the least recently used entries are removed.
+
+    Parameters:
+    - path (str): Directory where the cache files are stored.
+    - max_bytes (int): Size cap for the whole cache directory. Defaults to 1 GB.
+    - live_ttl (float): Seconds a live match entry stays valid. Defaults to 60.
+    """
+
+    def __init__(self, path: str = '.whoscored_cache', max_bytes: int = 1 << 30, live_ttl: float = 60):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _file(self, match_id: int) -> Path:
+        return self.path / f"{int(match_id)}.json.gz"
+
+    def get(self, match_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached matchCentreData for a match, or None on a miss or expired entry.
+
+        Parameters:
+        - match_id (int): The Whoscored match id.
+
+        Returns:
+        Optional[Dict[str, Any]]: The cached match data.
+        """
+        file = self._file(match_id)
+        try:
+            with gzip.open(file, 'rb') as f:
+                entry = loads(f.read())
+        except (FileNotFoundError, OSError, ValueError):
+            entry = None
+
+        if entry is not None and not entry['finished'] and time.time() - entry['fetched_at'] > self.live_ttl:
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Touch the file so eviction sees it as recently used
+        try:
+            os.utime(file)
+        except OSError:
+            pass
+        return entry['data']
+
+    def put(self, match_id: int, match_data: Dict[str, Any]) -> None:
+        """
+        Store the matchCentreData for a match and evict old entries if over the size cap.
+
+        Parameters:
+        - match_id (int): The Whoscored match id.
+        - match_data (dict): The matchCentreData dictionary.
+        """
+        entry = {'fetched_at': time.time(), 'finished': is_finished(match_data), 'data': match_data}
+        payload = gzip.compress(json.dumps(entry, separators=(',', ':')).encode('utf-8'), compresslevel=6)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, self._file(match_id))
+        self.evict()
+
+    def invalidate(self, match_id: int) -> None:
+        """
+        Remove a match from the cache.
+
+        Parameters:
+        - match_id (int): The Whoscored match id.
+        """
+        self._file(match_id).unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """
+        Delete least recently used entries until the cache fits in `max_bytes`.
+        """
+        with self._lock:
+            files = []
+            for file in self.path.glob('*.json.gz'):
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, file))
+            total = sum(size for _, size, _ in files)
+            for _, size, file in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                file.unlink(missing_ok=True)
+                total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the current size of the cache.
+
+        Returns:
+        Dict[str, Any]: hits, misses, hit_rate, entries and bytes.
+        """
+        files = list(self.path.glob('*.json.gz'))
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(files),
+            'bytes': sum(file.stat().st_size for file in files),
+        }
@@ -0,0 +1,141 @@
+#Imports
+import json
+import time
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+try:
+    import orjson as _fast_json
+except ImportError:
+    try:
+        import ujson as _fast_json
+    except ImportError:
+        _fast_json = None
+
+#Functions
+
+MATCH_CENTRE_KEY = b'matchCentreData'
+
+_OPENING = (ord('{'), ord('['))
+
+def find_json_end(buf: bytes, start: int) -> int:
+    """
+    Find where the JSON object or array starting at `start` ends.
+
+    Brackets are balanced with numpy over the raw bytes, ignoring any bracket that sits
+    inside a string literal (escaped quotes are taken into account).
+
+    Parameters:
+    - buf (bytes): Buffer containing the JSON value.
+    - start (int): Index of the opening '{' or '['.
+
+    Returns:
+    int: Index one past the matching closing bracket.
+    """
+    chars = np.frombuffer(buf, dtype=np.uint8, offset=start)
+    if chars.size == 0 or chars[0] not in (ord('{'), ord('[')):
+        raise ValueError('No JSON object or array at the given position')
+
+    # Only quotes and brackets matter; work on their positions instead of every byte
+    quotes = np.flatnonzero(chars == ord('"'))
+    brackets = np.flatnonzero((chars == ord('{')) | (chars == ord('[')) | (chars == ord('}')) | (chars == ord(']')))
+
+    # A quote is escaped when preceded by an odd number of backslashes
+    escaped = np.zeros(quotes.size, dtype=bool)
+    run = np.ones(quotes.size, dtype=np.intp)
+    candidates = np.flatnonzero(chars[quotes - 1] == ord('\\'))
+    while candidates.size:
+        escaped[candidates] = ~escaped[candidates]
+        run[candidates] += 1
+        before = quotes[candidates] - run[candidates]
+        candidates = candidates[chars[before] == ord('\\')]
+    quotes = quotes[~escaped]
+
+    # A bracket is inside a string when an odd number of quotes precede it
+    in_string = np.searchsorted(quotes, brackets) & 1
+    brackets = brackets[in_string == 0]
+    depth = np.cumsum(np.where(np.isin(chars[brackets], _OPENING), 1, -1))
+    closed = np.flatnonzero(depth == 0)
+    if closed.size == 0:
+        raise ValueError('Unbalanced JSON value')
+    return start + int(brackets[closed[0]]) + 1
+
+def loads(data: bytes) -> Any:
+    """
+    Decode JSON with orjson or ujson when installed, falling back to the json module.
+
+    Parameters:
+    - data (bytes): The JSON document.
+
+    Returns:
+    Any: The decoded object.
+    """
+    if _fast_json is not None:
+        return _fast_json.loads(data)
+    return json.loads(data)
+
+def extract_match_centre_data(page_source: Union[str, bytes], key: bytes = MATCH_CENTRE_KEY) -> Dict[str, Any]:
+    """
+    Extract the matchCentreData dictionary from a Whoscored match page.
+
+    The literal is located by scanning the raw page bytes and only its JSON span is
+    decoded, so the rest of the page is never parsed.
+
+    Parameters:
+    - page_source (str or bytes): HTML of the Whoscored match page.
+    - key (bytes, optional): Name of the JavaScript property to extract. Defaults to matchCentreData.
+
+    Returns:
+    Dict[str, Any]: The match data dictionary.
+    """
+    buf = page_source.encode('utf-8') if isinstance(page_source, str) else page_source
+    position = buf.find(key + b':')
+    if position == -1:
+        raise ValueError(f"{key.decode()} not found in page")
+    start = position + len(key) + 1
+    # Skip whitespace between the colon and the value
+    while buf[start] in b' \t\r\n':
+        start += 1
+    end = find_json_end(buf, start)
+    return loads(buf[start:end])
+
+def extract_match_centre_data_bs4(page_source: str) -> Dict[str, Any]:
+    """
+    Extract matchCentreData the way get_matchdata_keys originally did, with a full BeautifulSoup parse.
+
+    Parameters:
+    - page_source (str): HTML of the Whoscored match page.
+
+    Returns:
+    Dict[str, Any]: The match data dictionary.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_source, 'html.parser')
+    element = soup.select_one('script:-soup-contains("matchCentreData")')
+    return json.loads(element.text.split("matchCentreData: ")[1].split(',\n')[0])
+
+def benchmark_extraction(pages: List[str], repeat: int = 3) -> Dict[str, float]:
+    """
+    Compare the BeautifulSoup extraction with extract_match_centre_data on saved pages.
+
+    Parameters:
+    - pages (List[str]): HTML sources of saved Whoscored match pages.
+    - repeat (int): Number of passes over the pages; the best pass is kept. Defaults to 3.
+
+    Returns:
+    Dict[str, float]: Seconds per page for each method and the resulting speedup.
+    """
+    def best_time(extract):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in pages:
+                extract(page)
+            times.append((time.perf_counter() - start) / len(pages))
+        return min(times)
+
+    bs4_time = best_time(extract_match_centre_data_bs4)
+    fast_time = best_time(extract_match_centre_data)
+    return {'bs4_s_per_page': bs4_time, 'fast_s_per_page': fast_time, 'speedup': bs4_time / fast_time}
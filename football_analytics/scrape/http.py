@@ -0,0 +1,346 @@
+#Imports
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+
+from football_analytics.scrape.browser_pool import BrowserPool, HttpPageDriver, get_default_pool
+from football_analytics.scrape.extract import MATCH_CENTRE_KEY, extract_match_centre_data
+
+#Functions
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                  'Chrome/124.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-GB,en;q=0.9',
+}
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def needs_browser(page_source) -> bool:
+    """
+    Check whether a page lacks matchCentreData, e.g. a bot check that only a browser running JavaScript gets past.
+
+    Parameters:
+    - page_source (str or bytes): The page loaded over plain HTTP.
+
+    Returns:
+    bool: True when the page has to be loaded in a browser instead.
+    """
+    key = MATCH_CENTRE_KEY if isinstance(page_source, bytes) else MATCH_CENTRE_KEY.decode()
+    return key not in page_source
+
+class _LoopThread:
+    # Event loop running in a daemon thread, so synchronous code can submit coroutines to it
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+class HttpFetcher:
+    """
+    Browserless transport for Whoscored match pages: asyncio HTTP requests over one shared connection pool.
+
+    Requests share cookies and headers and at most `concurrency` of them are in flight.
+    Pages that come back without matchCentreData (they need JavaScript) are loaded again
+    through a browser pool. The fetcher has the get_page_source method of BrowserPool, so it
+    can be passed as `pool` to get_matchdata_keys, get_data and get_match_tables, or as
+    `fetcher` to get_data_many to fetch a whole batch concurrently.
+
+    Parameters:
+    - concurrency (int): Maximum number of requests in flight. Defaults to 32.
+    - per_host (int): Maximum number of connections per host. Defaults to 16.
+    - timeout (float): Seconds allowed per request. Defaults to 30.
+    - headers (Dict[str, str], optional): Headers added to DEFAULT_HEADERS.
+    - cookies (Dict[str, str], optional): Cookies sent with every request, e.g. copied from a browser session.
+    - retries (int): Retries after a connection error, a timeout or a RETRY_STATUSES response. Defaults to 2.
+    - backoff (float): Seconds before the first retry, doubled for each further one. Defaults to 1.
+    - fallback_pool (BrowserPool, optional): Pool for the pages that need a browser. Defaults to the shared pool;
+      pass False to raise ValueError instead.
+    """
+
+    def __init__(self, concurrency: int = 32, per_host: int = 16, timeout: float = 30,
+                 headers: Optional[Dict[str, str]] = None, cookies: Optional[Dict[str, str]] = None,
+                 retries: int = 2, backoff: float = 1.0, fallback_pool: Optional[BrowserPool] = None):
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.cookies = cookies or {}
+        self.retries = retries
+        self.backoff = backoff
+        self.fallback_pool = fallback_pool
+        self.pages_fetched = 0
+        self.fallbacks = 0
+        self._runner = None
+        self._session = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _loop(self) -> _LoopThread:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('HttpFetcher is closed')
+            if self._runner is None:
+                self._runner = _LoopThread()
+            return self._runner
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Created inside the event loop that uses it
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers, cookies=self.cookies,
+                                                  cookie_jar=aiohttp.CookieJar(unsafe=True),
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def fetch_page(self, url: str) -> str:
+        """
+        Load a page over HTTP, retrying transient failures.
+
+        Parameters:
+        - url (str): The URL to load.
+
+        Returns:
+        str: The page source, as served (JavaScript is not run).
+        """
+        session = await self._get_session()
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    async with session.get(url) as response:
+                        if response.status not in RETRY_STATUSES or attempt == self.retries:
+                            response.raise_for_status()
+                            page_source = await response.text()
+                            self.pages_fetched += 1
+                            return page_source
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == self.retries:
+                        raise
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def fetch_page_source(self, url: str) -> str:
+        """
+        Load a match page over HTTP, or through the browser pool when it needs JavaScript.
+
+        Parameters:
+        - url (str): The Whoscored URL for the desired match.
+
+        Returns:
+        str: A page source holding matchCentreData.
+        """
+        page_source = await self.fetch_page(url)
+        if not needs_browser(page_source):
+            return page_source
+        if self.fallback_pool is False:
+            raise ValueError(f"{MATCH_CENTRE_KEY.decode()} not found in {url!r} and browser fallback is disabled")
+        self.fallbacks += 1
+        pool = self.fallback_pool or get_default_pool()
+        return await asyncio.to_thread(pool.get_page_source, url)
+
+    async def fetch_match(self, url: str) -> Dict[str, Any]:
+        """
+        Load a match page and decode its matchCentreData.
+
+        Parameters:
+        - url (str): The Whoscored URL for the desired match.
+
+        Returns:
+        Dict[str, Any]: The matchCentreData dictionary.
+        """
+        return extract_match_centre_data(await self.fetch_page_source(url))
+
+    async def fetch_matches(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Load several matches concurrently.
+
+        Parameters:
+        - urls (List[str]): Whoscored URLs for the desired matches.
+
+        Returns:
+        List[Dict[str, Any]]: matchCentreData per URL, in the order given.
+        """
+        return await asyncio.gather(*(self.fetch_match(url) for url in urls))
+
+    def get_page_source(self, url: str) -> str:
+        """
+        Synchronous fetch_page_source, interchangeable with BrowserPool.get_page_source.
+
+        Parameters:
+        - url (str): The Whoscored URL for the desired match.
+
+        Returns:
+        str: A page source holding matchCentreData.
+        """
+        return self._loop().run(self.fetch_page_source(url))
+
+    def get_matches(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Synchronous fetch_matches.
+
+        Parameters:
+        - urls (List[str]): Whoscored URLs for the desired matches.
+
+        Returns:
+        List[Dict[str, Any]]: matchCentreData per URL, in the order given.
+        """
+        return self._loop().run(self.fetch_matches(urls)) if urls else []
+
+    def close(self) -> None:
+        """
+        Close the connection pool and stop the event loop.
+        """
+        with self._lock:
+            self._closed = True
+            runner, self._runner = self._runner, None
+        if runner is not None:
+            if self._session is not None:
+                runner.run(self._session.close())
+                self._session = None
+            runner.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class RecordedPageServer:
+    """
+    Local aiohttp server serving recorded match pages, to test HttpFetcher offline.
+
+    Parameters:
+    - pages (Dict[str, str]): Page per URL path, e.g. {'/Matches/1/Live': html}, as HTML strings or paths to .html files.
+    - delay (float): Seconds to wait before answering, to mimic network latency. Defaults to 0.
+    - host (str): Interface to listen on. Defaults to 127.0.0.1.
+    - port (int): Port to listen on; 0 picks a free one. Defaults to 0.
+    """
+
+    def __init__(self, pages: Dict[str, str], delay: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        self.pages = {path: Path(page).read_text(encoding='utf-8') if isinstance(page, Path) or not page.lstrip().startswith('<')
+                      else page for path, page in pages.items()}
+        self.delay = delay
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._runner = None
+        self._app_runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        page = self.pages.get(request.path)
+        if page is None:
+            raise web.HTTPNotFound()
+        response = web.Response(text=page, content_type='text/html')
+        if 'session' not in request.cookies:
+            response.set_cookie('session', str(self.requests))
+        return response
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', self._handle)
+        self._app_runner = web.AppRunner(app, access_log=None)
+        await self._app_runner.setup()
+        site = web.TCPSite(self._app_runner, self.host, self.port)
+        await site.start()
+        self.port = self._app_runner.addresses[0][1]
+
+    def url(self, path: str) -> str:
+        """
+        Return the full URL of a recorded page.
+
+        Parameters:
+        - path (str): URL path of the page.
+
+        Returns:
+        str: The URL.
+        """
+        return f'http://{self.host}:{self.port}{path}'
+
+    def start(self) -> 'RecordedPageServer':
+        """
+        Start serving in a background thread.
+
+        Returns:
+        RecordedPageServer: The server itself.
+        """
+        self._runner = _LoopThread()
+        self._runner.run(self._start())
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving.
+        """
+        self._runner.run(self._app_runner.cleanup())
+        self._runner.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def benchmark_http(pages: List[str], delay: float = 0.2, browser_sessions: int = 4,
+                   concurrency: int = 64) -> Dict[str, float]:
+    """
+    Compare loading a batch of match pages through a browser pool with HttpFetcher, against a local server.
+
+    The browser pool uses HttpPageDriver sessions, so both sides pay the same latency per
+    page; only the number of pages in flight differs: one per browser session (each Chrome
+    session takes hundreds of MB) against `concurrency` requests on one connection pool.
+    Decoding matchCentreData costs the same after either transport and is left out.
+
+    Parameters:
+    - pages (List[str]): Recorded match pages, served as /Matches/<n>/Live.
+    - delay (float, optional): Seconds the server waits per page. Defaults to 0.2.
+    - browser_sessions (int, optional): Size of the browser pool. Defaults to 4.
+    - concurrency (int, optional): Requests in flight for HttpFetcher. Defaults to 64.
+
+    Returns:
+    Dict[str, float]: Pages per second of each transport, the speedup and whether both returned the same pages.
+    """
+    paths = {f'/Matches/{number}/Live': page for number, page in enumerate(pages, 1)}
+    with RecordedPageServer(paths, delay=delay) as server:
+        urls = [server.url(path) for path in paths]
+
+        start = time.perf_counter()
+        with BrowserPool(size=browser_sessions, driver_factory=HttpPageDriver) as pool:
+            with ThreadPoolExecutor(max_workers=browser_sessions) as executor:
+                browser = list(executor.map(pool.get_page_source, urls))
+        browser_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with HttpFetcher(concurrency=concurrency, per_host=concurrency, fallback_pool=False) as fetcher:
+            async def fetch_all():
+                return await asyncio.gather(*(fetcher.fetch_page_source(url) for url in urls))
+            fetched = fetcher._loop().run(fetch_all())
+        http_time = time.perf_counter() - start
+
+    return {
+        'pages': float(len(urls)),
+        'browser_pages_per_s': len(urls) / browser_time,
+        'http_pages_per_s': len(urls) / http_time,
+        'speedup': browser_time / http_time,
+        'same_pages': float(browser == fetched),
+    }
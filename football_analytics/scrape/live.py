@@ -0,0 +1,523 @@
+#Imports
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from football_analytics.analytics.normalize import normalize_events
+from football_analytics.analytics.pass_network import PLAYER_INFO_COLUMNS, network_frames
+from football_analytics.analytics.possession import possession_chains
+from football_analytics.scrape.browser_pool import HttpPageDriver, headless_chrome
+from football_analytics.scrape.cache import is_finished
+from football_analytics.scrape.extract import MATCH_CENTRE_KEY, extract_match_centre_data, find_json_end, loads
+
+#Functions
+
+EVENTS_KEY = b'"events":'
+# Columns kept for the possession chains of the open end of the match
+CHAIN_COLUMNS = ['id', 'match_id', 'period_display_name', 'team_id', 'player_id', 'type_display_name',
+                 'outcome_type_display_name']
+
+class TeamNetwork:
+    """
+    Running pass network of one team.
+
+    Per-player location sums and pass counts are updated with every batch of new passes,
+    and passer -> receiver counts once the receiver of a pass is known, so building the
+    network frames never goes back over the match.
+
+    Parameters:
+    - team_id (int): The team.
+    """
+
+    def __init__(self, team_id: int):
+        self.team_id = team_id
+        # player_id -> [valid x, sum of x, valid y, sum of y, completed passes, player info of the first pass]
+        self.players = {}
+        self.pairs = {}
+        self.subbed_in = set()
+        self.subbed_out = set()
+        self._frames = None
+
+    def add_passes(self, passes: pd.DataFrame) -> None:
+        """
+        Add new passes of the team to the per-player counts and locations.
+
+        Parameters:
+        - passes (pd.DataFrame): Pass events with player_id, x, y, outcome_type_display_name and the player info columns.
+        """
+        info_columns = PLAYER_INFO_COLUMNS[:4]
+        columns = [passes[column].tolist() for column in info_columns]
+        successful = (passes['outcome_type_display_name'] == 'Successful').tolist()
+        x = passes['x'].to_numpy(dtype=np.float64, na_value=np.nan).tolist()
+        y = passes['y'].to_numpy(dtype=np.float64, na_value=np.nan).tolist()
+        for row, player_id in enumerate(passes['player_id'].tolist()):
+            stats = self.players.get(player_id)
+            if stats is None:
+                stats = self.players[player_id] = [0, 0.0, 0, 0.0, 0, {c: v[row] for c, v in zip(info_columns, columns)}]
+            if not math.isnan(x[row]):
+                stats[0] += 1
+                stats[1] += x[row]
+            if not math.isnan(y[row]):
+                stats[2] += 1
+                stats[3] += y[row]
+            stats[4] += successful[row]
+        self._frames = None
+
+    def add_pairs(self, passers: np.ndarray, receivers: np.ndarray) -> None:
+        """
+        Count passes whose receiver is known.
+
+        Parameters:
+        - passers (np.ndarray): player_id of the passers.
+        - receivers (np.ndarray): player_id of the receivers.
+        """
+        for passer, receiver in zip(passers.tolist(), receivers.tolist()):
+            self.pairs[(passer, receiver)] = self.pairs.get((passer, receiver), 0) + 1
+        self._frames = None
+
+    def frames(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Build the current network.
+
+        Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: passes_between_df and average_locs_and_count_df, as in build_pass_network.
+        """
+        if self._frames is None:
+            self._frames = self._build_frames()
+        return self._frames
+
+    def _build_frames(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        players = np.array(sorted(self.players), dtype=np.int64)
+        stats = np.array([self.players[player][:5] for player in players.tolist()], dtype=np.float64).reshape(-1, 5)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            x = stats[:, 1] / stats[:, 0]
+            y = stats[:, 3] / stats[:, 2]
+
+        positions = {player: index for index, player in enumerate(players.tolist())}
+        matrix = np.zeros((len(players), len(players)), dtype=np.int64)
+        for (passer, receiver), count in self.pairs.items():
+            if receiver in positions:
+                matrix[positions[passer], positions[receiver]] = count
+
+        info = pd.DataFrame([self.players[player][5] for player in players.tolist()], columns=PLAYER_INFO_COLUMNS[:4])
+        info = info.astype({'shirt_no': 'Int64', 'position': 'category'})
+        info['subbed_in'] = np.isin(players, list(self.subbed_in))
+        info['subbed_out'] = np.isin(players, list(self.subbed_out))
+        network = {'players': players, 'attempted': stats[:, 2].astype(np.int64), 'completed': stats[:, 4].astype(np.int64),
+                   'x': x, 'y': y, 'matrix': matrix}
+        return network_frames(network, info)
+
+class LiveMatch:
+    """
+    Live tracking of one match: polls its page and only processes the events added since the last poll.
+
+    One browser session is kept for the whole match. The events array of every page is
+    compared byte for byte with the one already processed; when it only grew, just the
+    new events are decoded, normalized and appended, and the pass networks are updated
+    with them. The rest of matchCentreData (score, elapsed, player stats...) is decoded again
+    on every poll, so match_data always reflects the latest page. If earlier events were
+    corrected, the match is rebuilt from the page.
+    Possession chains are recomputed only over the open chain at the end of the match,
+    so the work per poll does not grow as the match goes on.
+
+    Parameters:
+    - url (str): The Whoscored URL of the match.
+    - driver_factory (Callable): Function returning the browser session. Defaults to headless Chrome.
+    - interval (float): Seconds between polls in run(). Defaults to 30.
+    - keep_qualifiers (bool): Keep the raw qualifiers column in the events frame. Defaults to False.
+    """
+
+    def __init__(self, url: str, driver_factory: Callable = headless_chrome, interval: float = 30,
+                 keep_qualifiers: bool = False):
+        self.url = url
+        self.driver_factory = driver_factory
+        self.interval = interval
+        self.keep_qualifiers = keep_qualifiers
+        self.match_data = None
+        self.match_id = None
+        self.polls = 0
+        self.rebuilds = 0
+        self.latencies = []
+        self._driver = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._prefix = None
+        self._chunks = []
+        self._events = None
+        self._window = None
+        self._counted = set()
+        self._networks = {}
+
+    def poll(self) -> int:
+        """
+        Load the match page once and process its new events.
+
+        Returns:
+        int: Number of new events appended to the events frame.
+        """
+        start = time.perf_counter()
+        for attempt in range(2):
+            if self._driver is None:
+                self._driver = self.driver_factory()
+            try:
+                self._driver.get(self.url)
+                page_source = self._driver.page_source
+                break
+            except Exception:
+                self._quit_driver()
+                if attempt:
+                    raise
+        fetched = time.perf_counter()
+        added = self.update(page_source)
+        self.polls += 1
+        self.latencies.append({'fetch_s': fetched - start, 'update_s': time.perf_counter() - fetched, 'new_events': added})
+        return added
+
+    def update(self, page_source) -> int:
+        """
+        Process a match page, e.g. one loaded by poll().
+
+        Parameters:
+        - page_source (str or bytes): HTML of the match page.
+
+        Returns:
+        int: Number of new events appended to the events frame.
+        """
+        buf = page_source.encode('utf-8') if isinstance(page_source, str) else page_source
+        position = buf.find(MATCH_CENTRE_KEY + b':')
+        if position == -1:
+            raise ValueError(f"{MATCH_CENTRE_KEY.decode()} not found in page")
+        start = buf.find(EVENTS_KEY, position)
+        if start == -1:
+            raise ValueError(f"{EVENTS_KEY.decode()} not found in {MATCH_CENTRE_KEY.decode()}")
+        start += len(EVENTS_KEY)
+        while buf[start] in b' \t\r\n':
+            start += 1
+
+        prefix = self._prefix
+        if prefix is not None and memoryview(buf)[start:start + len(prefix)] == prefix:
+            new_events, end = self._decode_tail(buf, start, start + len(prefix))
+            self._refresh_header(buf, position, start, end)
+            self.match_data['events'].extend(new_events)
+            return self._append(new_events)
+
+        # First page, or earlier events changed: start over from the whole page
+        if prefix is not None:
+            self.rebuilds += 1
+        self._reset()
+        self.match_data = extract_match_centre_data(buf)
+        self._prefix = bytes(buf[start:find_json_end(buf, start) - 1])
+        return self._append(self.match_data['events'])
+
+    def _decode_tail(self, buf: bytes, start: int, position: int) -> Tuple[List[Dict[str, Any]], int]:
+        # Returns the events after the known prefix and the index one past the events array
+        while buf[position] in b' \t\r\n':
+            position += 1
+        if buf[position] == ord(']'):
+            return [], position + 1
+        if buf[position] == ord(','):
+            position += 1
+        # chunk[k] is buf[position + k - 1]
+        chunk = b'[' + buf[position:]
+        end = find_json_end(chunk, 0)
+        self._prefix = bytes(buf[start:position + end - 2])
+        return loads(chunk[:end]), position + end - 1
+
+    def _refresh_header(self, buf: bytes, position: int, start: int, end: int) -> None:
+        # Decode everything of matchCentreData but the events array (score, elapsed, player stats...)
+        opening = buf.find(b'{', position)
+        # The object closes where a '{' put in front of the bytes after the events array is balanced
+        closing = end + find_json_end(b'{' + buf[end:], 0) - 1
+        header = loads(buf[opening:start] + b'[]' + buf[end:closing])
+        header.pop('events', None)
+        self.match_data.update(header)
+
+    def _append(self, events: List[Dict[str, Any]]) -> int:
+        if not any(event.get('playerId') is not None for event in events):
+            return 0
+        df_new = normalize_events({**self.match_data, 'events': events}, keep_qualifiers=self.keep_qualifiers)
+        if self.match_id is None:
+            self.match_id = int(df_new['match_id'].iloc[0])
+        df_new['match_id'] = self.match_id
+        self._chunks.append(df_new)
+        self._events = None
+        self._advance(df_new)
+        return len(df_new)
+
+    def _network(self, team_id: int) -> TeamNetwork:
+        if team_id not in self._networks:
+            self._networks[team_id] = TeamNetwork(team_id)
+        return self._networks[team_id]
+
+    def _advance(self, df_new: pd.DataFrame) -> None:
+        types = df_new['type_display_name']
+        for event_type, attribute in (('SubstitutionOn', 'subbed_in'), ('SubstitutionOff', 'subbed_out')):
+            for team_id, player_id in df_new.loc[types == event_type, ['team_id', 'player_id']].itertuples(index=False):
+                network = self._network(team_id)
+                getattr(network, attribute).add(player_id)
+                network._frames = None
+        passes = df_new[(types == 'Pass').to_numpy()]
+        for team_id, team_passes in passes.groupby('team_id', sort=False):
+            self._network(team_id).add_passes(team_passes)
+
+        # Receivers are only final once the next action of the chain (or the end of the chain) is known
+        df_new = df_new[CHAIN_COLUMNS]
+        window = df_new if self._window is None else pd.concat([self._window, df_new], ignore_index=True)
+        chains = possession_chains(window)
+        receiver = chains['receiver'].to_numpy()
+        ids = window['id'].to_numpy()
+        team_ids = window['team_id'].to_numpy()
+        ready = (window['type_display_name'] == 'Pass').to_numpy() & ~np.isnan(receiver)
+        if self._counted:
+            ready &= ~np.isin(ids, list(self._counted))
+        for team_id in np.unique(team_ids[ready]).tolist():
+            in_team = ready & (team_ids == team_id)
+            self._network(team_id).add_pairs(window['player_id'].to_numpy()[in_team], receiver[in_team].astype(np.int64))
+        self._counted.update(ids[ready].tolist())
+
+        # Keep the last chain open: its passes may still get a receiver
+        chain_ids = chains['chain_id'].to_numpy()
+        if len(chain_ids) and chain_ids[-1] >= 0:
+            window = window.iloc[int(np.argmax(chain_ids == chain_ids[-1])):].reset_index(drop=True)
+            self._counted &= set(window['id'].tolist())
+        self._window = window
+
+    @property
+    def events(self) -> pd.DataFrame:
+        """
+        pd.DataFrame: Every event received so far, as normalize_events would build it from the latest page.
+        """
+        if self._events is None:
+            self._events = pd.concat(self._chunks, ignore_index=True) if self._chunks else pd.DataFrame()
+            self._chunks = [self._events] if self._chunks else []
+        return self._events
+
+    @property
+    def finished(self) -> bool:
+        """
+        bool: Whether the latest page says the match is over.
+        """
+        return self.match_data is not None and is_finished(self.match_data)
+
+    def network(self, side: str = 'home') -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Return the current pass network of a team.
+
+        Parameters:
+        - side (str, optional): 'home' or 'away'. Defaults to home.
+
+        Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: passes_between_df and average_locs_and_count_df, as in build_pass_network.
+        """
+        return self._network(self.match_data[side]['teamId']).frames()
+
+    def run(self, callback: Optional[Callable] = None, max_polls: Optional[int] = None) -> None:
+        """
+        Poll every `interval` seconds until the match is finished.
+
+        Parameters:
+        - callback (Callable, optional): Called as callback(live_match, new_events) after every poll,
+          e.g. to redraw the pass networks.
+        - max_polls (int, optional): Stop after this many polls.
+        """
+        polls = 0
+        try:
+            while True:
+                started = time.monotonic()
+                added = self.poll()
+                if callback is not None:
+                    callback(self, added)
+                polls += 1
+                if self.finished or (max_polls is not None and polls >= max_polls):
+                    break
+                time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            self.close()
+
+    def _quit_driver(self) -> None:
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+            self._driver = None
+
+    def close(self) -> None:
+        """
+        Quit the browser session.
+        """
+        self._quit_driver()
+
+class ReplayServer:
+    """
+    Local HTTP server that replays a recorded match as a live Whoscored page.
+
+    The events are revealed in `steps` equal parts; each request (or each call to advance()
+    when `auto_advance` is False) shows one more part, and the last part marks the match as
+    finished. Use it with LiveMatch and HttpPageDriver to test live tracking offline.
+
+    Parameters:
+    - match_data (dict): matchCentreData of a finished match.
+    - steps (int): Number of polls over which the events are revealed. Defaults to 90.
+    - auto_advance (bool): Reveal the next part on every request. Defaults to True.
+    - host (str): Interface to listen on. Defaults to 127.0.0.1.
+    - port (int): Port to listen on; 0 picks a free one. Defaults to 0.
+    """
+
+    def __init__(self, match_data: Dict[str, Any], steps: int = 90, auto_advance: bool = True,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.events = [json.dumps(event, separators=(',', ':'), ensure_ascii=False) for event in match_data['events']]
+        self.minutes = [event.get('minute', 0) for event in match_data['events']]
+        template = json.dumps({**match_data, 'events': [], 'elapsed': '\x00'}, separators=(',', ':'), ensure_ascii=False)
+        self._before_events, self._after_events = template.split('"events":[]')
+        self.steps = steps
+        self.step = 0
+        self.auto_advance = auto_advance
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = server.page(server.next_step() if server.auto_advance else server.step).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        str: URL of the replayed match page.
+        """
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/Matches/1/Live'
+
+    def next_step(self) -> int:
+        with self._lock:
+            self.step = min(self.step + 1, self.steps)
+            return self.step
+
+    def advance(self) -> int:
+        """
+        Reveal the next part of the events.
+
+        Returns:
+        int: The current step.
+        """
+        return self.next_step()
+
+    def page(self, step: int) -> str:
+        """
+        Build the page shown at a step.
+
+        Parameters:
+        - step (int): Number of parts revealed, from 0 to `steps`.
+
+        Returns:
+        str: The HTML page.
+        """
+        count = math.ceil(len(self.events) * step / self.steps)
+        elapsed = 'FT' if step >= self.steps else str(self.minutes[count - 1] if count else 0)
+        data = (self._before_events.replace('\x00', elapsed).replace('\\u0000', elapsed)
+                + '"events":[' + ','.join(self.events[:count]) + ']' + self._after_events)
+        return ('<html><head><script>var x = 1;</script></head><body>\n'
+                '<script type="text/javascript">\n require.config.params["args"] = {\n matchId: 1,\n'
+                f' matchCentreData: {data},\n matchCentreEventTypeJson: {{}},\n formationIdNameMappings: {{}}\n }};\n'
+                '</script></body></html>')
+
+    def start(self) -> 'ReplayServer':
+        """
+        Start serving in a background thread.
+
+        Returns:
+        ReplayServer: The server itself.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def benchmark_live(match_data: Dict[str, Any], steps: int = 90) -> Dict[str, Any]:
+    """
+    Replay a match and compare the per-poll latency of LiveMatch with rebuilding everything on every poll.
+
+    The rebuild extracts matchCentreData from the page, normalizes all events and builds both
+    pass networks from scratch. Both sides load the page from the same local server.
+
+    Parameters:
+    - match_data (dict): matchCentreData of a finished match.
+    - steps (int, optional): Number of polls. Defaults to 90.
+
+    Returns:
+    Dict[str, Any]: Mean milliseconds per poll over the first and last 10% of the polls, excluding the page
+    download, for the live and rebuild approaches, the number of rebuilds and whether the final
+    live networks equal the networks built from scratch.
+    """
+    from football_analytics.analytics.passes import get_passes_df
+    from football_analytics.analytics.pass_network import build_pass_network
+
+    live_times, rebuild_times = [], []
+    with ReplayServer(match_data, steps, auto_advance=False) as server:
+        live = LiveMatch(server.url, driver_factory=HttpPageDriver, interval=0)
+        driver = HttpPageDriver()
+        for _ in range(steps):
+            server.advance()
+            live.poll()
+            start = time.perf_counter()
+            live_networks = (live.network('home'), live.network('away'))
+            live_times.append(live.latencies[-1]['update_s'] + time.perf_counter() - start)
+
+            driver.get(server.url)
+            start = time.perf_counter()
+            full_data = extract_match_centre_data(driver.page_source)
+            df = normalize_events(full_data)
+            rebuilt = tuple(build_pass_network(get_passes_df(df, side, full_data)) for side in ('home', 'away'))
+            rebuild_times.append(time.perf_counter() - start)
+        live.close()
+
+    def same(left, right):
+        # Position categories differ: the live frames only know the positions seen so far
+        for a, b in zip(left, right):
+            try:
+                pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True), check_categorical=False)
+            except AssertionError:
+                return False
+        return True
+
+    tenth = max(1, steps // 10)
+    return {
+        'live_first_ms': float(np.mean(live_times[:tenth])) * 1000,
+        'live_last_ms': float(np.mean(live_times[-tenth:])) * 1000,
+        'rebuild_first_ms': float(np.mean(rebuild_times[:tenth])) * 1000,
+        'rebuild_last_ms': float(np.mean(rebuild_times[-tenth:])) * 1000,
+        'rebuilds': live.rebuilds,
+        'networks_match': all(same(live_networks[k], rebuilt[k]) for k in range(2)),
+        'events_match': len(live.events) == len(df),
+    }
@@ -0,0 +1,176 @@
+#Imports
+import importlib
+
+import pandas as pd
+
+from typing import List, Optional, Dict, Any
+
+from concurrent.futures import ThreadPoolExecutor
+
+from football_analytics.analytics.dimensions import normalize_match
+from football_analytics.analytics.normalize import normalize_events
+from football_analytics.scrape.browser_pool import BrowserPool, get_default_pool
+from football_analytics.scrape.cache import MatchCache, get_match_id
+from football_analytics.scrape.extract import extract_match_centre_data
+from football_analytics.trace import span, traced
+
+#Functions
+
+def convert_to_snake_case(column_name: str) -> str:
+    """
+    Convert a column name to snake_case.
+
+    Parameters:
+    - column_name (str): The column name to be converted.
+
+    Returns:
+    str: The converted column name in snake_case.
+    """
+    result = [column_name[0].lower()]
+    for char in column_name[1:]:
+        result.extend(['_', char.lower()] if char.isupper() else [char])
+    return ''.join(result)
+
+@traced('scrape', rows=lambda result: len(result[0].get('events', ())))
+def get_matchdata_keys(url: str, pool: Optional[BrowserPool] = None,
+                       cache: Optional[MatchCache] = None) -> Dict[str, Any]:
+    """
+    Retrieve match data from a Whoscored URL.
+
+    Parameters:
+    - url (str): The Whoscored URL for the desired match.
+    - pool (BrowserPool, optional): Browser pool used to load the page. Defaults to the shared pool.
+      An HttpFetcher (scrape.http) may be passed instead to load it without a browser.
+    - cache (MatchCache, optional): On-disk cache checked before loading the page and filled afterwards.
+
+    Returns:
+    Tuple[Dict[str, Any], KeysView[str]]: A tuple containing the match data dictionary
+    and a view of its keys.
+    """
+
+    # Serve the match from the cache when possible
+    if cache is not None:
+        match_id = get_match_id(url)
+        matchdict = cache.get(match_id)
+        if matchdict is not None:
+            return matchdict, matchdict.keys()
+
+    # Borrow a browser session instead of starting a new Chrome for every match
+    pool = pool or get_default_pool()
+    page_source = pool.get_page_source(url)
+    # Locate matchCentreData in the raw page and decode only its JSON span
+    matchdict = extract_match_centre_data(page_source)
+    #Get matchdict keys
+    matchdict_keys = matchdict.keys()
+
+    if cache is not None:
+        cache.put(match_id, matchdict)
+
+    return matchdict,matchdict_keys
+
+def get_data(url: str, key: str, pool: Optional[BrowserPool] = None,
+             cache: Optional[MatchCache] = None) -> pd.DataFrame:
+    """
+    Extract and preprocess match data based on the specified key.
+
+    Parameters:
+    - url (str): The Whoscored URL for the desired match.
+    - key (str): The key specifying the type of data to extract.
+    - pool (BrowserPool, optional): Browser pool used to load the page. Defaults to the shared pool.
+    - cache (MatchCache, optional): On-disk cache of raw match data.
+
+    Returns:
+    pd.DataFrame: A DataFrame containing the extracted and processed match data.
+    """
+    match_data, match_keys = get_matchdata_keys(url, pool, cache)
+    
+    # Build the typed events table in one pass over the raw events list
+    with span('normalize') as current:
+        df = normalize_events(match_data, key)
+        current.rows = len(df)
+
+    return match_data, match_keys, df
+
+def get_match_tables(url: str, key: str = 'events', pool: Optional[BrowserPool] = None,
+                     cache: Optional[MatchCache] = None) -> tuple:
+    """
+    Extract a match as an integer-keyed events fact table plus lineup, player and team tables.
+
+    Unlike get_data, player names and lineup information are not repeated on every event;
+    join them with analytics.dimensions.attach_labels when they are needed.
+
+    Parameters:
+    - url (str): The Whoscored URL for the desired match.
+    - key (str): The key specifying the type of data to extract. Defaults to 'events'.
+    - pool (BrowserPool, optional): Browser pool used to load the page. Defaults to the shared pool.
+    - cache (MatchCache, optional): On-disk cache of raw match data.
+
+    Returns:
+    tuple: match_data, match_keys and the (events, lineups, players, teams) tables.
+    """
+    match_data, match_keys = get_matchdata_keys(url, pool, cache)
+    with span('normalize') as current:
+        tables = normalize_match(match_data, key)
+        current.rows = len(tables[0])
+    return match_data, match_keys, tables
+
+def get_data_many(urls: List[str], key: str = 'events', workers: int = 4,
+                  pool: Optional[BrowserPool] = None, cache: Optional[MatchCache] = None,
+                  fetcher=None) -> List[tuple]:
+    """
+    Fetch and preprocess several matches concurrently through a browser pool.
+
+    Parameters:
+    - urls (List[str]): Whoscored URLs for the desired matches.
+    - key (str): The key specifying the type of data to extract. Defaults to 'events'.
+    - workers (int): Number of matches fetched at the same time. Defaults to 4.
+    - pool (BrowserPool, optional): Browser pool to use. If not given, a pool with `workers`
+      sessions is created for the batch and closed afterwards.
+    - cache (MatchCache, optional): On-disk cache of raw match data.
+    - fetcher (HttpFetcher, optional): Load the pages over plain HTTP instead (scrape.http), all at once up to
+      its own concurrency limit; only pages that need JavaScript go through a browser. `workers` and
+      `pool` are then ignored.
+
+    Returns:
+    List[tuple]: One (match_data, match_keys, df) tuple per URL, in the order given.
+    """
+    if fetcher is not None:
+        return _get_data_many_http(urls, key, fetcher, cache)
+
+    own_pool = pool is None
+    pool = pool or BrowserPool(size=workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda url: get_data(url, key, pool, cache), urls))
+    finally:
+        if own_pool:
+            pool.close()
+
+def _get_data_many_http(urls: List[str], key: str, fetcher, cache: Optional[MatchCache]) -> List[tuple]:
+    matches = {}
+    if cache is not None:
+        for url in urls:
+            match_data = cache.get(get_match_id(url))
+            if match_data is not None:
+                matches[url] = match_data
+    missing = list(dict.fromkeys(url for url in urls if url not in matches))
+    for url, match_data in zip(missing, fetcher.get_matches(missing)):
+        matches[url] = match_data
+        if cache is not None:
+            cache.put(get_match_id(url), match_data)
+    results = []
+    for url in urls:
+        with span('normalize') as current:
+            df = normalize_events(matches[url], key)
+            current.rows = len(df)
+        results.append((matches[url], matches[url].keys(), df))
+    return results
+
+# The Supabase model and upload moved to storage.match_events; they are still reachable from here, imported
+# (with pydantic) on first use
+_MATCH_EVENT_NAMES = ('MatchEvent', 'MatchEventList', 'has_match_event_dtypes', 'insert_match_events')
+
+def __getattr__(name: str):
+    if name in _MATCH_EVENT_NAMES:
+        return getattr(importlib.import_module('football_analytics.storage.match_events'), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,17 @@
+# Storing normalized events: the partitioned Parquet store, the ingestion job and the Supabase upload.
+# pydantic is only imported with match_events and supabase only when ingest creates a client.
+
+#Imports
+from football_analytics._lazy import lazy_exports
+
+#Functions
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'EventStore': 'event_store',
+    'IngestManifest': 'ingest',
+    'ingest_match': 'ingest',
+    'ingest_matches': 'ingest',
+    'MatchEvent': 'match_events',
+    'PostgrestStub': 'match_events',
+    'insert_match_events': 'match_events',
+})
@@ -0,0 +1,201 @@
+#Imports
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+from urllib.parse import quote, unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+#Functions
+
+# Columns needed by get_passes_df / get_df_info and get_pass_arrows_df
+PASS_COLUMNS = ['id', 'match_id', 'team_id', 'player_id', 'player_name', 'shirt_no', 'position', 'is_first_eleven',
+                'period_display_name', 'minute', 'second', 'x', 'y', 'end_x', 'end_y',
+                'type_display_name', 'outcome_type_display_name']
+
+PARTITION_SCHEMA = pa.schema([('competition', pa.string()), ('season', pa.string()), ('match_id', pa.int64())])
+
+JSON_COLUMNS_KEY = b'event_store.json_columns'
+
+def _has_nested_dicts(values: pd.Series) -> bool:
+    """
+    Check whether an object column holds dicts (or lists of dicts) that need JSON encoding.
+    """
+    for value in values:
+        if isinstance(value, dict):
+            return True
+        if isinstance(value, list) and value:
+            return isinstance(value[0], dict)
+    return False
+
+class EventStore:
+    """
+    Local columnar store of event data, partitioned as competition/season/match_id Parquet files.
+
+    Frames from scrape.matches.get_data and StatsBomb's sb.events can both be written. Columns
+    that hold dicts (WhoScored qualifiers, StatsBomb tactics) are stored as JSON strings,
+    so reads that project other columns never touch them.
+
+    Parameters:
+    - root (str): Directory holding the store.
+    """
+
+    def __init__(self, root: str = 'event_store'):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _match_dir(self, competition: str, season: str, match_id: int) -> Path:
+        return (self.root / f"competition={quote(str(competition), safe='')}"
+                / f"season={quote(str(season), safe='')}" / f"match_id={int(match_id)}")
+
+    def write(self, df: pd.DataFrame, competition: str, season: str, match_id: Optional[int] = None) -> List[Path]:
+        """
+        Write event data into the store, replacing any previous version of the same matches.
+
+        Parameters:
+        - df (pd.DataFrame): Event data of one or several matches.
+        - competition (str): Competition name, e.g. 'Premier League'.
+        - season (str): Season name, e.g. '2023-2024'.
+        - match_id (int, optional): Match id for frames without a match_id column.
+
+        Returns:
+        List[Path]: The Parquet files written, one per match.
+        """
+        if match_id is not None:
+            df = df.assign(match_id=match_id)
+        if 'match_id' not in df.columns:
+            raise ValueError("df has no match_id column; pass match_id explicitly")
+
+        json_columns = [column for column in df.columns
+                        if df[column].dtype == object and _has_nested_dicts(df[column])]
+        files = []
+        for match, df_match in df.groupby('match_id', sort=False):
+            df_match = df_match.drop(columns='match_id')
+            for column in json_columns:
+                df_match[column] = [None if value is None else json.dumps(value) for value in df_match[column]]
+            table = pa.Table.from_pandas(df_match, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[JSON_COLUMNS_KEY] = json.dumps(json_columns).encode()
+            table = table.replace_schema_metadata(metadata)
+
+            match_dir = self._match_dir(competition, season, match)
+            tmp_dir = match_dir.with_name(f'.tmp-{uuid.uuid4().hex}-{match_dir.name}')
+            tmp_dir.mkdir(parents=True)
+            pq.write_table(table, tmp_dir / 'part-0.parquet', compression='zstd', row_group_size=50_000)
+            # Swap the whole partition so readers never see a half-written match
+            for attempt in range(3):
+                shutil.rmtree(match_dir, ignore_errors=True)
+                try:
+                    os.replace(tmp_dir, match_dir)
+                    break
+                except OSError:
+                    # Another writer swapped in the same match in between
+                    if attempt == 2:
+                        raise
+            files.append(match_dir / 'part-0.parquet')
+        return files
+
+    def _files(self, competition: Optional[str], season: Optional[str],
+               match_ids: Optional[Iterable[int]]) -> List[str]:
+        # Prune partitions by directory before opening any file
+        competition_glob = f"competition={quote(str(competition), safe='')}" if competition is not None else 'competition=*'
+        season_glob = f"season={quote(str(season), safe='')}" if season is not None else 'season=*'
+        files = sorted(self.root.glob(f"{competition_glob}/{season_glob}/match_id=*/*.parquet"))
+        if match_ids is not None:
+            wanted = {f"match_id={int(match)}" for match in match_ids}
+            files = [file for file in files if file.parent.name in wanted]
+        return [str(file) for file in files]
+
+    def dataset(self, competition: Optional[str] = None, season: Optional[str] = None,
+                match_ids: Optional[Iterable[int]] = None) -> ds.Dataset:
+        """
+        Open the selected partitions as a pyarrow dataset with a unified schema.
+
+        Parameters:
+        - competition (str, optional): Only this competition.
+        - season (str, optional): Only this season.
+        - match_ids (Iterable[int], optional): Only these matches.
+
+        Returns:
+        ds.Dataset: The dataset, with competition, season and match_id as partition columns.
+        """
+        files = self._files(competition, season, match_ids)
+        # StatsBomb matches do not all have the same columns, so unify the file schemas
+        schemas = [pq.read_schema(file) for file in files]
+        schema = pa.unify_schemas(schemas + [PARTITION_SCHEMA])
+        json_columns = sorted({column for file_schema in schemas
+                               for column in json.loads((file_schema.metadata or {}).get(JSON_COLUMNS_KEY, b'[]'))})
+        metadata = dict(schemas[0].metadata or {}) if schemas else {}
+        metadata[JSON_COLUMNS_KEY] = json.dumps(json_columns).encode()
+        schema = schema.with_metadata(metadata)
+        partitioning = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+        return ds.dataset(files, schema=schema, format='parquet', partitioning=partitioning,
+                          partition_base_dir=str(self.root))
+
+    def read(self, competition: Optional[str] = None, season: Optional[str] = None,
+             match_ids: Optional[Iterable[int]] = None, team_id: Union[int, Iterable[int], None] = None,
+             player_id: Union[int, Iterable[int], None] = None, types: Union[str, Iterable[str], None] = None,
+             columns: Optional[List[str]] = None, type_column: str = 'type_display_name',
+             decode_json: bool = True) -> pd.DataFrame:
+        """
+        Read events from the store, pushing partition and column filters down to Parquet.
+
+        Parameters:
+        - competition (str, optional): Only this competition.
+        - season (str, optional): Only this season.
+        - match_ids (Iterable[int], optional): Only these matches.
+        - team_id (int or Iterable[int], optional): Only events of these teams.
+        - player_id (int or Iterable[int], optional): Only events of these players.
+        - types (str or Iterable[str], optional): Only events of these types, e.g. 'Pass'.
+        - columns (List[str], optional): Columns to load, e.g. PASS_COLUMNS. Defaults to all.
+        - type_column (str, optional): Column holding the event type. Use 'type' for StatsBomb frames.
+        - decode_json (bool, optional): Decode JSON-stored columns back to Python objects. Defaults to True.
+
+        Returns:
+        pd.DataFrame: The selected events, in match and event order.
+        """
+        dataset = self.dataset(competition, season, match_ids)
+        expression = None
+        for column, values in (('team_id', team_id), ('player_id', player_id), (type_column, types)):
+            if values is None:
+                continue
+            values = [values] if isinstance(values, (int, str)) else list(values)
+            condition = pc.field(column).isin(values)
+            expression = condition if expression is None else expression & condition
+
+        if columns is not None:
+            columns = [column for column in columns if column in dataset.schema.names]
+        table = dataset.to_table(columns=columns, filter=expression)
+        df = table.to_pandas()
+
+        if decode_json and len(df):
+            json_columns = json.loads((dataset.schema.metadata or {}).get(JSON_COLUMNS_KEY, b'[]'))
+            for column in json_columns:
+                if column in df.columns:
+                    df[column] = [None if value is None else json.loads(value) for value in df[column]]
+        return df
+
+    def matches(self) -> pd.DataFrame:
+        """
+        List the matches held in the store.
+
+        Returns:
+        pd.DataFrame: One row per match with competition, season, match_id and file size in bytes.
+        """
+        rows = []
+        for file in self.root.glob('competition=*/season=*/match_id=*/*.parquet'):
+            match_dir = file.parent
+            rows.append({
+                'competition': unquote(match_dir.parent.parent.name.split('=', 1)[1]),
+                'season': unquote(match_dir.parent.name.split('=', 1)[1]),
+                'match_id': int(match_dir.name.split('=', 1)[1]),
+                'bytes': file.stat().st_size,
+            })
+        return pd.DataFrame(rows, columns=['competition', 'season', 'match_id', 'bytes'])
@@ -0,0 +1,271 @@
+#Imports
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from football_analytics.analytics.normalize import normalize_events
+from football_analytics.scrape.browser_pool import BrowserPool
+from football_analytics.scrape.cache import MatchCache, content_hash, get_match_id, is_finished
+from football_analytics.scrape.matches import get_matchdata_keys
+
+#Functions
+
+def read_fixtures(path: str) -> List[str]:
+    """
+    Read Whoscored match URLs from a fixture file, one URL per line.
+
+    Empty lines and lines starting with '#' are ignored.
+
+    Parameters:
+    - path (str): Path to the fixture file.
+
+    Returns:
+    List[str]: The match URLs.
+    """
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+class IngestManifest:
+    """
+    SQLite record of the matches already scraped and loaded.
+
+    Parameters:
+    - path (str): Path of the SQLite database file.
+    """
+
+    def __init__(self, path: str = 'ingest_manifest.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS matches (
+                whoscored_id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                match_id INTEGER,
+                scraped_at REAL,
+                event_count INTEGER,
+                content_hash TEXT,
+                finished INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                error TEXT
+            )""")
+        self._conn.commit()
+
+    def get(self, whoscored_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Return the manifest row of a match, or None if it was never seen.
+
+        Parameters:
+        - whoscored_id (int): The Whoscored match id.
+
+        Returns:
+        Optional[Dict[str, Any]]: The manifest row.
+        """
+        with self._lock:
+            cursor = self._conn.execute('SELECT * FROM matches WHERE whoscored_id = ?', (whoscored_id,))
+            row = cursor.fetchone()
+            names = [column[0] for column in cursor.description]
+        return dict(zip(names, row)) if row else None
+
+    def needs_fetch(self, url: str) -> bool:
+        """
+        Check whether a match has to be scraped: it is new, failed, was interrupted or was not finished.
+
+        Parameters:
+        - url (str): The Whoscored URL for the match.
+
+        Returns:
+        bool: True if the match must be fetched.
+        """
+        row = self.get(get_match_id(url))
+        return row is None or row['status'] != 'loaded' or not row['finished']
+
+    def record(self, url: str, status: str, match_id: Optional[int] = None, event_count: Optional[int] = None,
+               digest: Optional[str] = None, finished: bool = False, error: Optional[str] = None) -> None:
+        """
+        Insert or update the manifest row of a match. Every call is committed immediately,
+        so an interrupted run can resume where it stopped.
+
+        Parameters:
+        - url (str): The Whoscored URL for the match.
+        - status (str): 'fetched', 'loaded' or 'failed'.
+        - match_id (int, optional): match_id of the events table.
+        - event_count (int, optional): Number of events loaded.
+        - digest (str, optional): Content hash of the events.
+        - finished (bool, optional): Whether the match is over.
+        - error (str, optional): Error message for failed matches.
+        """
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO matches (whoscored_id, url, match_id, scraped_at, event_count, content_hash, finished, status, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(whoscored_id) DO UPDATE SET
+                    url = excluded.url,
+                    match_id = COALESCE(excluded.match_id, match_id),
+                    scraped_at = excluded.scraped_at,
+                    event_count = COALESCE(excluded.event_count, event_count),
+                    content_hash = COALESCE(excluded.content_hash, content_hash),
+                    finished = excluded.finished,
+                    status = excluded.status,
+                    error = excluded.error""",
+                (get_match_id(url), url, match_id, time.time(), event_count, digest, int(finished), status, error))
+            self._conn.commit()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the whole manifest as a DataFrame.
+
+        Returns:
+        pd.DataFrame: One row per match.
+        """
+        with self._lock:
+            return pd.read_sql_query('SELECT * FROM matches ORDER BY whoscored_id', self._conn)
+
+    def close(self) -> None:
+        self._conn.close()
+
+def ingest_match(url: str, manifest: IngestManifest, pool: Optional[BrowserPool] = None,
+                 cache: Optional[MatchCache] = None, supabase=None, table_name: Optional[str] = None,
+                 store=None, competition: Optional[str] = None, season: Optional[str] = None,
+                 render_cache=None) -> str:
+    """
+    Scrape one match and load it into the configured sinks if its events changed.
+
+    Parameters:
+    - url (str): The Whoscored URL for the match.
+    - manifest (IngestManifest): Manifest of loaded matches.
+    - pool (BrowserPool, optional): Browser pool used to load the page.
+    - cache (MatchCache, optional): On-disk cache of raw match data.
+    - supabase (optional): Supabase client; events are upserted into `table_name` when given.
+    - table_name (str, optional): Supabase table name.
+    - store (EventStore, optional): Local event store; events are written under competition/season when given.
+    - competition (str, optional): Competition name used by the event store; required with `store`.
+    - season (str, optional): Season name used by the event store; required with `store`.
+    - render_cache (RenderCache, optional): Cache of rendered plots; the images of the match are dropped when its events change.
+
+    Returns:
+    str: The status recorded in the manifest, or 'invalid' (not recorded) for a URL without a match id.
+    """
+    if store is not None and (competition is None or season is None):
+        raise ValueError('competition and season are required to write to the event store')
+    try:
+        get_match_id(url)
+    except ValueError:
+        # The manifest is keyed by match id, so there is nothing to record
+        return 'invalid'
+    try:
+        match_data, _ = get_matchdata_keys(url, pool, cache)
+        digest = content_hash(match_data)
+        finished = is_finished(match_data)
+        previous = manifest.get(get_match_id(url))
+        if previous is not None and previous['status'] == 'loaded' and previous['content_hash'] == digest:
+            manifest.record(url, 'loaded', digest=digest, finished=finished)
+            return 'unchanged'
+
+        df = normalize_events(match_data)
+        match_id = int(df['match_id'].iloc[0]) if len(df) else None
+        manifest.record(url, 'fetched', match_id=match_id, event_count=len(df), finished=finished)
+
+        if store is not None:
+            store.write(df, competition, season)
+        if supabase is not None:
+            from football_analytics.storage.match_events import insert_match_events
+            result = insert_match_events(df, supabase, table_name)
+            if result['failed_chunks']:
+                raise RuntimeError(f"{len(result['failed_chunks'])} of {result['chunks']} chunks not upserted: "
+                                   f"{next(iter(result['errors'].values()))}")
+        if render_cache is not None and match_id is not None:
+            render_cache.invalidate(match_id)
+
+        manifest.record(url, 'loaded', match_id=match_id, event_count=len(df), digest=digest, finished=finished)
+        return 'loaded'
+    except Exception as error:
+        manifest.record(url, 'failed', error=repr(error))
+        return 'failed'
+
+def ingest_matches(urls: List[str], manifest: IngestManifest, workers: int = 4,
+                   pool: Optional[BrowserPool] = None, **sinks) -> pd.DataFrame:
+    """
+    Incrementally ingest a list of matches, skipping the ones already loaded and finished.
+
+    Parameters:
+    - urls (List[str]): Whoscored URLs for the matches, e.g. a full season of fixtures.
+    - manifest (IngestManifest): Manifest of loaded matches.
+    - workers (int, optional): Number of matches processed at the same time. Defaults to 4.
+    - pool (BrowserPool, optional): Browser pool to use. If not given, one with `workers` sessions is created.
+    - **sinks: cache, supabase, table_name, store, competition, season and render_cache, passed to ingest_match.
+
+    Returns:
+    pd.DataFrame: One row per URL with its status ('skipped', 'loaded', 'unchanged', 'failed' or 'invalid'
+    for URLs without a /Matches/<id> part, which are left out of the manifest).
+    """
+    statuses = {}
+    todo = []
+    for url in urls:
+        try:
+            get_match_id(url)
+        except ValueError:
+            statuses[url] = 'invalid'
+            continue
+        statuses[url] = 'skipped'
+        if manifest.needs_fetch(url):
+            todo.append(url)
+
+    own_pool = pool is None
+    pool = pool or BrowserPool(size=workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for url, status in zip(todo, executor.map(lambda url: ingest_match(url, manifest, pool, **sinks), todo)):
+                statuses[url] = status
+    finally:
+        if own_pool:
+            pool.close()
+
+    return pd.DataFrame({'url': list(statuses), 'status': list(statuses.values())})
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command line entry point: python -m football_analytics.storage.ingest --fixtures urls.txt --store event_store ...
+    """
+    parser = argparse.ArgumentParser(description='Incrementally ingest Whoscored matches.')
+    parser.add_argument('urls', nargs='*', help='Whoscored match URLs')
+    parser.add_argument('--fixtures', help='File with one match URL per line')
+    parser.add_argument('--manifest', default='ingest_manifest.db', help='SQLite manifest path')
+    parser.add_argument('--cache', help='Directory of the raw matchCentreData cache')
+    parser.add_argument('--store', help='Root directory of the Parquet event store')
+    parser.add_argument('--competition', help='Competition name for the event store')
+    parser.add_argument('--season', help='Season name for the event store')
+    parser.add_argument('--table', help='Supabase table; needs SUPABASE_URL and SUPABASE_KEY in the environment')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    if args.store and (args.competition is None or args.season is None):
+        parser.error('--store requires --competition and --season')
+
+    urls = list(args.urls)
+    if args.fixtures:
+        urls += read_fixtures(args.fixtures)
+
+    sinks = {}
+    if args.cache:
+        sinks['cache'] = MatchCache(args.cache)
+    if args.store:
+        from football_analytics.storage.event_store import EventStore
+        sinks.update(store=EventStore(args.store), competition=args.competition, season=args.season)
+    if args.table:
+        from supabase import create_client
+        sinks.update(supabase=create_client(os.environ['SUPABASE_URL'], os.environ['SUPABASE_KEY']), table_name=args.table)
+
+    manifest = IngestManifest(args.manifest)
+    result = ingest_matches(urls, manifest, workers=args.workers, **sinks)
+    print(result['status'].value_counts().to_string())
+    manifest.close()
+
+if __name__ == '__main__':
+    main()
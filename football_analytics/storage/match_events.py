@@ -0,0 +1,304 @@
+#Imports
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from pydantic import BaseModel, TypeAdapter
+
+from football_analytics.trace import traced
+
+#Functions
+
+class MatchEvent(BaseModel):
+    """
+    Pydantic model representing a match event.
+    Adjust attributes based on the structure of your data.
+    """
+    id: int
+    event_id: int
+    minute: int
+    second: Optional[float] = None
+    team_id: int
+    player_id: int
+    x: float
+    y: float
+    end_x: Optional[float] = None
+    end_y: Optional[float] = None
+    qualifiers: List[dict]
+    is_touch: bool
+    blocked_x: Optional[float] = None
+    blocked_y: Optional[float] = None
+    goal_mouth_z: Optional[float] = None
+    goal_mouth_y: Optional[float] = None
+    is_shot: bool
+    card_type: bool
+    is_goal: bool
+    type_display_name: str
+    outcome_type_display_name: str
+    period_display_name: str
+    match_id: int
+    player_name: str
+    shirt_no: int
+    is_first_eleven: bool
+    position: str
+
+MatchEventList = TypeAdapter(List[MatchEvent])
+
+def has_match_event_dtypes(df: pd.DataFrame) -> bool:
+    """
+    Check whether a DataFrame already has the column dtypes of the MatchEvent model.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame containing match events data.
+
+    Returns:
+    bool: True when every MatchEvent field is present with a compatible dtype.
+    """
+    for name, field in MatchEvent.model_fields.items():
+        if name not in df.columns:
+            return False
+        dtype = df[name].dtype
+        annotation = field.annotation
+        if annotation is int and not pd.api.types.is_integer_dtype(dtype):
+            return False
+        if annotation in (float, Optional[float]) and not pd.api.types.is_numeric_dtype(dtype):
+            return False
+        if annotation is bool and not pd.api.types.is_bool_dtype(dtype):
+            return False
+        if annotation is str and not (pd.api.types.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)):
+            return False
+        # Nullable columns that feed non-optional fields still need validation
+        if field.is_required() and df[name].isna().any():
+            return False
+    return True
+
+@traced('store', rows=lambda result: result['rows'])
+def insert_match_events(df, supabase, table_name, chunk_size: int = 500, max_in_flight: int = 4,
+                        retries: int = 3, backoff: float = 0.5, validate: Any = 'auto') -> Dict[str, Any]:
+    """
+    Insert match events data into a Supabase table.
+
+    Rows are validated in one TypeAdapter call, split into chunks and upserted with a bounded
+    number of requests in flight. Failed chunks are retried with exponential backoff; a chunk
+    that still fails is reported in the result and the other chunks are still sent, so a
+    failure never leaves it unclear which rows were written. Use PostgrestStub to test it offline.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame containing match events data.
+    - supabase: Supabase client instance.
+    - table_name (str): Name of the Supabase table to insert data into.
+    - chunk_size (int, optional): Rows per upsert request. Defaults to 500.
+    - max_in_flight (int, optional): Maximum number of concurrent upsert requests. Defaults to 4.
+    - retries (int, optional): Retries per chunk before giving up. Defaults to 3.
+    - backoff (float, optional): Seconds to wait before the first retry; doubled on each retry. Defaults to 0.5.
+    - validate (bool or 'auto', optional): Validate rows against MatchEvent. With 'auto', frames that already
+      have the right dtypes are sent without validation. Defaults to 'auto'.
+
+    Returns:
+    Dict[str, Any]: Number of rows and chunks sent, rows written, the numbers of the chunks that failed
+    (chunk n holds rows n * chunk_size onwards) with their last error, elapsed seconds and rows per second.
+    """
+    start = time.perf_counter()
+
+    # Missing values (NaN / pd.NA) are sent as null
+    records = df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+    if validate == 'auto':
+        validate = not has_match_event_dtypes(df)
+    if validate:
+        # Validate the whole list at once instead of building one model per row
+        events = MatchEventList.dump_python(MatchEventList.validate_python(records))
+    else:
+        fields = list(MatchEvent.model_fields)
+        events = [{name: record[name] for name in fields} for record in records]
+
+    chunks = [events[i:i + chunk_size] for i in range(0, len(events), chunk_size)]
+
+    def upsert_chunk(chunk):
+        for attempt in range(retries + 1):
+            try:
+                # Perform an upsert operation to insert or update records in the Supabase table
+                supabase.table(table_name).upsert(chunk).execute()
+                return None
+            except Exception as error:
+                if attempt == retries:
+                    return f'{type(error).__name__}: {error}'
+                time.sleep(backoff * 2 ** attempt)
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        errors = list(executor.map(upsert_chunk, chunks))
+    failed = {number: error for number, error in enumerate(errors) if error is not None}
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': len(events),
+        'chunks': len(chunks),
+        'rows_written': len(events) - sum(len(chunks[number]) for number in failed),
+        'failed_chunks': list(failed),
+        'errors': failed,
+        'seconds': elapsed,
+        'rows_per_second': len(events) / elapsed if elapsed else float('inf'),
+    }
+
+class _StubTable:
+    # The table(...).upsert(...).execute() chain of the Supabase client, over urllib
+
+    def __init__(self, url: str, table_name: str):
+        self.url = f'{url}/rest/v1/{table_name}'
+        self.rows = []
+
+    def upsert(self, rows: List[Dict[str, Any]]) -> '_StubTable':
+        self.rows = rows
+        return self
+
+    def execute(self) -> List[Dict[str, Any]]:
+        request = urllib.request.Request(self.url, data=json.dumps(self.rows).encode('utf-8'), method='POST',
+                                         headers={'Content-Type': 'application/json',
+                                                  'Prefer': 'resolution=merge-duplicates,return=representation'})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+class _StubClient:
+    def __init__(self, url: str):
+        self.url = url
+
+    def table(self, table_name: str) -> _StubTable:
+        return _StubTable(self.url, table_name)
+
+class PostgrestStub:
+    """
+    Local PostgREST-style server standing in for Supabase, to test insert_match_events offline.
+
+    POST /rest/v1/<table> upserts the JSON list of rows on `key` and answers 201 with the rows,
+    as Supabase does for upsert(). Failures are injected per row: a request holding a row of
+    `failures` is answered with `status` until that row has failed the given number of times,
+    so single chunks can be made to fail once (retried) or always (reported as failed).
+    Pass stub.client() as the `supabase` argument, or create_client(stub.url, stub.api_key).
+
+    Parameters:
+    - failures (Dict[Any, int], optional): Number of failed answers per row key, e.g. {row_id: 1}.
+    - status (int): HTTP status of the injected failures. Defaults to 503.
+    - delay (float): Seconds to wait before answering, to mimic network latency. Defaults to 0.
+    - key (str): Column the rows are upserted on. Defaults to 'id'.
+    - host (str): Interface to listen on. Defaults to 127.0.0.1.
+    - port (int): Port to listen on; 0 picks a free one. Defaults to 0.
+    """
+
+    api_key = 'stub.stub.stub'
+
+    def __init__(self, failures: Optional[Dict[Any, int]] = None, status: int = 503, delay: float = 0.0,
+                 key: str = 'id', host: str = '127.0.0.1', port: int = 0):
+        self.failures = dict(failures or {})
+        self.status = status
+        self.delay = delay
+        self.key = key
+        self.tables = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if server.delay:
+                    time.sleep(server.delay)
+                table_name = self.path.split('?')[0].rstrip('/').rsplit('/', 1)[-1]
+                rows = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                status, body = server.upsert(table_name, rows if isinstance(rows, list) else [rows])
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        str: Base URL of the stub, as passed to create_client.
+        """
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def upsert(self, table_name: str, rows: List[Dict[str, Any]]) -> tuple:
+        """
+        Apply one upsert request, or fail it when it holds a row of `failures`.
+
+        Parameters:
+        - table_name (str): Table name.
+        - rows (List[dict]): Rows of the request.
+
+        Returns:
+        tuple: HTTP status and JSON body of the answer.
+        """
+        with self._lock:
+            failing = [row.get(self.key) for row in rows if self.failures.get(row.get(self.key), 0) > 0]
+            for key in failing:
+                self.failures[key] -= 1
+            status = self.status if failing else 201
+            self.requests.append({'table': table_name, 'rows': len(rows), 'first': rows[0].get(self.key) if rows else None,
+                                  'status': status})
+            if failing:
+                return status, {'code': 'stub', 'message': f'Injected failure for {self.key}={failing[0]}',
+                                'details': None, 'hint': None}
+            table = self.tables.setdefault(table_name, {})
+            for row in rows:
+                table[row.get(self.key)] = {**table.get(row.get(self.key), {}), **row}
+            return 201, rows
+
+    def rows(self, table_name: str) -> List[Dict[str, Any]]:
+        """
+        Return the rows stored in a table.
+
+        Parameters:
+        - table_name (str): Table name.
+
+        Returns:
+        List[dict]: One dict per stored row.
+        """
+        with self._lock:
+            return list(self.tables.get(table_name, {}).values())
+
+    def client(self) -> _StubClient:
+        """
+        Return a minimal client with the table().upsert().execute() calls of the Supabase client, without supabase installed.
+
+        Returns:
+        A client for insert_match_events.
+        """
+        return _StubClient(self.url)
+
+    def start(self) -> 'PostgrestStub':
+        """
+        Start serving in a background thread.
+
+        Returns:
+        PostgrestStub: The server itself.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
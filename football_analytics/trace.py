@@ -0,0 +1,379 @@
+#Imports
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+# resource is POSIX-only; without it (Windows) the RSS fields of the spans are NaN
+try:
+    import resource
+except ImportError:
+    resource = None
+
+#Functions
+
+SPAN_FIELDS = ['stage', 'parent', 'depth', 'thread', 'start', 'wall_s', 'cpu_s', 'rows', 'max_rss_mb',
+               'rss_growth_mb', 'tracemalloc_peak_mb', 'error', 'profile', 'attrs']
+
+_active = None
+
+def _max_rss_mb() -> float:
+    if resource is None:
+        return float('nan')
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+class Span:
+    """
+    One timed stage. Yielded by span(); set `rows` (or add to `attrs`) inside the block.
+    """
+
+    __slots__ = ('stage', 'rows', 'attrs', '_children_peak')
+
+    def __init__(self, stage: str, rows: Optional[int] = None, attrs: Optional[Dict[str, Any]] = None):
+        self.stage = stage
+        self.rows = rows
+        self.attrs = attrs or {}
+        self._children_peak = 0
+
+class Tracer:
+    """
+    Collects timing and memory spans of the pipeline stages: scrape, normalize, store, analyze and render.
+
+    Only active between __enter__ and __exit__ (or activate() and deactivate()); when no
+    tracer is active, span() and traced() add no more than a function call.
+
+    Every span records wall and CPU time, the process peak RSS when it ended and how much
+    the span raised it, the rows it handled and, with memory='tracemalloc', the peak of
+    Python allocations during the span. A CPU time well below the wall time points at
+    waiting (browser, network, database); close to it, at pandas or matplotlib work.
+
+    Parameters:
+    - path (str or Path, optional): JSON lines file every finished span is appended to.
+    - memory (str, optional): 'tracemalloc' to also trace Python allocations (slows the traced code down
+      noticeably). Defaults to None.
+    - profile (str, optional): Stage to run under cProfile, e.g. 'render'. Defaults to None.
+    - profile_dir (str or Path, optional): Directory the .prof file of every profiled span is written to.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, memory: Optional[str] = None,
+                 profile: Optional[str] = None, profile_dir: Optional[Union[str, Path]] = None):
+        if memory not in (None, 'tracemalloc'):
+            raise ValueError("memory must be None or 'tracemalloc'")
+        self.path = Path(path) if path is not None else None
+        self.memory = memory
+        self.profile = profile
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+        self.spans = []
+        self.profiles = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+        self._previous = None
+
+    def activate(self) -> 'Tracer':
+        """
+        Make this the tracer that span() and traced() report to.
+
+        Returns:
+        Tracer: The tracer itself.
+        """
+        global _active
+        if self.memory == 'tracemalloc' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._previous, _active = _active, self
+        return self
+
+    def deactivate(self) -> None:
+        """
+        Stop collecting spans, restoring the previously active tracer.
+        """
+        global _active
+        _active, self._previous = self._previous, None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, *exc):
+        self.deactivate()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, stage: str, rows: Optional[int] = None, **attrs) -> Iterator[Span]:
+        """
+        Time a block of code as one stage.
+
+        Parameters:
+        - stage (str): Stage name, e.g. 'scrape' or 'analyze.pass_network'.
+        - rows (int, optional): Rows handled by the stage; may also be set on the yielded Span.
+        - **attrs: Extra fields stored with the span, e.g. url=... .
+
+        Yields:
+        Span: The open span.
+        """
+        current = Span(stage, rows, attrs)
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        stack.append(current)
+
+        tracing = self.memory == 'tracemalloc' and tracemalloc.is_tracing()
+        if tracing:
+            traced_start, peak_before = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        profiler = None
+        if stage == self.profile and not getattr(self._local, 'profiling', False):
+            profiler = cProfile.Profile()
+            self._local.profiling = True
+
+        error = None
+        rss_start = _max_rss_mb()
+        start = time.time()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield current
+        except BaseException as exc:
+            error = f'{type(exc).__name__}: {exc}'
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._local.profiling = False
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            max_rss = _max_rss_mb()
+            peak_mb = None
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], current._children_peak)
+                peak_mb = (peak - traced_start) / 1e6
+                if parent is not None:
+                    parent._children_peak = max(parent._children_peak, peak_before, peak)
+            stack.pop()
+
+            record = {
+                'stage': stage,
+                'parent': parent.stage if parent is not None else None,
+                'depth': len(stack),
+                'thread': threading.current_thread().name,
+                'start': start,
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'rows': current.rows,
+                'max_rss_mb': max_rss,
+                'rss_growth_mb': max_rss - rss_start,
+                'tracemalloc_peak_mb': peak_mb,
+                'error': error,
+                'profile': None,
+                'attrs': current.attrs,
+            }
+            if profiler is not None:
+                record['profile'] = self._save_profile(profiler, stage)
+            self._add(record)
+
+    def _save_profile(self, profiler: cProfile.Profile, stage: str) -> Optional[str]:
+        with self._lock:
+            self.profiles.append(profiler)
+            number = len(self.profiles)
+        if self.profile_dir is None:
+            return None
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profile_dir / f'{stage}-{number}.prof'
+        profiler.dump_stats(str(path))
+        return str(path)
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.spans.append(record)
+            if self.path is not None:
+                with open(self.path, 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(record, default=str) + '\n')
+
+    def write_jsonl(self, path: Union[str, Path]) -> None:
+        """
+        Write every span collected so far as JSON lines.
+
+        Parameters:
+        - path (str or Path): Output file, overwritten.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            for record in self.spans:
+                file.write(json.dumps(record, default=str) + '\n')
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Aggregate the spans per stage (see summarize).
+
+        Returns:
+        pd.DataFrame: One row per stage.
+        """
+        return summarize(self.spans)
+
+    def profile_stats(self, limit: int = 25, sort: str = 'cumulative') -> str:
+        """
+        Report the combined cProfile statistics of every profiled span.
+
+        Parameters:
+        - limit (int, optional): Number of functions listed. Defaults to 25.
+        - sort (str, optional): pstats sort key. Defaults to 'cumulative'.
+
+        Returns:
+        str: The pstats report, empty if nothing was profiled.
+        """
+        if not self.profiles:
+            return ''
+        output = io.StringIO()
+        stats = pstats.Stats(self.profiles[0], stream=output)
+        for profiler in self.profiles[1:]:
+            stats.add(profiler)
+        stats.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+@contextmanager
+def _no_span() -> Iterator[Span]:
+    yield Span('')
+
+def span(stage: str, rows: Optional[int] = None, **attrs):
+    """
+    Time a block as one stage of the active tracer; does nothing when no tracer is active.
+
+    Parameters:
+    - stage (str): Stage name.
+    - rows (int, optional): Rows handled by the stage; may also be set on the yielded Span.
+    - **attrs: Extra fields stored with the span.
+
+    Returns:
+    A context manager yielding the Span.
+    """
+    tracer = _active
+    if tracer is None:
+        return _no_span()
+    return tracer.span(stage, rows, **attrs)
+
+def traced(stage: str, rows: Optional[Callable[[Any], int]] = None) -> Callable:
+    """
+    Decorator timing every call of a function as one stage of the active tracer.
+
+    Parameters:
+    - stage (str): Stage name.
+    - rows (Callable, optional): Function of the return value giving the rows handled, e.g. len.
+
+    Returns:
+    Callable: The decorator.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = _active
+            if tracer is None:
+                return function(*args, **kwargs)
+            with tracer.span(stage) as current:
+                result = function(*args, **kwargs)
+                if rows is not None:
+                    current.rows = rows(result)
+                return result
+        return wrapper
+    return decorator
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Return the active tracer.
+
+    Returns:
+    Tracer or None: The tracer spans are reported to, if any.
+    """
+    return _active
+
+def read_spans(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Read spans written by a Tracer.
+
+    Parameters:
+    - path (str or Path): JSON lines file.
+
+    Returns:
+    List[Dict[str, Any]]: One dict per span.
+    """
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def summarize(spans: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Aggregate spans per stage.
+
+    Parameters:
+    - spans (List[dict]): Span records, from Tracer.spans or read_spans.
+
+    Returns:
+    pd.DataFrame: Per stage, sorted by total wall time: calls, total and mean wall seconds, total CPU seconds,
+    the share of wall time spent on the CPU, rows, rows per second, the highest peak RSS and RSS growth,
+    the highest tracemalloc peak and the number of failed calls.
+    """
+    columns = ['stage', 'calls', 'wall_s', 'mean_ms', 'cpu_s', 'cpu_share', 'rows', 'rows_per_s',
+               'max_rss_mb', 'rss_growth_mb', 'tracemalloc_peak_mb', 'errors']
+    if not spans:
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame(spans, columns=SPAN_FIELDS)
+    df['failed'] = df['error'].notna()
+    summary = df.groupby('stage', sort=False).agg(
+        calls=('wall_s', 'size'), wall_s=('wall_s', 'sum'), cpu_s=('cpu_s', 'sum'),
+        rows=('rows', lambda rows: rows.sum(min_count=1)), max_rss_mb=('max_rss_mb', 'max'),
+        rss_growth_mb=('rss_growth_mb', 'max'), tracemalloc_peak_mb=('tracemalloc_peak_mb', 'max'),
+        errors=('failed', 'sum'),
+    ).reset_index()
+    summary['mean_ms'] = summary['wall_s'] / summary['calls'] * 1000
+    summary['cpu_share'] = summary['cpu_s'] / summary['wall_s']
+    summary['rows_per_s'] = summary['rows'] / summary['wall_s']
+    return summary[columns].sort_values('wall_s', ascending=False, kind='stable').reset_index(drop=True)
+
+def benchmark_trace(repeat: int = 10000) -> Dict[str, float]:
+    """
+    Measure the cost of a traced call with and without an active tracer.
+
+    Parameters:
+    - repeat (int, optional): Number of calls. Defaults to 10000.
+
+    Returns:
+    Dict[str, float]: Microseconds per call of a plain, an inactive and an active traced function.
+    """
+    def plain():
+        return None
+
+    wrapped = traced('benchmark')(plain)
+
+    def per_call(function):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        return (time.perf_counter() - start) / repeat * 1e6
+
+    global _active
+    previous, _active = _active, None
+    try:
+        results = {'plain_us': per_call(plain), 'inactive_us': per_call(wrapped)}
+        with Tracer():
+            results['active_us'] = per_call(wrapped)
+    finally:
+        _active = previous
+    return results
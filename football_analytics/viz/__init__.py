@@ -0,0 +1,16 @@
+# Plots of the analytics tables. matplotlib and mplsoccer are imported when the first figure is drawn.
+
+#Imports
+from football_analytics._lazy import lazy_exports
+
+#Functions
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'plot_arrows': 'pass_arrows',
+    'render_arrows': 'pass_arrows',
+    'plot_pitch': 'pass_matrix',
+    'render_pitches': 'pass_matrix',
+    'render_many': 'render',
+    'use_headless': 'render',
+    'RenderCache': 'render_cache',
+})
@@ -0,0 +1,126 @@
+import numpy as np
+
+from football_analytics.analytics.dimensions import ensure_labels
+from football_analytics.analytics.passes import get_pass_arrows_df
+from football_analytics.analytics.player_search import PlayerIndex
+from football_analytics.trace import span, traced
+from football_analytics.viz.render import finish_figure, get_template, render_many, restore_axes, snapshot_axes
+
+# Home: home team passes
+# Away: away team passes
+# Player name: player passes
+
+def pass_arrows_template():
+    """
+    Builds the parts of the pass arrows figure that do not depend on the match.
+
+    Returns:
+    Tuple[Figure, dict, Pitch]: The figure, its axes and the pitch drawn on them.
+    """
+    import matplotlib.pyplot as plt
+    from mplsoccer import Pitch
+
+    pitch = Pitch(pitch_type="opta")
+    fig, axs = pitch.grid(nrows=1, ncols=1, figheight=8, grid_width=0.9, endnote_space=0.05, axis=False, title_space=0.01)
+    plt.tight_layout()
+    main_color='#050732'
+
+    axs['title'].text(0.5, 0.35, "Passes attempted by", ha='center', va='center', color=main_color, fontsize=12)
+    axs['endnote'].text(1, 1, '@Joel_AS', va='center', ha='right', color=main_color, fontsize=12)
+
+    legend_labels = ['Successful', 'Unsuccessful', 'Progressive pass', 'Key pass', 'Assist']
+    legend_colors = ["#0793BC","#848585","#0CD127", "#DBE110", "#F52825"]
+    legend_elements = [plt.Line2D([0], [0], marker='>', color='w', label=label, markerfacecolor=color, markersize=14)
+                       for label, color in zip(legend_labels, legend_colors)]
+    axs['pitch'].legend(handles=legend_elements, loc="best", fontsize = "small")
+
+    return fig, axs, pitch
+
+@traced('render')
+def plot_arrows(df, match_data, player="home", output=None, format=None, index=None):
+    """
+    Plots pass arrows on the pitch.
+
+    Parameters:
+    df (DataFrame): DataFrame containing event data, with or without the player labels (see analytics.dimensions.normalize_match).
+    match_data (dict): Dictionary containing match data including team information.
+    player (str, optional): Specifies the player or team for which pass arrows are plotted.
+        If "home" or "away", pass arrows for the corresponding team will be plotted.
+        If a player name is provided, pass arrows for the best match of the name will be plotted.
+        A player_id can be given instead of a name.
+    output (str or file-like, optional): Path or buffer to save the figure to instead of showing it. The pitch background is
+        then drawn once and reused between calls, so calls must not run in parallel threads. Defaults to None.
+    format (str, optional): 'png', 'svg' or 'pdf' when saving. Defaults to the extension of `output`.
+    index (PlayerIndex, optional): Player search index to resolve the name with, e.g. one built once per season
+        with PlayerIndex.from_store. Defaults to an index of the players in `df`.
+
+    Returns:
+    The `output` argument.
+    """
+    
+    df = ensure_labels(df, match_data)
+    if output is None:
+        fig, axs, pitch = pass_arrows_template()
+        snapshot = None
+    else:
+        fig, axs, pitch = get_template(('pass_arrows',), pass_arrows_template)
+        snapshot = snapshot_axes(fig)
+
+    try:
+        date = match_data['timeStamp'][0:10]
+        main_color='#050732'
+
+        axs['title'].text(0.5, 0.8, f"{match_data['home']['name']} vs {match_data['away']['name']}", ha='center', va='center', color=main_color, fontsize=22)
+        axs['title'].text(0.5, 0.55, f"{date}", ha='center', va='center', color=main_color, fontsize=12)
+
+        if (player == "home") | (player == "away"):
+            team_id = match_data[player]['teamId']
+
+            df_arrows = get_pass_arrows_df(df)
+            df_arrows = df_arrows[df_arrows.team_id == team_id]
+
+            pass_completed = df_arrows[df_arrows["outcome_type_display_name"] == "Successful"].shape[0]
+            pass_att = df_arrows.shape[0]
+            player_name = match_data[player]['name']
+        
+
+            axs['pitch'].set_title(f"{player_name}: {pass_completed}/{pass_att} ({pass_completed/pass_att:.2%}) passes completed ", color=main_color, fontsize=20)
+    
+        else:
+        
+            df_arrows = get_pass_arrows_df(df)
+            if isinstance(player, (int, np.integer)):
+                player_id = int(player)
+            else:
+                player_id = (index or PlayerIndex.from_events(df_arrows)).resolve(player)
+            df_arrows = df_arrows[df_arrows["player_id"].to_numpy() == player_id]
+
+            pass_completed = df_arrows[df_arrows["outcome_type_display_name"] == "Successful"].shape[0]
+            pass_att = df_arrows.shape[0]
+            player_name = df_arrows.player_name.iloc[0]
+
+            axs['pitch'].set_title(f"{player_name}: {pass_completed}/{pass_att} ({pass_completed/pass_att:.2%}) passes completed ", color=main_color, fontsize=20)
+
+        pitch.arrows(df_arrows.x, df_arrows.y,df_arrows.end_x,df_arrows.end_y,ax=axs['pitch'], color=df_arrows.color, alpha=0.8, width=1.5)
+    except Exception:
+        # Leave the cached template as it was, or the next render draws over these artists
+        if snapshot is not None:
+            restore_axes(fig, snapshot)
+        raise
+
+    with span('render.draw'):
+        return finish_figure(fig, output, format, snapshot)
+
+def render_arrows(jobs, workers=None):
+    """
+    Renders many pass arrows figures headlessly across a process pool.
+
+    Parameters:
+    jobs (list of dict): plot_arrows keyword arguments per figure (df, match_data, player, output, format).
+        Jobs without `output` return PNG bytes.
+    workers (int, optional): Number of processes. Defaults to the number of CPUs.
+
+    Returns:
+    Tuple[list, dict]: Outputs in job order and timing stats, including figures_per_second.
+    """
+    return render_many(plot_arrows, jobs, workers)
@@ -0,0 +1,219 @@
+import numpy as np
+from typing import TYPE_CHECKING
+
+from football_analytics.analytics.dimensions import ensure_labels
+from football_analytics.analytics.passes import get_df_info, get_passes_between_df, get_passes_df
+from football_analytics.trace import span, traced
+from football_analytics.viz.render import finish_figure, get_template, render_many, restore_axes, snapshot_axes
+
+# matplotlib and mplsoccer are imported by the functions that draw, so importing this module stays cheap
+if TYPE_CHECKING:
+    from mplsoccer import Pitch
+
+def pass_network_visualization(ax, passes_between_df, average_locs_and_count_df, marker_label, flipped=False, pitch=None) -> 'Pitch':
+    """
+    Visualizes the passing network on a soccer pitch.
+
+    Parameters:
+    ax (mpl.axes.Axes): Matplotlib axes object to draw the pitch.
+    passes_between_df (DataFrame): DataFrame containing passes between players.
+    average_locs_and_count_df (DataFrame): DataFrame containing average locations and pass counts per player.
+    marker_label (str): Specifies the type of marker label to be displayed. 
+        Options are "Initials" or "Numbers".
+    flipped (bool, optional): Specifies whether to flip the coordinates for the away team. Defaults to False.
+    pitch (Pitch, optional): Pitch already drawn on `ax`. If None, a new pitch is drawn.
+
+    Returns:
+    Pitch: mplsoccer Pitch object representing the soccer pitch.
+    """
+    from matplotlib.colors import to_rgba
+    from mplsoccer import Pitch
+
+    MAX_LINE_WIDTH = 20
+    MAX_MARKER_SIZE = 3000
+    #Line width depends on the number of passes between players
+    passes_between_df['width'] = (passes_between_df.pass_count*1.2 / passes_between_df.pass_count.max() *
+                                  MAX_LINE_WIDTH)
+    average_locs_and_count_df['marker_size'] = (average_locs_and_count_df['passes_completed']
+                                                / average_locs_and_count_df['passes_completed'].max() * MAX_MARKER_SIZE)
+    
+    # Only player that have made more than 5 passes during the match
+    passes_between_df = passes_between_df[passes_between_df.pass_count>5]
+
+    MIN_TRANSPARENCY = 0.3
+    color = np.array(to_rgba('#507293'))
+    color = np.tile(color, (len(passes_between_df), 1))
+    c_transparency = passes_between_df.pass_count / passes_between_df.pass_count.max()
+    c_transparency = (c_transparency * (1 - MIN_TRANSPARENCY)) + MIN_TRANSPARENCY
+    color[:, 3] = c_transparency
+
+
+    if pitch is None:
+        pitch = Pitch(pitch_type='opta', pitch_color='#0D182E', line_color='#5B6378')
+        pitch.draw(ax=ax)
+
+    # Printing the away team with flipped coordinates
+    if flipped:
+        passes_between_df.loc[:,'x'] = pitch.dim.right - passes_between_df.loc[:,'x']
+        passes_between_df.loc[:,'y'] = pitch.dim.right - passes_between_df.loc[:,'y']
+        passes_between_df.loc[:,'x_end'] = pitch.dim.right - passes_between_df.loc[:,'x_end']
+        passes_between_df.loc[:,'y_end'] = pitch.dim.right - passes_between_df.loc[:,'y_end']
+        average_locs_and_count_df['x'] = pitch.dim.right - average_locs_and_count_df['x']
+        average_locs_and_count_df['y'] = pitch.dim.right - average_locs_and_count_df['y']
+
+    # Setting the marker color conditions
+    conditions_node = [
+        (average_locs_and_count_df["percentage_completed"] <= 60),
+        ((60 < average_locs_and_count_df["percentage_completed"]) & (average_locs_and_count_df["percentage_completed"] <= 70)),
+        ((70 < average_locs_and_count_df["percentage_completed"]) & (average_locs_and_count_df["percentage_completed"] <= 80)),
+        ((80 < average_locs_and_count_df["percentage_completed"]) & (average_locs_and_count_df["percentage_completed"] <= 85))
+    ]
+    conditions_markeredge = [
+        (average_locs_and_count_df["subbed_in"] == True),
+        ((average_locs_and_count_df["subbed_out"] == True))
+    ]
+
+    choices_node = ['#A61608', '#E57E03', '#E5DE05', '#63A51D']
+    choices_markeredge = ['#018B22', '#A02C04']
+
+    average_locs_and_count_df['color_node'] = np.select(conditions_node, choices_node, default='#58802E')
+    average_locs_and_count_df['color_markeredge'] = np.select(conditions_markeredge, choices_markeredge, default='#FEFEFC')
+
+
+    # Printing the lines and nodes
+    pass_lines = pitch.lines(passes_between_df.x, passes_between_df.y,
+                         passes_between_df.x_end, passes_between_df.y_end, lw=passes_between_df.width, 
+                         color=color, zorder=1, ax=ax)
+    pass_nodes = pitch.scatter(average_locs_and_count_df.x, average_locs_and_count_df.y,
+                               s=average_locs_and_count_df.marker_size, marker='h',
+                               c=average_locs_and_count_df.color_node, edgecolors=average_locs_and_count_df.color_markeredge, linewidth=3, alpha=0.9, ax=ax)
+    
+
+    # Setting up the marker label
+    if marker_label == "Initials":
+        for index, row in average_locs_and_count_df.iterrows():
+            player_name = row["player_name"].split()
+            player_initials = "".join(word[0] for word in player_name).upper()
+            pitch.annotate(player_initials, xy=(row.x, row.y), c='#FEFEFC', va='center',
+                           ha='center', size=14, ax=ax)
+    
+    elif marker_label == "Numbers":
+        for index, row in average_locs_and_count_df.iterrows():
+            player_name = row["shirt_no"]
+            pitch.annotate(player_name, xy=(row.x, row.y), c='#FEFEFC', va='center',
+                           ha='center', size=14, ax=ax)
+
+    return pitch
+
+def pass_network_template(ncols=1):
+    """
+    Builds the parts of the passing network figure that do not depend on the match.
+
+    Parameters:
+    ncols (int, optional): Number of pitches, 1 for a single team or 2 for both. Defaults to 1.
+
+    Returns:
+    Tuple[Figure, dict, Pitch]: The figure, its axes and the pitch drawn on them.
+    """
+    import matplotlib.pyplot as plt
+    from mplsoccer import Pitch
+
+    pitch = Pitch(pitch_type='opta', pitch_color='#0D182E', line_color='#5B6378')
+    fig, axs = pitch.grid(nrows=1, ncols=ncols, figheight=8, grid_width=0.9, endnote_space=0.05, axis=False, title_space=0.01)
+    plt.tight_layout()
+    fig.set_facecolor("#0D182E")
+    main_color = '#FBFAF5'
+
+    axs['title'].text(0.5, 0.35, "Passing networks and top combinations by volume of passes", ha='center', va='center', color=main_color, fontsize=12)
+    axs['endnote'].text(1, 1, '@Joel_AS', va='center', ha='right', color=main_color, fontsize=12)
+    axs['endnote'].text(0, 0.5, 'Min. 10% of total team passes\nMarker size: Amount of passes\nMarker edge color: Red - subbed out, Green - subbed in\nLines width: Amount of passes between players. The bigger the more passes.', color=main_color, fontsize=12)
+
+    # Create legend
+    legend_labels = ['<= 60%', '60% - 70%', '70% - 80%', '80% - 85%', '+ 85%']
+    legend_colors = ['#A61608', '#E57E03', '#E5DE05', '#63A51D', '#58802E']
+    legend_elements = [plt.Line2D([0], [0], marker='o', color='w', label=label, markerfacecolor=color, markersize=14)
+                       for label, color in zip(legend_labels, legend_colors)]
+    legend_ax = axs['pitch'][0] if ncols > 1 else axs['pitch']
+    legend_ax.legend(handles=legend_elements, loc='upper right', title="Pass completion %")
+
+    return fig, axs, pitch
+
+@traced('render')
+def plot_pitch(df,match_data,marker_label="Numbers",team ="both",output=None,format=None):
+    """
+    Plots the passing networks and top combinations by volume of passes for one or both teams.
+
+    Parameters:
+    df (DataFrame): DataFrame containing event data, with or without the player labels (see analytics.dimensions.normalize_match).
+    match_data (dict): Dictionary containing match data including team information.
+    marker_label (str, optional): Specifies the type of marker label to be displayed. Options are "Initials" or "Numbers". Defaults to "Numbers".
+    team (str, optional): Specifies the team(s) for which passes are to be plotted. Options are "home", "away", or "both". Defaults to "both".
+    output (str or file-like, optional): Path or buffer to save the figure to instead of showing it. The pitch background is
+        then drawn once per style and reused between calls, so calls must not run in parallel threads. Defaults to None.
+    format (str, optional): 'png', 'svg' or 'pdf' when saving. Defaults to the extension of `output`.
+
+    Returns:
+    The `output` argument.
+    """
+    df = ensure_labels(df, match_data)
+    ncols = 2 if team == "both" else 1
+    if output is None:
+        fig, axs, pitch = pass_network_template(ncols)
+        snapshot = None
+    else:
+        fig, axs, pitch = get_template(('pass_network', ncols), pass_network_template, ncols)
+        snapshot = snapshot_axes(fig)
+
+    main_color = '#FBFAF5'
+
+    def plot_single_team(ax, side, flipped=False):
+        """
+        Plots passing network for a single team.
+
+        Parameters:
+        ax (mpl.axes.Axes): Axes of the team's pitch.
+        side (str): "home" or "away".
+        flipped (bool, optional): Specifies whether to flip the coordinates. Defaults to False.
+        """
+        passes_df = get_passes_df(df, side, match_data)
+        passes_between_df, average_locs_and_count_df = get_passes_between_df(passes_df)
+        comp = passes_df[passes_df.outcome_type_display_name == "Successful"]['id'].count()
+        att = passes_df['id'].count()
+        per = "{:.2f}%".format(comp / att * 100)
+
+        pass_network_visualization(ax, passes_between_df, average_locs_and_count_df, marker_label, flipped=flipped, pitch=pitch)
+        ax.set_title(f"{match_data[side]['name']} ({comp}/{att} ({per}))", color=main_color, fontsize=20)
+
+    try:
+        date = match_data['timeStamp'][0:10]
+        axs['title'].text(0.5, 0.8, f"{match_data['home']['name']} vs {match_data['away']['name']}", ha='center', va='center', color=main_color, fontsize=22)
+        axs['title'].text(0.5, 0.55, f"{date}", ha='center', va='center', color=main_color, fontsize=12)
+
+        if team in ("home", "away"):
+            plot_single_team(axs['pitch'], team)
+
+        elif team == "both":
+            plot_single_team(axs['pitch'][0], 'home')
+            plot_single_team(axs['pitch'][1], 'away', flipped=True)
+    except Exception:
+        # Leave the cached template as it was, or the next render draws over these artists
+        if snapshot is not None:
+            restore_axes(fig, snapshot)
+        raise
+
+    with span('render.draw'):
+        return finish_figure(fig, output, format, snapshot)
+
+def render_pitches(jobs, workers=None):
+    """
+    Renders many passing network figures headlessly across a process pool.
+
+    Parameters:
+    jobs (list of dict): plot_pitch keyword arguments per figure (df, match_data, marker_label, team, output, format).
+        Jobs without `output` return PNG bytes.
+    workers (int, optional): Number of processes. Defaults to the number of CPUs.
+
+    Returns:
+    Tuple[list, dict]: Outputs in job order and timing stats, including figures_per_second.
+    """
+    return render_many(plot_pitch, jobs, workers)
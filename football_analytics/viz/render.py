@@ -0,0 +1,130 @@
+#Imports
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+#Functions
+
+_templates = {}
+
+def use_headless() -> None:
+    """
+    Switch matplotlib to the non-interactive Agg backend, for scheduled jobs and worker processes.
+    """
+    import matplotlib
+
+    matplotlib.use('Agg')
+
+def get_template(key: Tuple, builder: Callable, *args) -> Any:
+    """
+    Return the cached figure template for a plot style, building it on first use.
+
+    A template holds the figure, pitch and every artist that does not depend on the match
+    (pitch lines, legend, endnote). Plots draw their own artists on top and remove them after saving,
+    or when drawing fails. Templates are shared by the whole process and are not thread-safe: render
+    from one thread at a time, or use render_many, which renders in separate processes.
+
+    Parameters:
+    - key (Tuple): Identifies the style, e.g. ('pass_network', 2).
+    - builder (Callable): Function returning the template (e.g. (fig, axs, pitch)).
+    - *args: Arguments passed to the builder.
+
+    Returns:
+    Any: The cached template.
+    """
+    if key not in _templates:
+        _templates[key] = builder(*args)
+    return _templates[key]
+
+def snapshot_axes(fig) -> Dict[Any, set]:
+    """
+    Record the artists currently on every axes of a figure.
+
+    Parameters:
+    - fig (Figure): The figure.
+
+    Returns:
+    Dict[Axes, set]: The children of each axes.
+    """
+    return {ax: set(ax.get_children()) for ax in fig.axes}
+
+def restore_axes(fig, snapshot: Dict[Any, set]) -> None:
+    """
+    Remove every artist added since `snapshot` was taken and clear the axes titles.
+
+    Parameters:
+    - fig (Figure): The figure.
+    - snapshot (Dict[Axes, set]): Result of snapshot_axes.
+    """
+    for ax, children in snapshot.items():
+        for artist in ax.get_children():
+            if artist not in children:
+                artist.remove()
+        ax.set_title('')
+
+def finish_figure(fig, output=None, format: Optional[str] = None, snapshot: Optional[Dict[Any, set]] = None):
+    """
+    Show the figure, or save it and release it for the next render.
+
+    Parameters:
+    - fig (Figure): The figure.
+    - output (str or file-like, optional): Path or buffer (e.g. io.BytesIO) to write to. If None, the figure is shown.
+    - format (str, optional): 'png', 'svg' or 'pdf'. Defaults to the extension of `output`, or png.
+    - snapshot (Dict[Axes, set], optional): Snapshot of a cached template; its added artists are removed after saving,
+      even if saving fails.
+
+    Returns:
+    The `output` argument.
+    """
+    import matplotlib.pyplot as plt
+
+    if output is None:
+        plt.show()
+        return None
+
+    if format is None and isinstance(output, (str, os.PathLike)):
+        format = os.path.splitext(os.fspath(output))[1].lstrip('.') or None
+    try:
+        fig.savefig(output, format=format or 'png', facecolor=fig.get_facecolor())
+    finally:
+        if snapshot is not None:
+            restore_axes(fig, snapshot)
+        else:
+            plt.close(fig)
+    return output
+
+def _render_job(render: Callable, job: Dict[str, Any]):
+    job = dict(job)
+    if job.get('output') is None:
+        job['output'] = io.BytesIO()
+        render(**job)
+        return job['output'].getvalue()
+    return render(**job)
+
+def render_many(render: Callable, jobs: List[Dict[str, Any]], workers: Optional[int] = None) -> Tuple[list, Dict[str, float]]:
+    """
+    Render many figures headlessly, fanned out across a process pool.
+
+    Parameters:
+    - render (Callable): Plot function accepting an `output` argument, e.g. plot_pitch or plot_arrows.
+    - jobs (List[dict]): Keyword arguments for each call. Jobs without `output` return the image bytes.
+    - workers (int, optional): Number of processes. Defaults to the number of CPUs; 1 renders in this process, with
+      its matplotlib backend left as it is and interactive mode off while rendering, so a notebook keeps its backend.
+
+    Returns:
+    Tuple[list, Dict[str, float]]: Outputs (paths or bytes) in job order, and figures, seconds and figures_per_second.
+    """
+    start = time.perf_counter()
+    if workers == 1:
+        import matplotlib.pyplot as plt
+
+        with plt.ioff():
+            results = [_render_job(render, job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=use_headless) as executor:
+            results = list(executor.map(_render_job, [render] * len(jobs), jobs))
+    elapsed = time.perf_counter() - start
+    return results, {'figures': len(jobs), 'seconds': elapsed,
+                     'figures_per_second': len(jobs) / elapsed if elapsed else float('inf')}
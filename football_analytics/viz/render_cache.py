@@ -0,0 +1,271 @@
+#Imports
+import hashlib
+import importlib
+import io
+import json
+import numbers
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from football_analytics.scrape.cache import content_hash
+
+#Functions
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+
+# kind -> (module, plot function, default options, source files whose changes invalidate the images)
+RENDERERS = {
+    'pass_network': ('football_analytics.viz.pass_matrix', 'plot_pitch', {'marker_label': 'Numbers', 'team': 'both'},
+                     ('viz/pass_matrix.py', 'analytics/passes.py', 'analytics/pass_network.py',
+                      'analytics/possession.py', 'analytics/dimensions.py', 'viz/render.py')),
+    'pass_arrows': ('football_analytics.viz.pass_arrows', 'plot_arrows', {'player': 'home'},
+                    ('viz/pass_arrows.py', 'analytics/passes.py', 'analytics/pass_classification.py',
+                     'analytics/possession.py', 'analytics/dimensions.py', 'analytics/player_search.py',
+                     'viz/render.py')),
+}
+
+_code_versions = {}
+
+def code_version(kind: str) -> str:
+    """
+    Hash the source files of a renderer, so that images drawn by older plotting code are not served.
+
+    The files are read from disk under the package directory; the renderer module is not imported.
+
+    Parameters:
+    - kind (str): A key of RENDERERS, e.g. 'pass_network'.
+
+    Returns:
+    str: Hex digest of the renderer sources.
+    """
+    if kind not in _code_versions:
+        sources = RENDERERS[kind][3]
+        digest = hashlib.sha256()
+        for name in sources:
+            file = PACKAGE_DIR / name
+            if file.exists():
+                digest.update(name.encode())
+                digest.update(file.read_bytes())
+        _code_versions[kind] = digest.hexdigest()[:16]
+    return _code_versions[kind]
+
+def _option_json(value: Any) -> Any:
+    # numpy scalars key like the Python numbers they equal; any other object has no stable key
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    raise TypeError(f"Plot option of type {type(value).__name__} cannot be part of a render cache key")
+
+class RenderCache:
+    """
+    Two-level cache of rendered plot images (PNG, SVG or PDF bytes).
+
+    Images are keyed by match, plot kind, every plot option, the output format, a hash of
+    the plotting code and a digest of the match events. Recent images are kept in memory
+    up to `max_items`; every image is also written under `path/<match_id>/`, so entries
+    evicted from memory are still served from disk. The disk tier is trimmed to
+    `max_bytes` by least recent use. A hit never imports matplotlib.
+
+    Parameters:
+    - path (str): Directory of the on-disk tier.
+    - max_items (int): Number of images kept in memory. Defaults to 64.
+    - max_bytes (int): Size cap of the on-disk tier. Defaults to 256 MB.
+    """
+
+    def __init__(self, path: str = '.render_cache', max_items: int = 64, max_bytes: int = 256 << 20):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, kind: str, match_id: int, digest: str, format: str = 'png', **options) -> str:
+        """
+        Build the cache key of an image.
+
+        Parameters:
+        - kind (str): A key of RENDERERS.
+        - match_id (int): match_id of the events table.
+        - digest (str): Digest of the match events.
+        - format (str, optional): Image format. Defaults to png.
+        - **options: Plot options; missing ones take the renderer defaults. A player search `index` is not
+          part of the key: a player name is resolved with it and keyed by its player_id. Options that are
+          not JSON values (or numpy numbers) raise TypeError.
+
+        Returns:
+        str: Hex key.
+        """
+        options = {**RENDERERS[kind][2], **options}
+        index = options.pop('index', None)
+        player = options.get('player')
+        if index is not None and isinstance(player, str) and player not in ('home', 'away'):
+            options['player'] = index.resolve(player)
+        payload = json.dumps([kind, int(match_id), code_version(kind), digest, format, sorted(options.items())],
+                             default=_option_json)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def _match_dir(self, match_id: int) -> Path:
+        return self.path / str(int(match_id))
+
+    def _check_digest(self, match_id: int, digest: str) -> None:
+        # The first request after the events of a match changed drops its old images
+        digest_file = self._match_dir(match_id) / 'DIGEST'
+        try:
+            current = digest_file.read_text()
+        except FileNotFoundError:
+            return
+        if current != digest:
+            self.invalidate(match_id)
+
+    def get(self, match_id: int, key: str) -> Optional[bytes]:
+        """
+        Return a cached image, or None on a miss.
+
+        Parameters:
+        - match_id (int): match_id of the events table.
+        - key (str): Result of RenderCache.key.
+
+        Returns:
+        Optional[bytes]: The image.
+        """
+        with self._lock:
+            image = self._memory.get((match_id, key))
+            if image is not None:
+                self._memory.move_to_end((match_id, key))
+                self.memory_hits += 1
+                return image
+
+        file = self._match_dir(match_id) / key
+        try:
+            image = file.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(file)
+        except OSError:
+            pass
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(match_id, key, image)
+        return image
+
+    def _remember(self, match_id: int, key: str, image: bytes) -> None:
+        self._memory[(match_id, key)] = image
+        self._memory.move_to_end((match_id, key))
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def put(self, match_id: int, key: str, image: bytes, digest: str) -> None:
+        """
+        Store an image in memory and on disk.
+
+        Parameters:
+        - match_id (int): match_id of the events table.
+        - key (str): Result of RenderCache.key.
+        - image (bytes): The rendered image.
+        - digest (str): Digest of the match events the image was drawn from.
+        """
+        match_dir = self._match_dir(match_id)
+        match_dir.mkdir(parents=True, exist_ok=True)
+        for name, payload in ((key, image), ('DIGEST', digest.encode())):
+            fd, tmp = tempfile.mkstemp(dir=match_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp, match_dir / name)
+        with self._lock:
+            self._remember(match_id, key, image)
+        self.evict()
+
+    def invalidate(self, match_id: int) -> None:
+        """
+        Drop every image of a match, e.g. after its events were rescraped.
+
+        Parameters:
+        - match_id (int): match_id of the events table.
+        """
+        with self._lock:
+            for entry in [entry for entry in self._memory if entry[0] == match_id]:
+                del self._memory[entry]
+        shutil.rmtree(self._match_dir(match_id), ignore_errors=True)
+
+    def evict(self) -> None:
+        """
+        Delete least recently used images on disk until the tier fits in `max_bytes`.
+        """
+        files = []
+        for file in self.path.glob('*/*'):
+            if file.name == 'DIGEST' or file.suffix == '.tmp':
+                continue
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file))
+        total = sum(size for _, size, _ in files)
+        for _, size, file in sorted(files):
+            if total <= self.max_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+
+    def render(self, kind: str, df, match_data: Dict[str, Any], format: str = 'png',
+               digest: Optional[str] = None, **options) -> bytes:
+        """
+        Return the image of a plot, drawing it only when it is not cached.
+
+        Parameters:
+        - kind (str): 'pass_network' (plot_pitch) or 'pass_arrows' (plot_arrows).
+        - df (pd.DataFrame): Event data of the match, as passed to the plot function.
+        - match_data (dict): The matchCentreData dictionary.
+        - format (str, optional): 'png', 'svg' or 'pdf'. Defaults to png.
+        - digest (str, optional): Digest of the match events, e.g. the content_hash kept by the ingest manifest.
+          Computed from `match_data` if not given.
+        - **options: Plot options, e.g. team='home', marker_label='Initials' or player='salah'.
+
+        Returns:
+        bytes: The image.
+        """
+        match_id = int(df['match_id'].iloc[0])
+        digest = digest or content_hash(match_data)
+        self._check_digest(match_id, digest)
+        key = self.key(kind, match_id, digest, format, **options)
+        image = self.get(match_id, key)
+        if image is not None:
+            return image
+
+        module, function, defaults, _ = RENDERERS[kind]
+        plot = getattr(importlib.import_module(module), function)
+        buffer = io.BytesIO()
+        plot(df, match_data, output=buffer, format=format, **{**defaults, **options})
+        image = buffer.getvalue()
+        self.put(match_id, key, image, digest)
+        return image
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the size of both tiers.
+
+        Returns:
+        Dict[str, Any]: memory_hits, disk_hits, misses, hit_rate, memory_items and disk_bytes.
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            'memory_items': len(self._memory),
+            'disk_bytes': sum(file.stat().st_size for file in self.path.glob('*/*') if file.name != 'DIGEST'),
+        }